@@ -1,34 +1,43 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, Toplevel
 import os
+import threading
+import time
 from pathlib import Path
 from src.core.config import ConfigManager
-from src.utils.image_utils import ImageProcessor
+from src.core.session_snapshot import SessionSnapshot
 from src.ui.components.style_manager import StyleManager
 from src.ui.components.navigation_bar import NavigationBar
 from src.ui.components.album_grid import AlbumGrid
-from src.ui.components.image_viewer import ImageViewer
 from src.ui.components.status_bar import StatusBar
+from src.utils.startup_profiler import get_startup_profiler
+from src.utils.logger import log_info, log_debug, log_error
+from src.utils.tracing import get_tracer
 
 class PhotoAlbumApp:
     """现代化漫画扫描器主应用程序"""
     
     def __init__(self, root):
         self.root = root
+        profiler = get_startup_profiler()
         
         # 首先初始化管理器
-        self.config_manager = ConfigManager()
+        with profiler.phase('读取配置'):
+            self.config_manager = ConfigManager()
+            if self.config_manager.get_tracing_enabled():
+                get_tracer().set_enabled(True)
         
         # 然后设置窗口
-        self.setup_window()
-        
-        # 初始化现代化样式管理器
-        from tkinter import ttk
-        style = ttk.Style()
-        self.style_manager = StyleManager(self.root, style)
-        
-        # 配置TTK样式
-        self.style_manager.configure_ttk_styles()
+        with profiler.phase('窗口主题'):
+            self.setup_window()
+            
+            # 初始化现代化样式管理器
+            from tkinter import ttk
+            style = ttk.Style()
+            self.style_manager = StyleManager(self.root, style)
+            
+            # 配置TTK样式
+            self.style_manager.configure_ttk_styles()
         
         # 初始化变量
         self.folder_path = self.config_manager.get_last_path()
@@ -40,12 +49,129 @@ class PhotoAlbumApp:
         self.cached_scan_results = None  # 缓存扫描结果
         self.cached_scan_path = None     # 缓存扫描路径
         
-        # 创建UI组件
-        self.create_widgets()
+        # 创建UI组件（图片缓存、查看器等子系统在首次使用时才创建）
+        with profiler.phase('创建组件'):
+            self.create_widgets()
         
         # 绑定事件
         self.bind_events()
         
+        # 界面卡顿检测
+        self.stall_detector = None
+        self._start_stall_detector()
+        
+        # 立即显示上次会话的扫描结果，再在后台校验
+        with profiler.phase('恢复会话'):
+            self.session_snapshot = SessionSnapshot(self.config_manager.config_dir)
+            self._restore_session()
+        
+    def _restore_session(self):
+        """从会话快照恢复上次的扫描结果和视图状态（不访问相册所在的文件系统）"""
+        try:
+            start_time = time.perf_counter()
+            state = self.session_snapshot.load()
+            if not state or not state.get('albums') or not state.get('scan_path'):
+                return
+            
+            from src.utils.album_records import get_album_records
+            from src.utils.image_cache import seed_cover_cache_keys
+            get_album_records().load_records(state.get('records', []))
+            seed_cover_cache_keys(state.get('cover_keys', []))
+            
+            scan_path = state['scan_path']
+            self.path_var.set(scan_path)
+            self.albums = state['albums']
+            self.cached_scan_results = self.albums.copy()
+            self.cached_scan_path = scan_path
+            self.current_view_state = "scan"
+            
+            # 恢复筛选和排序后再显示，新层级会继承它们
+            self.album_grid.current_filter = state.get('filter') or self.album_grid.current_filter
+            self.album_grid.current_sort = state.get('sort') or self.album_grid.current_sort
+            folder_name = os.path.basename(scan_path)
+            self.album_grid.display_albums(self.albums, level_key='scan', title=folder_name,
+                                           reuse=False, scroll_offset=state.get('scroll_offset'))
+            self.nav_bar.update_breadcrumb("scan", folder_name)
+            self.status_bar.set_status(f"上次扫描结果: {folder_name} ({len(self.albums)} 个项目)，正在校验...", "info")
+            
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_info(f"已恢复会话快照: {len(self.albums)} 个项目 ({elapsed:.0f}ms)", 'app')
+            
+            # 首帧绘制完成后再开始后台校验
+            self.root.after(500, lambda: self._revalidate_session(scan_path))
+        except Exception as e:
+            log_error(f"恢复会话快照失败: {e}", 'app')
+    
+    def _revalidate_session(self, scan_path):
+        """后台重新扫描快照对应的路径"""
+        from src.utils.image_utils import ImageProcessor
+        
+        def worker():
+            try:
+                albums = ImageProcessor.scan_albums(scan_path)
+                self.root.after_idle(self._apply_session_diff, scan_path, albums)
+            except Exception as e:
+                log_error(f"后台校验会话快照失败: {e}", 'app')
+        
+        threading.Thread(target=worker, daemon=True, name='SessionRevalidate').start()
+    
+    def _apply_session_diff(self, scan_path, albums):
+        """把后台扫描的结果合并到界面（用户已重新扫描其他路径时忽略）"""
+        try:
+            from src.utils.image_cache import clear_cover_cache_key_hints
+            clear_cover_cache_key_hints()
+            if self.cached_scan_path != scan_path:
+                return
+            
+            old_items = {album['path']: album for album in self.cached_scan_results or []}
+            new_items = {album['path']: album for album in albums}
+            added = len(new_items.keys() - old_items.keys())
+            removed = len(old_items.keys() - new_items.keys())
+            changed = sum(1 for path in new_items.keys() & old_items.keys()
+                          if new_items[path].get('image_count') != old_items[path].get('image_count')
+                          or new_items[path].get('modified_time') != old_items[path].get('modified_time'))
+            
+            self.cached_scan_results = albums.copy()
+            if self.album_grid.replace_level_albums('scan', albums):
+                self.albums = albums
+            
+            folder_name = os.path.basename(scan_path)
+            if added or removed or changed:
+                self.status_bar.set_status(f"扫描结果已更新: {folder_name} (新增 {added}, 移除 {removed}, 变化 {changed})",
+                                           "success")
+            else:
+                self.status_bar.set_status(f"扫描结果: {folder_name} ({len(albums)} 个项目)", "success")
+            log_info(f"会话快照校验完成: 新增 {added}, 移除 {removed}, 变化 {changed}", 'app')
+        except Exception as e:
+            log_error(f"合并会话快照校验结果失败: {e}", 'app')
+    
+    def _save_session(self):
+        """保存会话快照：扫描结果、视图状态、最近浏览和收藏的记录，以及封面缓存键"""
+        if not self.cached_scan_results or not self.cached_scan_path:
+            return
+        
+        from src.utils.album_records import get_album_records
+        from src.utils.image_cache import export_cover_cache_keys
+        
+        record_paths = (self.config_manager.get_recent_albums(check_exists=False)
+                        + self.config_manager.get_favorites(check_exists=False))
+        records = [(path, dir_mtime, SessionSnapshot.compact_albums([album_info])[0])
+                   for path, dir_mtime, album_info in get_album_records().export_records(record_paths)]
+        
+        cover_paths = [album.get('cover_image') for album in self.cached_scan_results]
+        cover_paths += [album_info.get('cover_image') for _, _, album_info in records]
+        cover_keys = export_cover_cache_keys(path for path in cover_paths if path)
+        
+        self.session_snapshot.save({
+            'scan_path': self.cached_scan_path,
+            'albums': SessionSnapshot.compact_albums(self.cached_scan_results),
+            'filter': self.album_grid.current_filter,
+            'sort': self.album_grid.current_sort,
+            'scroll_offset': self.album_grid.get_scroll_offset() if self.current_view_state == 'scan' else 0.0,
+            'records': records,
+            'cover_keys': cover_keys,
+        })
+    
     def setup_window(self):
         """设置窗口属性"""
         self.root.title("漫画扫描器 - 现代化图片管理")
@@ -64,22 +190,22 @@ class PhotoAlbumApp:
             for theme in available_themes:
                 try:
                     self.root.set_theme(theme)
-                    print(f"已应用 {theme} 主题")
+                    log_info(f"已应用 {theme} 主题", 'app')
                     theme_set = True
                     break
                 except Exception as e:
-                    print(f"设置 {theme} 主题失败: {e}")
+                    log_error(f"设置 {theme} 主题失败: {e}", 'app')
                     continue
             
             if not theme_set:
-                print("使用默认主题")
+                log_info("使用默认主题", 'app')
                 try:
                     self.root.set_theme('default')
                 except:
                     pass
                     
         except Exception as e:
-            print(f"主题设置过程出错: {e}")
+            log_error(f"主题设置过程出错: {e}", 'app')
         
     def create_widgets(self):
         """创建现代化UI组件"""
@@ -102,6 +228,10 @@ class PhotoAlbumApp:
             # 设置返回首页回调
             self.nav_bar.home_callback = self.return_to_scan_results
             
+            # 设置后退/前进回调
+            self.nav_bar.back_callback = self.go_back
+            self.nav_bar.forward_callback = self.go_forward
+            
             # 设置设置对话框回调
             self.nav_bar.settings_callback = self.show_settings
             
@@ -114,6 +244,12 @@ class PhotoAlbumApp:
             )
             # 设置is_favorite回调
             self.album_grid.is_favorite = self.config_manager.is_favorite
+            # 设置最近阅读时间查询（用于排序）
+            self.album_grid.last_read_lookup = self.config_manager.get_last_read_time
+            # 设置续读页查询（悬停卡片时预热续读页）
+            self.album_grid.resume_page_lookup = self.config_manager.get_resume_page
+            # 层级切换（进入合集、后退、前进）时同步视图状态
+            self.album_grid.level_changed_callback = self.on_level_changed
             # AlbumGrid已经在create_widgets中自动pack了
             
             # 创建现代化状态栏
@@ -129,6 +265,12 @@ class PhotoAlbumApp:
             # 设置筛选回调
             self.nav_bar.set_filter_callback(self.on_filter_changed)
             
+            # 设置搜索回调
+            self.nav_bar.set_search_callback(self.on_search_changed)
+            
+            # 设置排序回调
+            self.nav_bar.set_sort_callback(self.on_sort_changed)
+            
             # 更新路径显示
             if self.folder_path:
                 self.path_var.set(self.folder_path)
@@ -145,10 +287,10 @@ class PhotoAlbumApp:
             else:
                 self.status_bar.set_status("欢迎使用漫画扫描器", "success")
             
-            print("现代化UI组件创建成功")
+            log_info("现代化UI组件创建成功", 'app')
             
         except Exception as e:
-            print(f"创建UI组件时发生错误: {e}")
+            log_error(f"创建UI组件时发生错误: {e}", 'app')
             import traceback
             traceback.print_exc()
             # 创建简化版本的UI
@@ -157,7 +299,7 @@ class PhotoAlbumApp:
                 fallback_manager = FallbackUIManager(self)
                 fallback_manager.create_fallback_ui()
             except Exception as fallback_error:
-                print(f"创建回退UI也失败: {fallback_error}")
+                log_error(f"创建回退UI也失败: {fallback_error}", 'app')
 
     def bind_events(self):
         """绑定事件"""
@@ -171,6 +313,97 @@ class PhotoAlbumApp:
         self.root.bind('<Control-f>', lambda e: self.show_favorites())
         self.root.bind('<Control-comma>', lambda e: self.show_settings())  # Ctrl+, 设置快捷键
         self.root.bind('<F5>', lambda e: self.scan_albums())
+        self.root.bind('<Control-k>', lambda e: self.focus_search())
+        self.root.bind('<Alt-Left>', lambda e: self.go_back())
+        self.root.bind('<Alt-Right>', lambda e: self.go_forward())
+        self.root.bind('<Control-Shift-T>', lambda e: self.toggle_tracing())
+        self.root.bind('<Control-Shift-E>', lambda e: self.export_trace())
+        
+    def _start_stall_detector(self):
+        """启动主循环卡顿检测，统计显示在状态栏"""
+        try:
+            threshold = self.config_manager.get_stall_threshold()
+            if not threshold:
+                return
+            from src.utils.stall_detector import StallDetector
+            self.stall_detector = StallDetector(self.root, threshold_ms=threshold)
+            self.stall_detector.update_callback = self.status_bar.set_stall_info
+            self.status_bar.stall_click_callback = self.show_stall_report
+            self.stall_detector.start()
+        except Exception as e:
+            log_error(f"启动卡顿检测失败: {e}", 'app')
+    
+    def show_stall_report(self):
+        """显示最近的界面卡顿记录"""
+        if not self.stall_detector or not self.stall_detector.records:
+            return
+        stats = self.stall_detector.get_stats()
+        lines = [f"卡顿 {stats['stall_count']} 次，累计 {stats['total_stall_ms']:.0f}ms，"
+                 f"最长 {stats['max_stall_ms']:.0f}ms，P95 {stats['p95_stall_ms']:.0f}ms", ""]
+        for record in list(self.stall_detector.records)[-10:]:
+            lines.append(f"{record['time']}  {record['duration_ms']:.0f}ms  {record['callback']}")
+            if record['hotspots']:
+                lines.append(f"    热点: {record['hotspots'][0][0]}")
+        messagebox.showinfo("界面卡顿记录", "\n".join(lines))
+    
+    def toggle_tracing(self):
+        """开启或关闭性能追踪"""
+        tracer = get_tracer()
+        tracer.set_enabled(not tracer.enabled)
+        self.config_manager.set_tracing_enabled(tracer.enabled)
+        self.status_bar.set_status(f"性能追踪已{'开启' if tracer.enabled else '关闭'}", "info")
+    
+    def export_trace(self):
+        """导出性能追踪为Chrome trace文件"""
+        tracer = get_tracer()
+        if tracer.event_count() == 0:
+            self.status_bar.set_status("没有可导出的追踪事件（Ctrl+Shift+T 开启追踪）", "warning")
+            return
+        file_path = tracer.export_to_directory(self.config_manager.get_trace_dir())
+        if file_path:
+            self.status_bar.set_status(f"已导出性能追踪: {os.path.basename(file_path)}", "success")
+        else:
+            self.status_bar.set_status("导出性能追踪失败", "error")
+        
+    def go_back(self):
+        """后退到上一个视图（复用缓存的卡片和滚动位置）"""
+        if self.album_grid:
+            self.album_grid.go_back()
+    
+    def go_forward(self):
+        """前进到下一个视图"""
+        if self.album_grid:
+            self.album_grid.go_forward()
+    
+    def on_level_changed(self, level):
+        """网格层级变化后同步当前视图状态、面包屑和状态栏"""
+        try:
+            if level is None:
+                return
+            
+            key = level.key
+            if key.startswith('collection:'):
+                self.nav_bar.update_breadcrumb("collection", level.title)
+                self.status_bar.set_status(f"合集: {level.title} ({len(level.all_albums)} 个相册)")
+                return
+            
+            # 顶层视图，恢复对应的相册数据
+            self.albums = level.all_albums
+            if key in ('recent', 'favorites', 'scan'):
+                self.current_view_state = key
+                self.nav_bar.update_breadcrumb(key, level.title)
+            else:
+                self.current_view_state = "home"
+                self.nav_bar.update_breadcrumb("home")
+            self.status_bar.set_status(f"显示 {len(level.all_albums)} 个项目")
+        except Exception as e:
+            log_error(f"同步视图状态时出错: {e}", 'app')
+    
+    def focus_search(self):
+        """聚焦搜索框"""
+        if getattr(self.nav_bar, 'search_entry', None):
+            self.nav_bar.search_entry.focus_set()
+            self.nav_bar.search_entry.select_range(0, 'end')
         
     def browse_folder(self):
         """浏览并选择文件夹"""
@@ -228,7 +461,7 @@ class PhotoAlbumApp:
             self.root.after(2000, self._do_intelligent_preload)
             
         except Exception as e:
-            print(f"启动智能预加载失败: {e}")
+            log_error(f"启动智能预加载失败: {e}", 'app')
     
     def _do_intelligent_preload(self):
         """执行智能预加载"""
@@ -238,7 +471,7 @@ class PhotoAlbumApp:
             
             # 获取缓存统计
             stats = cache.get_cache_stats()
-            print(f"缓存统计: {stats}")
+            log_info(f"缓存统计: {stats}", 'app')
             
             # 预加载策略：
             # 1. 优先预加载前10个相册的封面
@@ -252,7 +485,7 @@ class PhotoAlbumApp:
             if priority_albums:
                 priority_paths = [album.get('path') for album in priority_albums if album.get('path')]
                 cache.preload_album_covers(priority_paths, size=(320, 350), widget=self.root)
-                print(f"优先预加载 {len(priority_paths)} 个封面")
+                log_info(f"优先预加载 {len(priority_paths)} 个封面", 'app')
             
             # 如果内存缓存较少，继续预加载
             if stats.get('memory_items', 0) < 20 and remaining_albums:
@@ -262,7 +495,7 @@ class PhotoAlbumApp:
             self.root.after(10000, lambda: cache.cleanup_old_cache(max_age_days=7))
             
         except Exception as e:
-            print(f"执行智能预加载失败: {e}")
+            log_error(f"执行智能预加载失败: {e}", 'app')
     
     def _preload_remaining(self, albums):
         """预加载剩余相册"""
@@ -273,10 +506,10 @@ class PhotoAlbumApp:
             album_paths = [album.get('path') for album in albums if album.get('path')]
             if album_paths:
                 cache.preload_album_covers(album_paths, size=(320, 350), widget=self.root)
-                print(f"后台预加载 {len(album_paths)} 个封面")
+                log_info(f"后台预加载 {len(album_paths)} 个封面", 'app')
                 
         except Exception as e:
-            print(f"预加载剩余相册失败: {e}")
+            log_error(f"预加载剩余相册失败: {e}", 'app')
 
     def show_recent_albums(self):
         """显示最近浏览的漫画"""
@@ -307,8 +540,9 @@ class PhotoAlbumApp:
             self.albums = self.cached_scan_results.copy()
             self.current_view_state = "scan"
             
-            # 更新显示
-            self.album_grid.update_albums(self.albums)
+            # 更新显示 - 扫描结果的卡片仍在缓存中时直接恢复
+            folder_name = os.path.basename(self.cached_scan_path)
+            self.album_grid.update_albums(self.albums, level_key='scan', title=folder_name)
             
             # 更新状态栏
             folder_name = os.path.basename(self.cached_scan_path)
@@ -317,7 +551,7 @@ class PhotoAlbumApp:
             else:
                 display_name = folder_name
             
-            total_images = sum(len(album.get('image_files', [])) for album in self.albums)
+            total_images = sum(album.get('image_count', 0) for album in self.albums)
             self.status_bar.set_status(f"扫描结果: {display_name} ({len(self.albums)} 个漫画)", "success")
             self.status_bar.set_info(f"共 {total_images} 张图片")
             
@@ -340,11 +574,11 @@ class PhotoAlbumApp:
         
         # 刷新当前显示
         if self.albums:
-            self.album_grid.update_albums(self.albums)
-            
             # 如果在收藏视图中，需要重新加载收藏列表
             if self.current_view_state == "favorites":
                 self.show_favorites()
+            else:
+                self.album_grid.refresh()
     
     def open_album(self, folder_path):
         """打开漫画查看"""
@@ -373,13 +607,13 @@ class PhotoAlbumApp:
             settings_dialog = SettingsDialog(self.root, self.config_manager, self.style_manager)
             settings_dialog.show()
         except Exception as e:
-            print(f"打开设置对话框失败: {e}")
+            log_error(f"打开设置对话框失败: {e}", 'app')
             messagebox.showerror("错误", f"无法打开设置对话框: {str(e)}")
     
     def on_filter_changed(self, filter_value):
         """处理筛选条件变化"""
         try:
-            print(f"筛选条件变化: {filter_value}")
+            log_debug(f"筛选条件变化: {filter_value}", 'app')
             
             # 应用筛选到相册网格
             if self.album_grid:
@@ -399,10 +633,38 @@ class PhotoAlbumApp:
                     self.status_bar.set_status(filter_text)
                     
         except Exception as e:
-            print(f"处理筛选条件变化时出错: {e}")
+            log_error(f"处理筛选条件变化时出错: {e}", 'app')
             import traceback
             traceback.print_exc()
 
+    def on_sort_changed(self, sort_mode):
+        """处理排序方式变化"""
+        try:
+            if self.album_grid:
+                self.album_grid.apply_sort(sort_mode)
+                if self.status_bar:
+                    self.status_bar.set_status(f"排序: {sort_mode}")
+        except Exception as e:
+            log_error(f"处理排序方式变化时出错: {e}", 'app')
+
+    def on_search_changed(self, query):
+        """处理搜索关键字变化"""
+        try:
+            if not self.album_grid:
+                return
+            
+            match_count = self.album_grid.apply_search(query)
+            total_count = len(self.album_grid.all_albums)
+            
+            if self.status_bar:
+                if query.strip():
+                    self.status_bar.set_status(f"搜索: {query.strip()} ({match_count}/{total_count})")
+                else:
+                    self.status_bar.set_status(f"显示全部 {total_count} 个相册")
+                    
+        except Exception as e:
+            log_error(f"处理搜索关键字变化时出错: {e}", 'app')
+
     def on_closing(self):
         """窗口关闭时保存配置并清理资源"""
         try:
@@ -410,6 +672,17 @@ class PhotoAlbumApp:
             self.config_manager.config['window_size'] = self.root.geometry()
             self.config_manager.save_config()
             
+            # 保存会话快照，下次启动时立即显示
+            self._save_session()
+            
+            # 停止卡顿检测并保存卡顿记录
+            if self.stall_detector:
+                self.stall_detector.stop()
+                self.stall_detector.dump(self.config_manager.config_dir / 'stalls.json')
+            
+            # 立即写入所有延迟保存的配置
+            self.config_manager.close()
+            
             # 清理图片缓存
             try:
                 from src.utils.image_cache import get_image_cache
@@ -417,12 +690,12 @@ class PhotoAlbumApp:
                 if cache and hasattr(cache, 'shutdown'):
                     # 显示缓存统计
                     stats = cache.get_cache_stats()
-                    print(f"关闭时缓存统计: {stats}")
+                    log_info(f"关闭时缓存统计: {stats}", 'app')
                     cache.shutdown()
             except Exception as e:
-                print(f"清理图片缓存时出错: {e}")
+                log_error(f"清理图片缓存时出错: {e}", 'app')
             
         except Exception as e:
-            print(f"保存配置时发生错误: {e}")
+            log_error(f"保存配置时发生错误: {e}", 'app')
         finally:
             self.root.destroy()
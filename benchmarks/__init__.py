@@ -0,0 +1,4 @@
+"""性能基准测试 - 合成漫画库生成器和基准测试运行器
+
+用法: python -m benchmarks.run_benchmarks [--collections N] [--albums M] [--pages K] [--baseline 旧结果.json]
+"""
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import random
+import shutil
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from PIL import Image, ImageDraw, features
+
+# 作者、系列名用于生成带方括号作者名、名称相近的相册（覆盖智能分组的各种情况）
+AUTHORS = ['鸟山明', '尾田荣一郎', 'CLAMP', '荒木飞吕彦', '井上雄彦', 'Tite Kubo', '高桥留美子', '富坚义博']
+SERIES = ['冒险之旅', '星之海', 'Dragon Quest', '夜行列车', '银色世界', '青春物语', 'Night Walker', '樱花庄']
+
+# 页面尺寸（宽, 高）：竖版单页为主，夹杂横版跨页
+PAGE_SIZES = [(800, 1200), (960, 1440), (720, 1080), (1600, 1200), (640, 960)]
+
+# 默认参数
+DEFAULT_PARAMS = {
+    'collections': 4,  # 合集数 N
+    'albums': 6,  # 每个合集的相册数 M
+    'pages': 8,  # 每个相册的页数 K
+    'standalone': 12,  # 根目录下的独立相册数（用于智能分组）
+    'depth': 3,  # 合集内的最大嵌套层数
+    'archive_ratio': 0.15,  # 独立相册中CBZ压缩包的比例
+    'grayscale_ratio': 0.7,  # 黑白页面的比例
+    'scale': 0.5,  # 页面尺寸缩放（减小生成和解码时间）
+    'seed': 20240601,
+}
+
+
+def _formats():
+    """可用的页面格式（扩展名, PIL格式名）"""
+    formats = [('jpg', 'JPEG'), ('png', 'PNG')]
+    if features.check('webp'):
+        formats.append(('webp', 'WEBP'))
+    return formats
+
+
+def _render_page(rng, size, grayscale):
+    """生成一页内容：背景加若干分格和线条，黑白页以RGB保存（与扫描版漫画一致）"""
+    width, height = size
+    background = rng.randint(200, 255)
+    img = Image.new('RGB', size, (background, background, background))
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(3, 7)):
+        x0, y0 = rng.randint(0, width - 20), rng.randint(0, height - 20)
+        x1, y1 = rng.randint(x0 + 10, width), rng.randint(y0 + 10, height)
+        if grayscale:
+            value = rng.randint(0, 255)
+            fill = (value, value, value)
+        else:
+            fill = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+        draw.rectangle((x0, y0, x1, y1), fill=fill, outline=(0, 0, 0), width=3)
+    for _ in range(rng.randint(5, 15)):
+        points = [(rng.randint(0, width), rng.randint(0, height)) for _ in range(2)]
+        draw.line(points, fill=(0, 0, 0), width=rng.randint(1, 4))
+    return img
+
+
+def _encode_page(rng, params):
+    """生成并编码一页，返回 (扩展名, 字节数据)"""
+    formats = _formats()
+    extension, format_name = formats[rng.randrange(len(formats))]
+    width, height = PAGE_SIZES[rng.randrange(len(PAGE_SIZES))]
+    size = (max(64, int(width * params['scale'])), max(64, int(height * params['scale'])))
+    img = _render_page(rng, size, rng.random() < params['grayscale_ratio'])
+
+    buffer = BytesIO()
+    if format_name == 'JPEG':
+        img.save(buffer, format_name, quality=rng.choice([75, 85, 92]))
+    elif format_name == 'WEBP':
+        img.save(buffer, format_name, quality=80)
+    else:
+        img.save(buffer, format_name)
+    return extension, buffer.getvalue()
+
+
+def _album_name(rng, index):
+    """带方括号作者名的相册名，如 "[CLAMP] 星之海 第03卷" """
+    author = AUTHORS[rng.randrange(len(AUTHORS))]
+    series = SERIES[rng.randrange(len(SERIES))]
+    style = rng.randrange(3)
+    if style == 0:
+        return f"[{author}] {series} 第{index + 1:02d}卷"
+    if style == 1:
+        return f"[{author}] {series} v{index + 1}"
+    return f"{series} ({author}) {index + 1}"
+
+
+def _unique_path(path):
+    """名称重复时追加序号"""
+    candidate, counter = path, 2
+    while candidate.exists():
+        candidate = path.with_name(f"{path.name} ({counter})")
+        counter += 1
+    return candidate
+
+
+def _write_album(rng, album_dir, params, stats):
+    """写入一个目录形式的相册"""
+    album_dir.mkdir(parents=True, exist_ok=True)
+    for page in range(params['pages']):
+        extension, data = _encode_page(rng, params)
+        (album_dir / f"{page + 1:03d}.{extension}").write_bytes(data)
+        stats['pages'] += 1
+        stats['bytes'] += len(data)
+    stats['albums'] += 1
+
+
+def _write_archive(rng, archive_path, params, stats):
+    """写入一个CBZ压缩包形式的相册（页面已压缩，按存储方式写入）"""
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_STORED) as archive:
+        for page in range(params['pages']):
+            extension, data = _encode_page(rng, params)
+            archive.writestr(f"{page + 1:03d}.{extension}", data)
+            stats['pages'] += 1
+            stats['bytes'] += len(data)
+    stats['albums'] += 1
+    stats['archives'] += 1
+
+
+def params_digest(params):
+    """参数摘要，用于判断已生成的库是否可以复用"""
+    return hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def generate_library(root, **overrides):
+    """生成合成漫画库（相同参数和种子时内容完全相同）
+
+    目录结构：
+        root/合集_01 系列名/卷1/卷2/[作者] 系列名 第01卷/001.jpg ...（合集，嵌套 1~depth 层）
+        root/[作者] 系列名 v1/001.png ...（独立相册）
+        root/[作者] 系列名 第02卷.cbz（压缩包相册）
+
+    Args:
+        root: 输出目录，已存在且参数相同时直接复用
+        **overrides: 覆盖 DEFAULT_PARAMS 中的参数
+
+    Returns:
+        dict: 库清单（参数和统计）
+    """
+    params = dict(DEFAULT_PARAMS, **overrides)
+    root = Path(root)
+    manifest_path = root / 'library.json'
+    digest = params_digest(params)
+
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if manifest.get('digest') == digest:
+                return manifest
+        except ValueError:
+            pass
+        shutil.rmtree(root)
+
+    rng = random.Random(params['seed'])
+    root.mkdir(parents=True, exist_ok=True)
+    stats = {'collections': 0, 'albums': 0, 'archives': 0, 'pages': 0, 'bytes': 0}
+
+    # 合集：每个相册放在随机深度的嵌套目录中
+    for collection_index in range(params['collections']):
+        series = SERIES[collection_index % len(SERIES)]
+        collection_dir = root / f"合集_{collection_index + 1:02d} {series}"
+        for album_index in range(params['albums']):
+            depth = rng.randint(0, max(0, params['depth'] - 1))
+            parent = collection_dir
+            for level in range(depth):
+                parent = parent / f"卷{level + 1}"
+            _write_album(rng, _unique_path(parent / _album_name(rng, album_index)), params, stats)
+        stats['collections'] += 1
+
+    # 独立相册：名称相近（同系列不同卷），部分为CBZ压缩包
+    for album_index in range(params['standalone']):
+        name = _album_name(rng, album_index)
+        if rng.random() < params['archive_ratio']:
+            _write_archive(rng, _unique_path(root / f"{name}.cbz"), params, stats)
+        else:
+            _write_album(rng, _unique_path(root / name), params, stats)
+
+    manifest = {'digest': digest, 'params': params, 'stats': stats}
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return manifest
+
+
+def default_library_dir(params=None):
+    """按参数摘要确定的默认库目录（系统临时目录下）"""
+    import tempfile
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    return Path(tempfile.gettempdir()) / 'comic_reader_bench' / params_digest(params)
@@ -0,0 +1,266 @@
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 以 python benchmarks/run_benchmarks.py 直接运行时，把项目根目录加入导入路径
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import PIL
+from PIL import Image
+from benchmarks.library_generator import DEFAULT_PARAMS, generate_library, default_library_dir
+from src.utils.logger import DEFAULT_MODULE_LEVELS, set_log_levels
+from src.utils.image_utils import ImageProcessor
+from src.utils.image_metadata import ImageMetadataIndex, get_metadata_index
+from src.utils.image_cache import ImageCache
+
+# 与相册网格一致的封面尺寸、与阅读器默认窗口相近的显示区域
+COVER_SIZE = (210, 280)
+VIEWER_SIZE = (1300, 900)
+SAMPLE_PAGES = 40  # 页面加载基准使用的页数
+
+
+def _measure(func, repeat, setup=None):
+    """重复执行并统计耗时
+
+    Args:
+        func: 被测函数，返回本次处理的项目数
+        repeat: 重复次数
+        setup: 每次执行前调用（不计时）
+
+    Returns:
+        dict: 最小/中位/平均/最大耗时（毫秒）、项目数和吞吐量
+    """
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        items = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(timings)
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(median, 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'items': items,
+        'items_per_sec': round(items / (median / 1000), 1) if median > 0 else None,
+    }
+
+
+def _wait_metadata_index():
+    """等待扫描触发的后台元数据索引完成，避免影响下一次计时"""
+    index = get_metadata_index()
+    while index.building:
+        time.sleep(0.01)
+
+
+def _iter_albums(items):
+    """展开合集和分组，返回所有单个相册"""
+    for item in items:
+        if item.get('albums'):
+            yield from _iter_albums(item['albums'])
+        else:
+            yield item
+
+
+def _tk_available():
+    """是否有可用的图形显示（PhotoImage需要Tk根窗口）"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def bench_scan(library, repeat):
+    """scan_albums：遍历目录、读取压缩包目录和智能分组"""
+    def run():
+        albums = ImageProcessor.scan_albums(str(library))
+        return len(list(_iter_albums(albums)))
+    return _measure(run, repeat, setup=_wait_metadata_index)
+
+
+def bench_grouping(standalone, repeat):
+    """create_smart_groups：根目录下独立相册的相似度分组"""
+    def run():
+        ImageProcessor.create_smart_groups([dict(album) for album in standalone])
+        return len(standalone)
+    return _measure(run, repeat)
+
+
+def bench_metadata(image_paths, repeat):
+    """元数据索引：并行读取所有页面文件头（冷索引）和按(字节数, 修改时间)复验（已索引）"""
+    index = ImageMetadataIndex()
+
+    def build():
+        index.build(image_paths)
+        return len(image_paths)
+
+    return {
+        'metadata_index_cold': _measure(build, repeat, setup=index.clear),
+        'metadata_index_revalidate': _measure(build, repeat),
+    }
+
+
+def bench_covers(covers, repeat):
+    """封面缩略图：冷缓存（解码+缩放+写PNG）和命中磁盘缓存（读PNG）"""
+    work_dir = Path(tempfile.mkdtemp(prefix='comic_reader_bench_cache_'))
+    cache = ImageCache(cache_dir=work_dir / 'cache')
+    try:
+        def reset():
+            shutil.rmtree(cache.cache_dir, ignore_errors=True)
+            cache.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        def cold():
+            for index, image_path in enumerate(covers):
+                cache.render_thumbnail(image_path, COVER_SIZE, cache.cache_dir / f"{index}.png")
+            return len(covers)
+
+        def warm():
+            for cached_path in sorted(cache.cache_dir.glob('*.png')):
+                with Image.open(cached_path) as img:
+                    img.load()
+            return len(covers)
+
+        return {
+            'cover_cold': _measure(cold, repeat, setup=reset),
+            'cover_disk_hit': _measure(warm, repeat),
+        }
+    finally:
+        cache.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_page_load(pages, repeat, tk_root):
+    """阅读器页面加载：解码并按适应窗口缩放；有图形显示时包含PhotoImage转换"""
+    def prepare():
+        for image_path in pages:
+            ImageProcessor.prepare_image_with_mode(image_path, *VIEWER_SIZE, mode='fit')
+        return len(pages)
+
+    results = {'page_prepare_fit': _measure(prepare, repeat)}
+    if tk_root is None:
+        results['page_load_with_mode'] = {'skipped': '没有可用的图形显示'}
+    else:
+        def load():
+            for image_path in pages:
+                ImageProcessor.load_image_with_mode(image_path, *VIEWER_SIZE, mode='fit')
+            return len(pages)
+        results['page_load_with_mode'] = _measure(load, repeat)
+    return results
+
+
+def compare_baseline(results, baseline_path, tolerance):
+    """与基准结果比较中位耗时
+
+    Returns:
+        list: 变慢超过容差的 (名称, 基准ms, 当前ms)
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding='utf-8')).get('results', {})
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name, {})
+        if 'median_ms' in result and old.get('median_ms'):
+            if result['median_ms'] > old['median_ms'] * (1 + tolerance):
+                regressions.append((name, old['median_ms'], result['median_ms']))
+    return regressions
+
+
+def print_summary(results, stream=sys.stderr):
+    """输出结果表格"""
+    print(f"{'基准':<28}{'中位(ms)':>12}{'最小(ms)':>12}{'最大(ms)':>12}{'项目':>8}{'项目/秒':>12}", file=stream)
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<28}  已跳过: {result['skipped']}", file=stream)
+            continue
+        print(f"{name:<28}{result['median_ms']:>12.2f}{result['min_ms']:>12.2f}{result['max_ms']:>12.2f}"
+              f"{result['items']:>8}{result['items_per_sec'] or 0:>12.1f}", file=stream)
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='漫画阅读器性能基准测试')
+    parser.add_argument('--collections', type=int, default=DEFAULT_PARAMS['collections'], help='合集数')
+    parser.add_argument('--albums', type=int, default=DEFAULT_PARAMS['albums'], help='每个合集的相册数')
+    parser.add_argument('--pages', type=int, default=DEFAULT_PARAMS['pages'], help='每个相册的页数')
+    parser.add_argument('--standalone', type=int, default=DEFAULT_PARAMS['standalone'], help='独立相册数')
+    parser.add_argument('--depth', type=int, default=DEFAULT_PARAMS['depth'], help='合集最大嵌套层数')
+    parser.add_argument('--seed', type=int, default=DEFAULT_PARAMS['seed'], help='随机种子')
+    parser.add_argument('--repeat', type=int, default=5, help='每项基准的重复次数')
+    parser.add_argument('--library', help='合成库目录（默认按参数放在系统临时目录）')
+    parser.add_argument('--output', default='benchmark-results.json', help='结果JSON文件')
+    parser.add_argument('--baseline', help='用于比较的旧结果JSON文件')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='允许的中位耗时增幅（0.25即25%%）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 只输出警告和错误，避免日志干扰计时和结果表格
+    set_log_levels({module_name: 'WARNING' for module_name in DEFAULT_MODULE_LEVELS})
+
+    params = {key: getattr(args, key) for key in ('collections', 'albums', 'pages', 'standalone', 'depth', 'seed')}
+    library = Path(args.library) if args.library else default_library_dir(params)
+    start = time.perf_counter()
+    manifest = generate_library(library, **params)
+    print(f"合成库: {library} ({manifest['stats']['albums']} 个相册, {manifest['stats']['pages']} 页, "
+          f"{time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+    # 准备输入：首次扫描同时预热文件系统缓存
+    albums = ImageProcessor.scan_albums(str(library))
+    _wait_metadata_index()
+    all_albums = list(_iter_albums(albums))
+    standalone = [album for album in all_albums if Path(album['path']).parent == library]
+    covers = [album['cover_image'] for album in all_albums if album.get('cover_image')]
+    pages = [page for album in all_albums for page in album['image_files'][:2]][:SAMPLE_PAGES]
+
+    tk_root = _tk_available()
+    results = {
+        'scan_albums': bench_scan(library, args.repeat),
+        'create_smart_groups': bench_grouping(standalone, args.repeat),
+    }
+    results.update(bench_metadata([page for album in all_albums for page in album['image_files']], args.repeat))
+    results.update(bench_covers(covers, args.repeat))
+    results.update(bench_page_load(pages, args.repeat, tk_root))
+    if tk_root is not None:
+        tk_root.destroy()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'library': manifest,
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print_summary(results)
+    print(f"结果已保存: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(f"性能回退: {name} {old:.2f}ms -> {new:.2f}ms", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import sys
-from ttkthemes import ThemedTk
 
 # 设置默认编码
 if sys.platform.startswith('win'):
@@ -15,17 +14,29 @@ def main():
     try:
         # 初始化日志系统
         from src.utils.logger import get_logger, log_info, log_error, log_exception
+        from src.utils.startup_profiler import get_startup_profiler
         logger = get_logger('main')
         log_info("=== 漫画阅读器启动 ===", 'main')
+        profiler = get_startup_profiler()
         
-        # 创建主窗口
+        # 创建主窗口（主题库在这里才导入）
         log_info("创建主窗口", 'main')
-        root = ThemedTk()
+        with profiler.phase('主窗口'):
+            from ttkthemes import ThemedTk
+            root = ThemedTk()
         
         # 创建应用程序
         log_info("初始化应用程序", 'main')
-        from app_manager import PhotoAlbumApp
-        app = PhotoAlbumApp(root)
+        with profiler.phase('导入界面'):
+            from app_manager import PhotoAlbumApp
+        with profiler.phase('创建界面'):
+            app = PhotoAlbumApp(root)
+        
+        # 主循环第一次空闲时首帧已绘制，输出启动耗时报告
+        def on_first_idle():
+            profiler.mark_first_paint()
+            profiler.report()
+        root.after_idle(on_first_idle)
         
         log_info("应用程序启动成功，进入主循环", 'main')
         # 运行主循环
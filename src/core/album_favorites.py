@@ -1,7 +1,6 @@
-import os
 from tkinter import messagebox
-from src.utils.image_utils import ImageProcessor
-from ..utils.logger import get_logger, log_info, log_warning, log_error
+from ..utils.logger import get_logger, log_info, log_warning
+from ..utils.album_records import get_album_records
 
 class AlbumFavoritesManager:
     """漫画收藏管理器"""
@@ -11,9 +10,13 @@ class AlbumFavoritesManager:
         self.logger = get_logger('core.favorites')
     
     def show_favorites(self):
-        """显示收藏的漫画"""
+        """显示收藏的漫画
+        
+        先用扫描时缓存的相册记录立即显示，再在后台并发校验目录修改时间，
+        有变化或不存在的相册在校验完成后原地更新。
+        """
         log_info("开始显示收藏的漫画", 'core.favorites')
-        favorites = self.app.config_manager.get_favorites()
+        favorites = self.app.config_manager.get_favorites(check_exists=False)
         
         if not favorites:
             log_info("没有收藏记录", 'core.favorites')
@@ -22,16 +25,24 @@ class AlbumFavoritesManager:
         
         log_info(f"找到 {len(favorites)} 个收藏记录", 'core.favorites')
         
-        # 过滤存在的路径
-        valid_albums = self._filter_valid_favorites(favorites)
+        cached_albums = get_album_records().resolve(favorites, self.app.root, self._on_albums_validated)
+        log_info(f"缓存的收藏记录: {len(cached_albums)} 个，后台校验中", 'core.favorites')
+        self._display_favorite_albums(cached_albums)
+        self.app.status_bar.set_status(f"正在校验 {len(favorites)} 个收藏的漫画...")
+    
+    def _on_albums_validated(self, valid_albums):
+        """后台校验完成（主线程）：原地更新收藏视图"""
+        if not valid_albums:
+            if self.app.album_grid.replace_level_albums('favorites', []):
+                log_warning("所有收藏的漫画都不存在", 'core.favorites')
+                messagebox.showinfo("提示", "收藏的漫画都不存在了")
+                self.app.status_bar.set_status("收藏的漫画不存在")
+            return
         
-        if valid_albums:
+        if self.app.album_grid.replace_level_albums('favorites', valid_albums):
             log_info(f"有效的收藏记录: {len(valid_albums)} 个", 'core.favorites')
-            self._display_favorite_albums(valid_albums)
-        else:
-            log_warning("所有收藏的漫画都不存在", 'core.favorites')
-            messagebox.showinfo("提示", "收藏的漫画都不存在了")
-            self.app.status_bar.set_status("收藏的漫画不存在")
+            self.app.albums = valid_albums
+            self._update_status(valid_albums)
     
     def _show_no_favorites_message(self):
         """显示无收藏的消息"""
@@ -44,36 +55,16 @@ class AlbumFavoritesManager:
             "• 🏠 首页按钮返回扫描结果")
         log_info("显示无收藏提示", 'core.favorites')
     
-    def _filter_valid_favorites(self, favorites):
-        """过滤有效的收藏路径"""
-        valid_albums = []
-        for album_path in favorites:
-            try:
-                if os.path.exists(album_path):
-                    image_files = ImageProcessor.get_image_files(album_path)
-                    if image_files and len(image_files) > 0:
-                        valid_albums.append({
-                            'path': album_path,
-                            'name': os.path.basename(album_path),
-                            'image_files': image_files,
-                            'cover_image': image_files[0],
-                            'image_count': len(image_files),
-                            'folder_size': ImageProcessor.get_folder_size(image_files)
-                        })
-                        log_info(f"验证有效收藏: {os.path.basename(album_path)} ({len(image_files)} 张图片)", 'core.favorites')
-                else:
-                    log_warning(f"收藏路径不存在: {album_path}", 'core.favorites')
-            except Exception as e:
-                log_error(f"处理收藏漫画时出错 {album_path}: {e}", 'core.favorites')
-                continue
-        return valid_albums
-    
     def _display_favorite_albums(self, valid_albums):
         """显示有效的收藏漫画"""
         self.app.albums = valid_albums
-        self.app.album_grid.display_albums(valid_albums)
+        self.app.album_grid.display_albums(valid_albums, level_key='favorites', title='我的收藏')
+        self._update_status(valid_albums)
+    
+    def _update_status(self, valid_albums):
+        """更新状态栏"""
         self.app.status_bar.set_status(f"显示 {len(valid_albums)} 个收藏的漫画")
-        total_images = sum(len(album['image_files']) for album in valid_albums)
+        total_images = sum(album.get('image_count', 0) for album in valid_albums)
         self.app.status_bar.set_info(f"共 {total_images} 张图片")
         
         # 如果结果很多，提示滚动
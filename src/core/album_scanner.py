@@ -1,3 +1,4 @@
+import os
 from tkinter import messagebox
 from pathlib import Path
 from src.utils.image_utils import ImageProcessor
@@ -55,7 +56,10 @@ class AlbumScannerService:
     
     def _display_scan_results(self):
         """显示扫描结果 - 支持合集、智能分组和相册"""
-        self.app.album_grid.display_albums(self.app.albums)
+        # 新的扫描结果总是重新创建卡片
+        self.app.album_grid.display_albums(self.app.albums, level_key='scan',
+                                           title=os.path.basename(str(self.app.path_var.get().strip())),
+                                           reuse=False)
         
         # 统计不同类型的项目
         collections = [item for item in self.app.albums if item.get('type') == 'collection']
@@ -68,7 +72,7 @@ class AlbumScannerService:
             if item.get('type') in ['collection', 'smart_collection']:
                 total_images += item.get('image_count', 0)
             else:
-                total_images += len(item.get('image_files', []))
+                total_images += item.get('image_count', 0)
         
         # 统计各类型中包含的相册数
         collection_albums = sum(item.get('album_count', 0) for item in collections)
@@ -4,6 +4,7 @@ from src.utils.image_utils import ImageProcessor
 from ..ui.components.image_viewer import ImageViewer  # 直接从components导入
 from ..ui.components.style_manager import get_safe_font  # 直接从components导入
 from ..utils.logger import get_logger, log_info, log_warning, log_error, log_exception
+from ..utils.page_warmer import get_page_warmer
 from PIL import Image, ImageTk
 import tkinter as tk
 import os
@@ -19,7 +20,10 @@ class AlbumViewerManager:
         """打开漫画查看"""
         try:
             log_info(f"打开漫画: {os.path.basename(folder_path)}", 'core.viewer')
-            image_files = ImageProcessor.get_image_files(folder_path)
+            # 优先使用卡片悬停预热时列出的图片
+            image_files = get_page_warmer().take_files(folder_path)
+            if image_files is None:
+                image_files = ImageProcessor.get_image_files(folder_path)
             
             if not image_files:
                 log_warning(f"文件夹中没有找到图片: {folder_path}", 'core.viewer')
@@ -28,6 +32,14 @@ class AlbumViewerManager:
             
             log_info(f"找到 {len(image_files)} 张图片", 'core.viewer')
             
+            # 起始页：切换到上一个相册时从最后一张开始，否则从上次读到的页继续
+            if start_at_last:
+                start_index = len(image_files) - 1
+            else:
+                start_index = self.app.config_manager.get_resume_page(folder_path, len(image_files))
+            if start_index > 0:
+                log_info(f"从第 {start_index + 1} 页开始查看", 'core.viewer')
+            
             # 添加到最近浏览
             self.app.config_manager.add_recent_album(folder_path)
                 
@@ -38,13 +50,8 @@ class AlbumViewerManager:
             try:
                 viewer = ImageViewer(album_window, image_files, self.app.config_manager, 
                                    album_list=album_list, current_album_index=current_album_index, 
-                                   album_viewer_manager=self)
-                
-                # 如果需要从最后一张开始，设置索引
-                if start_at_last:
-                    viewer.current_index = len(image_files) - 1
-                    viewer.load_current_image()
-                    log_info("从最后一张图片开始查看", 'core.viewer')
+                                   album_viewer_manager=self, album_path=folder_path,
+                                   start_index=start_index)
                 
                 # 更新主窗口状态
                 album_name = os.path.basename(folder_path)
@@ -58,13 +65,42 @@ class AlbumViewerManager:
                 # 创建简单的图片查看器
                 self._create_simple_viewer(album_window, image_files, os.path.basename(folder_path),
                                           album_list=album_list, current_album_index=current_album_index, 
-                                          start_at_last=start_at_last)
+                                          start_index=start_index)
             
         except Exception as e:
             log_exception(f"打开漫画时发生错误: {e}", 'core.viewer')
             messagebox.showerror("错误", f"打开漫画时发生错误：{str(e)}")
             self.app.status_bar.set_status("打开漫画失败")
     
+    def switch_album(self, viewer, folder_path, album_index, start_at_last=False):
+        """在已打开的查看器窗口中切换相册，优先使用预取的图片列表"""
+        try:
+            image_files = viewer.take_prefetched_files(folder_path)
+            if image_files is None:
+                image_files = ImageProcessor.get_image_files(folder_path)
+            
+            if not image_files:
+                log_warning(f"文件夹中没有找到图片: {folder_path}", 'core.viewer')
+                messagebox.showinfo("提示", "该文件夹中没有找到图片")
+                return
+            
+            # 添加到最近浏览
+            self.app.config_manager.add_recent_album(folder_path)
+            
+            album_name = os.path.basename(folder_path)
+            viewer.parent.title(f"📸 漫画查看器 - {album_name}")
+            viewer.switch_album(image_files, album_index, start_at_last=start_at_last, album_path=folder_path)
+            
+            # 更新主窗口状态
+            self.app.status_bar.set_status(f"已打开漫画: {album_name}")
+            self.app.status_bar.set_info(f"{len(image_files)} 张图片")
+            
+            log_info(f"切换相册: {album_name} ({len(image_files)} 张图片)", 'core.viewer')
+            
+        except Exception as e:
+            log_exception(f"切换相册时发生错误: {e}", 'core.viewer')
+            messagebox.showerror("错误", f"切换相册时发生错误：{str(e)}")
+    
     def _create_album_window(self, folder_path):
         """创建漫画窗口"""
         album_window = Toplevel(self.app.root)
@@ -83,7 +119,7 @@ class AlbumViewerManager:
         log_info(f"创建漫画查看窗口: {album_name}", 'core.viewer')
         return album_window
     
-    def _create_simple_viewer(self, window, image_files, album_name, album_list=None, current_album_index=None, start_at_last=False):
+    def _create_simple_viewer(self, window, image_files, album_name, album_list=None, current_album_index=None, start_index=0):
         """创建简单的图片查看器"""
         try:
             log_info(f"创建简单图片查看器: {album_name}", 'core.viewer')
@@ -91,7 +127,7 @@ class AlbumViewerManager:
             window.configure(bg='black')
             
             # 当前图片索引
-            current_index = [len(image_files) - 1 if start_at_last else 0]
+            current_index = [start_index]
             
             # 图片显示标签
             image_label = tk.Label(window, bg='black')
@@ -108,7 +144,7 @@ class AlbumViewerManager:
                         image_path = image_files[current_index[0]]
                         
                         # 加载图片
-                        with Image.open(image_path) as img:
+                        with ImageProcessor.open_image(image_path) as img:
                             # 调整大小
                             window.update()
                             width = window.winfo_width() or 800
@@ -125,7 +161,7 @@ class AlbumViewerManager:
                         window.title(f"📸 {filename} ({current_index[0]+1}/{len(image_files)})")
                         
                 except Exception as e:
-                    print(f"简单查看器加载图片失败: {e}")
+                    log_error(f"简单查看器加载图片失败: {e}", 'core.viewer')
                     image_label.configure(image='', text=f"无法加载图片\n{e}")
             
             def prev_image():
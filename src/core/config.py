@@ -1,7 +1,11 @@
+import atexit
 import json
 import os
+import threading
+import time
 from pathlib import Path
-from ..utils.logger import get_logger, log_info, log_warning, log_error, log_exception
+from ..utils.logger import get_logger, log_info, log_warning, log_error, log_exception, set_log_levels
+from .library_store import LibraryStore
 
 class ConfigManager:
     """配置管理器，支持Unicode路径"""
@@ -21,15 +25,35 @@ class ConfigManager:
         self.default_config = {
             'last_path': '',
             'window_size': '1200x800',
-            'recent_albums': [],
-            'favorites': [],
-            'max_recent': 10,
+            'max_recent': 100,  # 最近浏览视图显示的数量（历史记录本身不限数量）
             'auto_switch_album': True,  # 是否启用自动切换相册
-            'show_switch_notification': True  # 是否显示切换提示
+            'show_switch_notification': True,  # 是否显示切换提示
+            'spread_right_to_left': True,  # 双页模式是否从右到左（日漫）
+            'log_levels': {},  # 模块日志级别，如 {"image_cache": "WARNING", "core": "DEBUG"}
+            'tracing_enabled': False,  # 是否记录性能追踪（可导出为Chrome trace）
+            'stall_threshold_ms': 200  # 主循环延迟超过该值记为界面卡顿，0表示关闭检测
         }
         
         # 加载配置
         self.config = self.load_config()
+        set_log_levels(self.config.get('log_levels'))
+        
+        # 延迟写入：修改时只标记版本号，后台线程合并一段时间内的修改后原子写入
+        self.save_delay = 0.5  # 合并写入的等待时间（秒）
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty_version = 0
+        self._saved_version = 0
+        self._pending_data = None  # 最近一次 save_config 时的配置快照（JSON文本）
+        self._writer_thread = None
+        self._closed = False
+        
+        # 收藏、阅读历史和阅读进度保存在SQLite漫画库中
+        self.library = LibraryStore(self.config_dir / 'library.db')
+        self._migrate_legacy_lists()
+        atexit.register(self.flush)
+        atexit.register(self.library.flush)
+        
         log_info("配置管理器初始化完成", 'core.config')
     
     def load_config(self):
@@ -51,13 +75,70 @@ class ConfigManager:
         return self.default_config.copy()
     
     def save_config(self):
-        """保存配置文件"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-            log_info("配置文件保存成功", 'core.config')
-        except Exception as e:
-            log_exception(f"保存配置文件失败: {e}", 'core.config')
+        """在调用线程上生成配置快照，由后台线程合并写入（不阻塞调用方）"""
+        with self._condition:
+            # 在修改配置的线程上序列化，写入线程只写快照，不读取可能正被修改的配置
+            self._pending_data = json.dumps(self.config, indent=2, ensure_ascii=False)
+            self._dirty_version += 1
+            if self._writer_thread is None and not self._closed:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                                       name='ConfigWriter')
+                self._writer_thread.start()
+            self._condition.notify_all()
+    
+    def flush(self):
+        """立即写入尚未保存的修改（退出时调用）"""
+        self._write_pending()
+    
+    def close(self):
+        """写入未保存的修改并停止后台写入线程"""
+        self.flush()
+        self.library.close()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    @property
+    def dirty(self):
+        """是否有尚未写入磁盘的修改"""
+        with self._condition:
+            return self._dirty_version != self._saved_version
+    
+    def _writer_loop(self):
+        """后台写入线程：有修改时等待合并窗口结束后写入"""
+        while True:
+            with self._condition:
+                while self._dirty_version == self._saved_version and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            time.sleep(self.save_delay)
+            self._write_pending()
+    
+    def _write_pending(self):
+        """把最近的配置快照写入磁盘（与后台线程互斥）"""
+        with self._write_lock:
+            with self._condition:
+                version = self._dirty_version
+                if version == self._saved_version:
+                    return
+                data = self._pending_data
+            try:
+                self._write_atomic(data)
+                with self._condition:
+                    self._saved_version = max(self._saved_version, version)
+                log_info("配置文件保存成功", 'core.config')
+            except Exception as e:
+                log_exception(f"保存配置文件失败: {e}", 'core.config')
+    
+    def _write_atomic(self, data):
+        """写入临时文件、fsync后重命名覆盖，写入中断时旧配置保持完整"""
+        temp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.config_file)
     
     def get_last_path(self):
         """获取上次使用的路径"""
@@ -72,85 +153,86 @@ class ConfigManager:
         self.config['last_path'] = str(path)
         self.save_config()
     
-    def add_recent_album(self, album_path):
-        """添加到最近浏览"""
-        album_path = str(album_path)
-        recent_albums = self.config.get('recent_albums', [])
-        
-        # 如果已存在，先移除
-        if album_path in recent_albums:
-            recent_albums.remove(album_path)
+    def _migrate_legacy_lists(self):
+        """把旧版settings.json中的收藏和最近浏览列表迁移到漫画库"""
+        favorites = self.config.pop('favorites', None)
+        recent_albums = self.config.pop('recent_albums', None)
+        recent_times = self.config.pop('recent_times', None)
+        if favorites is None and recent_albums is None and recent_times is None:
+            return
         
-        # 添加到开头
-        recent_albums.insert(0, album_path)
-        
-        # 限制数量
-        max_recent = self.config.get('max_recent', 10)
-        if len(recent_albums) > max_recent:
-            recent_albums = recent_albums[:max_recent]
-        
-        self.config['recent_albums'] = recent_albums
+        self.library.import_legacy(favorites or [], recent_albums or [], recent_times or {})
+        self.library.flush()
         self.save_config()
+    
+    def add_recent_album(self, album_path):
+        """添加到最近浏览（阅读历史不限数量）"""
+        album_path = str(album_path)
+        self.library.record_history(album_path)
         log_info(f"添加到最近浏览: {os.path.basename(album_path)}", 'core.config')
     
-    def get_recent_albums(self):
-        """获取最近浏览的漫画"""
-        recent_albums = self.config.get('recent_albums', [])
-        # 过滤不存在的路径
-        valid_albums = []
-        for album_path in recent_albums:
-            if Path(album_path).exists():
-                valid_albums.append(album_path)
+    def get_recent_albums(self, check_exists=True):
+        """获取最近浏览的漫画（最近的 max_recent 个）
         
-        # 如果有变化，更新配置
-        if len(valid_albums) != len(recent_albums):
-            self.config['recent_albums'] = valid_albums
-            self.save_config()
+        路径暂时不可访问（如网络存储未连接）时只是不显示，不删除历史记录。
         
-        return valid_albums
+        Args:
+            check_exists: 是否跳过当前不存在的路径；由调用方在后台校验时传False
+        """
+        max_recent = self.config.get('max_recent', 100)
+        recent_albums = self.library.get_history(limit=max_recent)
+        if not check_exists:
+            return recent_albums
+        return [album_path for album_path in recent_albums if Path(album_path).exists()]
+    
+    def get_last_read_time(self, album_path):
+        """获取相册最近阅读时间戳，未阅读过返回0"""
+        return self.library.get_last_read_time(str(album_path))
     
     def add_favorite(self, album_path):
         """添加到收藏"""
         album_path = str(album_path)
-        favorites = self.config.get('favorites', [])
-        
-        if album_path not in favorites:
-            favorites.append(album_path)
-            self.config['favorites'] = favorites
-            self.save_config()
+        if self.library.add_favorite(album_path):
             log_info(f"添加到收藏: {os.path.basename(album_path)}", 'core.config')
     
     def remove_favorite(self, album_path):
         """从收藏中移除"""
         album_path = str(album_path)
-        favorites = self.config.get('favorites', [])
-        
-        if album_path in favorites:
-            favorites.remove(album_path)
-            self.config['favorites'] = favorites
-            self.save_config()
+        if self.library.remove_favorite(album_path):
             log_info(f"移除收藏: {os.path.basename(album_path)}", 'core.config')
     
     def is_favorite(self, album_path):
         """检查是否已收藏"""
-        album_path = str(album_path)
-        return album_path in self.config.get('favorites', [])
-    
-    def get_favorites(self):
-        """获取收藏的漫画"""
-        favorites = self.config.get('favorites', [])
-        # 过滤不存在的路径
-        valid_favorites = []
-        for album_path in favorites:
-            if Path(album_path).exists():
-                valid_favorites.append(album_path)
-        
-        # 如果有变化，更新配置
-        if len(valid_favorites) != len(favorites):
-            self.config['favorites'] = valid_favorites
-            self.save_config()
+        return self.library.is_favorite(str(album_path))
+    
+    def get_favorites(self, check_exists=True):
+        """获取收藏的漫画（不删除暂时不可访问的收藏）
         
-        return valid_favorites
+        Args:
+            check_exists: 是否跳过当前不存在的路径；由调用方在后台校验时传False
+        """
+        favorites = self.library.get_favorites()
+        if not check_exists:
+            return favorites
+        return [album_path for album_path in favorites if Path(album_path).exists()]
+    
+    def get_reading_progress(self, album_path):
+        """获取相册的阅读进度 (页码, 总页数)，没有记录时返回None"""
+        return self.library.get_progress(str(album_path))
+    
+    def get_resume_page(self, album_path, page_count):
+        """打开相册时的起始页：上次读到的页码；没有记录或已读完时从头开始"""
+        progress = self.get_reading_progress(album_path)
+        if not progress:
+            return 0
+        page = progress[0]
+        if page <= 0 or page >= page_count - 1:
+            return 0
+        return page
+    
+    def set_reading_progress(self, album_path, page, page_count):
+        """保存相册的阅读进度（页码从0开始）"""
+        self.library.set_progress(str(album_path), page, page_count)
     
     def get_auto_switch_album(self):
         """获取是否启用自动切换相册"""
@@ -169,3 +251,29 @@ class ConfigManager:
         """设置是否显示切换提示"""
         self.config['show_switch_notification'] = enabled
         self.save_config()
+    
+    def get_spread_right_to_left(self):
+        """获取双页模式是否从右到左阅读"""
+        return self.config.get('spread_right_to_left', True)
+    
+    def set_spread_right_to_left(self, enabled):
+        """设置双页模式是否从右到左阅读"""
+        self.config['spread_right_to_left'] = enabled
+        self.save_config()
+    
+    def get_tracing_enabled(self):
+        """获取是否记录性能追踪"""
+        return self.config.get('tracing_enabled', False)
+    
+    def set_tracing_enabled(self, enabled):
+        """设置是否记录性能追踪"""
+        self.config['tracing_enabled'] = enabled
+        self.save_config()
+    
+    def get_stall_threshold(self):
+        """获取界面卡顿判定阈值（毫秒），0表示关闭检测"""
+        return self.config.get('stall_threshold_ms', 200)
+    
+    def get_trace_dir(self):
+        """性能追踪导出目录"""
+        return self.config_dir / 'traces'
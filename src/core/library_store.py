@@ -0,0 +1,227 @@
+import sqlite3
+import threading
+import time
+from itertools import islice
+from ..utils.logger import get_logger, log_info, log_exception
+
+# 数据库结构：收藏、阅读历史（不限数量）和每个相册的阅读进度
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS favorites (
+    path TEXT PRIMARY KEY,
+    added_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS history (
+    path TEXT PRIMARY KEY,
+    last_read REAL NOT NULL,
+    read_count INTEGER NOT NULL DEFAULT 1
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_history_last_read ON history (last_read);
+
+CREATE TABLE IF NOT EXISTS progress (
+    path TEXT PRIMARY KEY,
+    page INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class LibraryStore:
+    """漫画库数据库 - 收藏、阅读历史和阅读进度
+
+    启动时把三张表读入内存字典，查询和判断都是常数时间；
+    修改先更新内存，再把SQL语句排入队列，由后台线程合并为一个事务批量写入。
+    """
+
+    def __init__(self, db_path, write_delay=1.0):
+        """初始化数据库
+
+        Args:
+            db_path: SQLite数据库文件路径
+            write_delay: 批量写入前等待合并修改的时间（秒）
+        """
+        self.logger = get_logger('core.library')
+        self.db_path = db_path
+        self.write_delay = write_delay
+
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+
+        # 内存镜像
+        self.favorites = {}  # 路径 -> 收藏时间（按收藏顺序）
+        self.history = {}  # 路径 -> (最近阅读时间, 阅读次数)（按最近阅读时间从旧到新）
+        self._history_sorted = True  # 插入了更早的时间戳后置为False，查询时重新排序
+        self.progress = {}  # 路径 -> (页码, 总页数)
+        self._load()
+
+        # 批量写入队列
+        self._condition = threading.Condition()
+        self._pending = []  # [(SQL, 参数)]
+        self._writer_thread = None
+        self._closed = False
+
+    def _load(self):
+        """读取全部记录到内存"""
+        start_time = time.perf_counter()
+        with self._db_lock:
+            cursor = self._connection.cursor()
+            self.favorites = dict(cursor.execute('SELECT path, added_at FROM favorites ORDER BY added_at'))
+            self.history = {path: (last_read, count) for path, last_read, count in
+                            cursor.execute('SELECT path, last_read, read_count FROM history ORDER BY last_read')}
+            self.progress = {path: (page, count) for path, page, count in
+                             cursor.execute('SELECT path, page, page_count FROM progress')}
+        elapsed = (time.perf_counter() - start_time) * 1000
+        log_info(f"加载漫画库: 收藏 {len(self.favorites)}, 历史 {len(self.history)}, "
+                 f"进度 {len(self.progress)} ({elapsed:.0f}ms)", 'core.library')
+
+    # ---- 收藏 ----
+
+    def add_favorite(self, album_path):
+        """添加收藏，已收藏时返回False"""
+        if album_path in self.favorites:
+            return False
+        added_at = time.time()
+        self.favorites[album_path] = added_at
+        self._queue('INSERT OR REPLACE INTO favorites (path, added_at) VALUES (?, ?)', (album_path, added_at))
+        return True
+
+    def remove_favorite(self, album_path):
+        """移除收藏，未收藏时返回False"""
+        if self.favorites.pop(album_path, None) is None:
+            return False
+        self._queue('DELETE FROM favorites WHERE path = ?', (album_path,))
+        return True
+
+    def is_favorite(self, album_path):
+        """是否已收藏"""
+        return album_path in self.favorites
+
+    def get_favorites(self):
+        """按收藏顺序返回收藏的路径"""
+        return list(self.favorites)
+
+    # ---- 阅读历史 ----
+
+    def record_history(self, album_path, timestamp=None):
+        """记录一次阅读"""
+        timestamp = timestamp or time.time()
+        _, count = self.history.pop(album_path, (0, 0))
+        self._append_history(album_path, timestamp, count + 1)
+        self._queue('INSERT INTO history (path, last_read, read_count) VALUES (?, ?, 1) '
+                    'ON CONFLICT(path) DO UPDATE SET last_read = excluded.last_read, read_count = read_count + 1',
+                    (album_path, timestamp))
+
+    def get_history(self, limit=None):
+        """按最近阅读时间从新到旧返回路径
+
+        Args:
+            limit: 最多返回的数量，None表示全部
+        """
+        if not self._history_sorted:
+            self.history = dict(sorted(self.history.items(), key=lambda item: item[1][0]))
+            self._history_sorted = True
+        return list(islice(reversed(self.history), limit))
+
+    def _append_history(self, album_path, timestamp, count):
+        """把记录加到历史末尾，时间戳早于当前最新记录时标记为需要重新排序"""
+        if self.history and timestamp < self.history[next(reversed(self.history))][0]:
+            self._history_sorted = False
+        self.history[album_path] = (timestamp, count)
+
+    def get_last_read_time(self, album_path):
+        """最近阅读时间戳，未阅读过返回0"""
+        return self.history.get(album_path, (0, 0))[0]
+
+    def remove_history(self, album_path):
+        """删除一条阅读历史"""
+        if self.history.pop(album_path, None) is not None:
+            self._queue('DELETE FROM history WHERE path = ?', (album_path,))
+
+    # ---- 阅读进度 ----
+
+    def set_progress(self, album_path, page, page_count):
+        """保存相册的阅读进度（页码从0开始）"""
+        if self.progress.get(album_path) == (page, page_count):
+            return
+        self.progress[album_path] = (page, page_count)
+        self._queue('INSERT OR REPLACE INTO progress (path, page, page_count, updated_at) VALUES (?, ?, ?, ?)',
+                    (album_path, page, page_count, time.time()))
+
+    def get_progress(self, album_path):
+        """获取阅读进度 (页码, 总页数)，没有记录时返回None"""
+        return self.progress.get(album_path)
+
+    # ---- 迁移 ----
+
+    def import_legacy(self, favorites, recent_albums, recent_times):
+        """从旧版settings.json中的列表导入收藏和最近浏览（已有的记录不覆盖）"""
+        now = time.time()
+        for offset, album_path in enumerate(favorites):
+            if album_path not in self.favorites:
+                added_at = now - len(favorites) + offset  # 保持原有顺序
+                self.favorites[album_path] = added_at
+                self._queue('INSERT OR IGNORE INTO favorites (path, added_at) VALUES (?, ?)', (album_path, added_at))
+        for offset, album_path in enumerate(recent_albums):
+            if album_path not in self.history:
+                timestamp = recent_times.get(album_path) or now - offset  # 列表靠前的更近
+                self._append_history(album_path, timestamp, 1)
+                self._queue('INSERT OR IGNORE INTO history (path, last_read, read_count) VALUES (?, ?, 1)',
+                            (album_path, timestamp))
+        log_info(f"已导入旧版收藏 {len(favorites)} 个, 最近浏览 {len(recent_albums)} 个", 'core.library')
+
+    # ---- 批量写入 ----
+
+    def _queue(self, sql, params):
+        """排入写入队列，由后台线程批量提交"""
+        with self._condition:
+            if self._closed:
+                return
+            self._pending.append((sql, params))
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                                       name='LibraryWriter')
+                self._writer_thread.start()
+            self._condition.notify_all()
+
+    def _writer_loop(self):
+        """后台写入线程：等待合并窗口结束后把队列中的语句在一个事务中提交"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            time.sleep(self.write_delay)
+            self.flush()
+
+    def flush(self):
+        """立即提交队列中的所有修改"""
+        with self._condition:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            with self._db_lock:
+                with self._connection:
+                    for sql, params in pending:
+                        self._connection.execute(sql, params)
+        except Exception as e:
+            log_exception(f"写入漫画库失败: {e}", 'core.library')
+            # 事务已回滚：放回队列开头，保持修改顺序，下次写入时重试
+            with self._condition:
+                self._pending[:0] = pending
+
+    def close(self):
+        """提交剩余修改并关闭数据库"""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        with self._db_lock:
+            self._connection.close()
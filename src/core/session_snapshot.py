@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import time
+from ..utils.album_sort import natural_sort_key
+from ..utils.logger import get_logger, log_info, log_exception
+
+
+class SessionSnapshot:
+    """上次会话快照 - 启动时立即显示上次的扫描结果，再在后台校验
+
+    快照保存扫描路径、扫描结果、视图状态（筛选、排序、滚动位置）、
+    最近浏览和收藏相册的扫描记录，以及可见封面的缓存键。
+    相册数据去掉图片列表后以gzip压缩的JSON保存，写入时先写临时文件再替换。
+    """
+
+    VERSION = 1
+
+    def __init__(self, config_dir):
+        """初始化快照
+
+        Args:
+            config_dir: 配置目录（~/.comic_reader）
+        """
+        self.logger = get_logger('core.session')
+        self.snapshot_file = config_dir / 'session.json.gz'
+
+    def save(self, state):
+        """保存快照
+
+        Args:
+            state: 会话状态字典（相册数据需先经过 compact_albums）
+        """
+        try:
+            start_time = time.perf_counter()
+            state = dict(state, version=self.VERSION, saved_at=time.time())
+            data = gzip.compress(json.dumps(state, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                                 compresslevel=5)
+
+            temp_file = self.snapshot_file.with_name(self.snapshot_file.name + '.tmp')
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.snapshot_file)
+
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_info(f"会话快照已保存: {len(data) / 1024:.0f}KB ({elapsed:.0f}ms)", 'core.session')
+        except Exception as e:
+            log_exception(f"保存会话快照失败: {e}", 'core.session')
+
+    def load(self):
+        """读取快照，不存在或版本不符时返回None"""
+        if not self.snapshot_file.exists():
+            return None
+        try:
+            start_time = time.perf_counter()
+            with open(self.snapshot_file, 'rb') as f:
+                state = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+            if state.get('version') != self.VERSION:
+                return None
+
+            state['albums'] = self.restore_albums(state.get('albums', []))
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_info(f"读取会话快照: {len(state['albums'])} 个项目 ({elapsed:.0f}ms)", 'core.session')
+            return state
+        except Exception as e:
+            log_exception(f"读取会话快照失败: {e}", 'core.session')
+            return None
+
+    @classmethod
+    def compact_albums(cls, albums):
+        """去掉图片列表和排序元组，只保留显示卡片所需的字段"""
+        compacted = []
+        for album in albums:
+            item = {key: value for key, value in album.items()
+                    if key not in ('image_files', 'sort_name', 'albums')}
+            if 'albums' in album:
+                item['albums'] = cls.compact_albums(album['albums'])
+            compacted.append(item)
+        return compacted
+
+    @classmethod
+    def restore_albums(cls, albums):
+        """恢复快照中的相册数据（重新计算自然排序键）"""
+        for album in albums:
+            album['sort_name'] = natural_sort_key(album.get('name', ''))
+            if 'albums' in album:
+                cls.restore_albums(album['albums'])
+        return albums
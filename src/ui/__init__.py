@@ -5,14 +5,30 @@
 所有UI组件已模块化到独立文件中，通过此文件统一导出。
 """
 
-# 导入所有UI组件
-from .components.style_manager import StyleManager, get_safe_font
-from .components.status_bar import StatusBar
-from .components.album_grid import AlbumGrid
-from .components.image_viewer import ImageViewer
+import importlib
 
-# 工具模块导入
-from ..utils.image_utils import ImageProcessor, SlideshowManager
+# 组件按需导入：导入 src.ui.components 下的单个模块时不会连带加载查看器、PIL等
+_LAZY_EXPORTS = {
+    'StyleManager': '.components.style_manager',
+    'get_safe_font': '.components.style_manager',
+    'StatusBar': '.components.status_bar',
+    'AlbumGrid': '.components.album_grid',
+    'ImageViewer': '.components.image_viewer',
+    
+    # 工具模块
+    'ImageProcessor': '..utils.image_utils',
+    'SlideshowManager': '..utils.image_utils',
+}
+
+
+def __getattr__(name):
+    """首次访问导出名称时才导入对应模块"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 # 导出所有公共接口
 __all__ = [
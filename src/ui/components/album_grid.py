@@ -4,12 +4,16 @@ import os
 import subprocess
 import platform
 from ...utils.image_utils import ImageProcessor, SlideshowManager
-from ...utils.image_cache import get_image_cache
-from PIL import Image, ImageTk
+from ...utils.page_warmer import get_page_warmer
+from ...utils.search_index import AlbumSearchIndex
+from ...utils.album_sort import AlbumSortKeys, SORT_DEFAULT, SORT_LAST_READ
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from .style_manager import StyleManager, get_safe_font
 from .status_bar import StatusBar
+from .navigation_stack import NavigationStack, GridLevel
+from ...utils.logger import log_info, log_debug, log_error
+from ...utils.tracing import traced
 
 
 class AlbumGrid:
@@ -25,6 +29,16 @@ class AlbumGrid:
         # 筛选相关
         self.all_albums = []  # 存储所有相册数据
         self.current_filter = "全部"  # 当前筛选条件
+        self.current_search = ""  # 当前搜索关键字
+        self.search_index = None  # 搜索索引，首次搜索时构建
+        self.current_sort = SORT_DEFAULT  # 当前排序方式
+        self.sort_keys = None  # 排序键，首次排序时构建
+        self.last_read_lookup = None  # 由外部设置，获取最近阅读时间
+        self.resume_page_lookup = None  # 由外部设置，获取相册的续读页 lookup(路径, 页数)
+        
+        # 续读页预热：悬停在卡片上一小段时间或单击选中时在后台解码
+        self.warm_delay = 150  # 悬停判定（毫秒）
+        self.warm_timer = None
         
         # 使用传入的样式管理器或创建新实例
         if style_manager:
@@ -34,13 +48,19 @@ class AlbumGrid:
             style = ttk.Style()
             self.style_manager = StyleManager(parent, style)
         
-        # 使用全局图片缓存
-        self.image_cache = get_image_cache()
-        
         # 防抖动布局参数
         self.layout_timer = None
         self.layout_delay = 300  # 300ms防抖
         
+        # 卡片渲染代次 - 重新渲染时使旧的分批创建任务和封面预加载失效
+        self.render_generation = 0
+        self.cover_preload_timer = None
+        
+        # 导航栈 - 缓存各层级的卡片、筛选条件和滚动位置
+        self.navigation = NavigationStack()
+        self.level_changed_callback = None  # 由外部设置，层级切换时回调 callback(level)
+        self.pending_scroll_offset = None  # 卡片创建完成后要恢复的滚动位置
+        
         # 现代化布局参数 - 优化为更大的卡片和瀑布流
         self.columns = 2  # 默认列数，会根据窗口大小动态调整
         self.card_width = 400  # 增大卡片宽度
@@ -91,10 +111,10 @@ class AlbumGrid:
                 command=self._show_album_properties
             )
             
-            print("右键菜单创建成功")
+            log_debug("右键菜单创建成功", 'ui.grid')
             
         except Exception as e:
-            print(f"创建右键菜单失败: {e}")
+            log_error(f"创建右键菜单失败: {e}", 'ui.grid')
     
     def _open_album_from_menu(self):
         """从右键菜单打开相册"""
@@ -120,9 +140,9 @@ class AlbumGrid:
                 # 显示提示
                 if hasattr(self, 'status_callback'):
                     self.status_callback(f"路径已复制: {os.path.basename(self.current_album_path)}")
-                print(f"路径已复制到剪贴板: {self.current_album_path}")
+                log_info(f"路径已复制到剪贴板: {self.current_album_path}", 'ui.grid')
             except Exception as e:
-                print(f"复制路径失败: {e}")
+                log_error(f"复制路径失败: {e}", 'ui.grid')
                 messagebox.showerror("错误", f"复制路径失败: {str(e)}")
     
     def _show_album_properties(self):
@@ -139,7 +159,7 @@ class AlbumGrid:
             total_size = 0
             for image_file in image_files:
                 try:
-                    total_size += os.path.getsize(image_file)
+                    total_size += ImageProcessor.get_image_stat(image_file)[0]
                 except:
                     continue
             
@@ -175,7 +195,7 @@ class AlbumGrid:
             messagebox.showinfo(f"相册属性 - {album_name}", properties_text)
             
         except Exception as e:
-            print(f"显示相册属性失败: {e}")
+            log_error(f"显示相册属性失败: {e}", 'ui.grid')
             messagebox.showerror("错误", f"无法获取相册属性: {str(e)}")
     
     def _open_folder_in_explorer(self, folder_path):
@@ -209,17 +229,17 @@ class AlbumGrid:
                 # 其他系统，尝试通用方法
                 subprocess.run(['xdg-open', folder_path], check=False)
             
-            print(f"已在文件管理器中打开: {folder_path}")
+            log_info(f"已在文件管理器中打开: {folder_path}", 'ui.grid')
             
         except Exception as e:
-            print(f"打开文件夹失败: {e}")
+            log_error(f"打开文件夹失败: {e}", 'ui.grid')
             messagebox.showerror("错误", f"无法打开文件夹: {str(e)}")
     
     def _show_context_menu(self, event, album_path):
         """显示右键菜单"""
         try:
             self.current_album_path = album_path
-            print(f"右键点击相册: {os.path.basename(album_path)}")
+            log_debug(f"右键点击相册: {os.path.basename(album_path)}", 'ui.grid')
             
             # 更新收藏菜单项状态 - 修正索引为3
             if self.is_favorite and self.is_favorite(album_path):
@@ -229,10 +249,10 @@ class AlbumGrid:
             
             # 显示菜单
             self.context_menu.post(event.x_root, event.y_root)
-            print(f"右键菜单已显示在位置: ({event.x_root}, {event.y_root})")
+            log_debug(f"右键菜单已显示在位置: ({event.x_root}, {event.y_root})", 'ui.grid')
             
         except Exception as e:
-            print(f"显示右键菜单失败: {e}")
+            log_error(f"显示右键菜单失败: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
 
@@ -286,7 +306,7 @@ class AlbumGrid:
             self._bind_resize_events()
             
         except Exception as e:
-            print(f"创建AlbumGrid组件时出错: {e}")
+            log_error(f"创建AlbumGrid组件时出错: {e}", 'ui.grid')
             # 创建一个基本的框架作为备用
             self.grid_frame = tk.Frame(self.parent, bg='white')
             self.grid_frame.pack(fill='both', expand=True)
@@ -332,9 +352,26 @@ class AlbumGrid:
         try:
             self.layout_timer = None  # 清除定时器引用
             if hasattr(self, 'albums') and self.albums:
+                # 列数未变化时保留现有卡片
+                level = self.navigation.current
+                if (level and level.is_alive() and level.complete and
+                        level.columns == self._calculate_columns()):
+                    return
                 self._create_modern_album_cards(self.albums)
         except Exception as e:
-            print(f"重新布局漫画时出错: {e}")
+            log_error(f"重新布局漫画时出错: {e}", 'ui.grid')
+    
+    def _calculate_columns(self):
+        """计算响应式列数 - 基于固定卡片宽度420px"""
+        canvas_width = self.canvas.winfo_width() if self.canvas else 0
+        if canvas_width > 1:
+            # 根据固定卡片宽度420和间距计算最佳列数
+            available_width = canvas_width - (self.card_spacing * 2)  # 减去左右边距
+            card_total_width = 420 + self.card_spacing
+            calculated_columns = max(self.min_columns, available_width // card_total_width)
+            return min(self.max_columns, calculated_columns)
+        # 窗口尚未完全初始化时使用默认值
+        return 2
     
     def create_empty_state(self):
         """创建空状态引导页面"""
@@ -460,55 +497,326 @@ class AlbumGrid:
         """显示空状态（兼容旧方法）"""
         self.show_empty_state()
     
-    def display_albums(self, albums):
+    def display_albums(self, albums, level_key=None, title=None, reuse=True, scroll_offset=None):
         """显示漫画（兼容性方法）"""
-        self.update_albums(albums)
+        self.update_albums(albums, level_key=level_key, title=title, reuse=reuse, scroll_offset=scroll_offset)
     
-    def update_albums(self, albums):
-        """更新漫画显示"""
+    def update_albums(self, albums, level_key=None, title=None, reuse=True, scroll_offset=None):
+        """更新漫画显示
+        
+        Args:
+            albums: 相册数据列表
+            level_key: 视图标识（如 "scan"、"recent"、"favorites"），为None时刷新当前层级
+            title: 层级标题，用于面包屑显示
+            reuse: 数据一致时是否复用已缓存的卡片
+            scroll_offset: 新层级的初始滚动位置（如从会话快照恢复），为None时从顶部开始
+        """
         try:
-            # 保存所有相册数据
-            self.all_albums = albums or []
+            albums = albums or []
+            log_debug(f"AlbumGrid.update_albums 被调用，albums数量: {len(albums)}", 'ui.grid')
+            
+            current = self.navigation.current
+            if level_key is None:
+                level_key = current.key if current else 'home'
+                title = title or (current.title if current else '')
             
-            print(f"AlbumGrid.update_albums 被调用，albums数量: {len(albums) if albums else 0}")
+            # 同一视图且数据未变化：直接保留现有卡片
+            if (reuse and current and current.key == level_key and current.is_alive()
+                    and current.complete and current.same_albums(albums)):
+                return
             
-            # 应用当前筛选条件
-            filtered_albums = self._apply_filter(self.all_albums, self.current_filter)
+            self._save_current_level()
+            level = GridLevel(level_key, title, albums)
             
-            # 更新显示
-            self._update_display(filtered_albums)
+            cached = self.navigation.find_cached(level_key, albums) if reuse else None
+            if cached is not None and cached is not current:
+                # 复用其他历史位置上的卡片和浏览状态
+                self._adopt_level(level, cached)
+            else:
+                # 新层级继承当前的筛选和排序，搜索关键字重新开始
+                level.filter = self.current_filter
+                level.sort = self.current_sort
+            if scroll_offset is not None:
+                level.scroll_offset = scroll_offset
+            
+            if current is not None and current.key == level_key:
+                self.navigation.replace_current(level)
+            else:
+                self.navigation.push(level)
+            
+            self._activate_level(level)
+            
+        except Exception as e:
+            log_error(f"更新漫画显示时出错: {e}", 'ui.grid')
+            import traceback
+            traceback.print_exc()
+    
+    @property
+    def image_cache(self):
+        """全局图片缓存（首次加载封面时才创建线程池和缓存目录）"""
+        from ...utils.image_cache import get_image_cache
+        return get_image_cache()
+    
+    def get_scroll_offset(self):
+        """当前滚动位置（0.0~1.0）"""
+        try:
+            return self.canvas.yview()[0] if self.canvas else 0.0
+        except Exception:
+            return 0.0
+    
+    def replace_level_albums(self, level_key, albums):
+        """原地更新当前层级的相册数据（如后台校验完成后），保留筛选、搜索和滚动位置
+        
+        卡片已全部创建时按路径增量更新：只移除、重建或新增有变化的卡片，其余卡片原地保留。
+        
+        Returns:
+            bool: 当前层级是否仍为 level_key（用户已离开该视图时不更新）
+        """
+        current = self.navigation.current
+        if current is None or current.key != level_key:
+            return False
+        
+        # 路径和相册数据都未变化时保留现有卡片
+        if len(albums) == len(current.all_albums) and all(
+                a.get('path') == b.get('path') and not self._album_changed(a, b)
+                for a, b in zip(albums, current.all_albums)):
+            return True
+        
+        if current.is_alive() and not current.complete:
+            # 卡片仍在分批创建：创建完成后再合并
+            self.parent.after(200, lambda: self._merge_when_complete(current, albums))
+            return True
+        
+        if current.is_alive() and current.columns == self._calculate_columns():
+            self._merge_level_albums(current, albums)
+            return True
+        
+        self._save_current_level()
+        level = GridLevel(level_key, current.title, albums)
+        level.filter = current.filter
+        level.search = current.search
+        level.sort = current.sort
+        level.scroll_offset = current.scroll_offset
+        self.navigation.replace_current(level)
+        self._activate_level(level)
+        return True
+    
+    def _merge_when_complete(self, level, albums):
+        """等待当前层级的卡片创建完成后合并新数据（层级已切换时放弃）"""
+        if self.navigation.current is not level or not level.is_alive():
+            return
+        if not level.complete:
+            self.parent.after(200, lambda: self._merge_when_complete(level, albums))
+            return
+        self.replace_level_albums(level.key, albums)
+    
+    @staticmethod
+    def _album_changed(old, new):
+        """卡片上显示的相册数据是否变化"""
+        if old is None or new is None:
+            return True
+        return any(old.get(field) != new.get(field)
+                   for field in ('name', 'type', 'image_count', 'album_count', 'modified_time', 'cover_image'))
+    
+    def _merge_level_albums(self, level, albums):
+        """按路径把新数据合并到当前层级的卡片：移除消失和变化的卡片，创建新增的卡片，再按新顺序排布"""
+        try:
+            old_albums = {album.get('path'): album for album in level.all_albums}
+            new_albums = {album.get('path'): album for album in albums}
+            
+            # 数据变化后搜索索引和排序键需要重建
+            level.all_albums = self.all_albums = albums
+            level.search_index = self.search_index = None
+            level.sort_keys = self.sort_keys = None
+            visible = self._get_visible_albums()
+            visible_paths = {album.get('path') for album in visible}
+            
+            removed = 0
+            for path in list(level.cards):
+                if path not in visible_paths or self._album_changed(old_albums.get(path), new_albums.get(path)):
+                    level.cards.pop(path).destroy()
+                    removed += 1
+            
+            created = []
+            for i, album in enumerate(visible):
+                path = album.get('path')
+                if not path:
+                    continue
+                card = level.cards.get(path)
+                if card is None:
+                    card = self._create_modern_album_card(level.container, album)
+                    level.cards[path] = card
+                    created.append(album)
+                card.grid(row=i // level.columns, column=i % level.columns,
+                          padx=self.card_spacing//2, pady=self.card_spacing//2, sticky='nsew')
+            
+            level.albums = self.albums = visible
+            if visible:
+                self.hide_empty_state()
+            else:
+                self.show_empty_state()
+            
+            # 保持当前滚动位置，只更新滚动区域
+            self._restore_scroll(self.get_scroll_offset())
+            log_debug(f"增量更新层级 {level.key}: 移除 {removed} 张卡片, 创建 {len(created)} 张", 'ui.grid')
+        except Exception as e:
+            log_error(f"增量更新卡片失败: {e}", 'ui.grid')
+    
+    def _adopt_level(self, level, cached):
+        """把缓存层级的卡片容器和浏览状态转移到新层级"""
+        level.albums = cached.albums
+        level.filter = cached.filter
+        level.search = cached.search
+        level.sort = cached.sort
+        level.scroll_offset = cached.scroll_offset
+        level.search_index = cached.search_index
+        level.sort_keys = cached.sort_keys
+        level.container = cached.container
+        level.columns = cached.columns
+        level.complete = cached.complete
+        level.cards = cached.cards
+        cached.container = None
+        cached.complete = False
+        cached.cards = {}
+    
+    def _save_current_level(self):
+        """保存当前层级的浏览状态并隐藏其卡片"""
+        level = self.navigation.current
+        if level is None:
+            return
+        
+        level.filter = self.current_filter
+        level.search = self.current_search
+        level.sort = self.current_sort
+        level.search_index = self.search_index
+        level.sort_keys = self.sort_keys
+        
+        try:
+            if self.canvas:
+                level.scroll_offset = self.canvas.yview()[0]
+            if level.is_alive():
+                level.container.pack_forget()
+        except Exception as e:
+            log_error(f"保存层级状态时出错: {e}", 'ui.grid')
+    
+    def _activate_level(self, level):
+        """载入层级状态并显示，卡片仍然存活时直接恢复"""
+        self.all_albums = level.all_albums
+        self.current_filter = level.filter
+        self.current_search = level.search
+        self.current_sort = level.sort or SORT_DEFAULT
+        self.search_index = level.search_index
+        self.sort_keys = level.sort_keys
+        
+        if level.is_alive() and level.complete and level.columns == self._calculate_columns():
+            # 卡片仍在：重新显示并恢复滚动位置
+            self.albums = level.albums
+            self.render_generation += 1
+            if self.albums:
+                self.hide_empty_state()
+            else:
+                self.show_empty_state()
+            level.container.pack(fill='both', expand=True, padx=self.card_spacing, pady=self.card_spacing)
+            self._restore_scroll(level.scroll_offset)
+            log_debug(f"恢复缓存层级: {level.key} ({len(self.albums)} 个相册)", 'ui.grid')
+        else:
+            # 卡片已释放或布局变化：按保存的状态重建
+            level.release()
+            self.pending_scroll_offset = level.scroll_offset
+            self._update_display(self._get_visible_albums())
+        
+        self.navigation.enforce_memory_cap()
+        self._sync_navigation_ui(level)
+    
+    def _restore_scroll(self, offset):
+        """恢复滚动位置"""
+        try:
+            self.scrollable_frame.update_idletasks()
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            self.canvas.yview_moveto(offset or 0.0)
+        except Exception as e:
+            log_error(f"恢复滚动位置时出错: {e}", 'ui.grid')
+    
+    def _sync_navigation_ui(self, level):
+        """同步导航栏的前进/后退按钮和浏览状态"""
+        try:
+            if self.nav_bar:
+                if hasattr(self.nav_bar, 'update_history_buttons'):
+                    self.nav_bar.update_history_buttons(self.navigation.can_go_back(),
+                                                        self.navigation.can_go_forward())
+                if hasattr(self.nav_bar, 'sync_view_state'):
+                    self.nav_bar.sync_view_state(self.current_filter, self.current_sort, self.current_search)
+        except Exception as e:
+            log_error(f"同步导航栏状态时出错: {e}", 'ui.grid')
+    
+    def go_back(self):
+        """后退到上一个层级"""
+        return self._navigate_history(self.navigation.back)
+    
+    def go_forward(self):
+        """前进到下一个层级"""
+        return self._navigate_history(self.navigation.forward)
+    
+    def _navigate_history(self, move):
+        """在导航栈中移动并显示目标层级"""
+        try:
+            current = self.navigation.current
+            if current is None:
+                return None
+            
+            self._save_current_level()
+            level = move()
+            if level is None:
+                # 无法移动，重新显示当前层级
+                self._activate_level(current)
+                return None
+            
+            self._activate_level(level)
+            if self.level_changed_callback:
+                self.level_changed_callback(level)
+            return level
             
         except Exception as e:
-            print(f"更新漫画显示时出错: {e}")
+            log_error(f"导航历史切换失败: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
+            return None
+    
+    def refresh(self):
+        """重新创建当前层级的卡片（如收藏状态变化后）"""
+        level = self.navigation.current
+        if level is not None:
+            level.release()
+        self._update_display(self._get_visible_albums())
     
     def _update_display(self, albums):
         """更新显示内容"""
         try:
             self.albums = albums
+            self._cancel_cover_preload()
             
-            # 清除现有显示
-            if self.scrollable_frame:
-                for widget in self.scrollable_frame.winfo_children():
-                    widget.destroy()
+            # 清除当前层级的卡片（缓存层级的卡片保持不变）
+            level = self.navigation.current
+            if level is not None:
+                level.albums = albums
+                level.release()
             
             if not albums:
-                print("没有漫画数据，显示空状态")
+                log_debug("没有漫画数据，显示空状态", 'ui.grid')
                 self.show_empty_state()
                 return
             
             # 隐藏空状态
             self.hide_empty_state()
             
-            # 启动封面预加载
-            self._start_cover_preload(albums)
-            
             # 创建现代化漫画卡片
             self._create_modern_album_cards(albums)
             
+            # 启动封面预加载（绑定到本次渲染代次）
+            self._start_cover_preload(albums)
+            
         except Exception as e:
-            print(f"更新显示内容时出错: {e}")
+            log_error(f"更新显示内容时出错: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
     
@@ -535,23 +843,87 @@ class AlbumGrid:
                 if album_type == 'album':
                     filtered_albums.append(album)
         
-        print(f"筛选结果: {filter_type} -> {len(filtered_albums)} 个相册")
+        log_debug(f"筛选结果: {filter_type} -> {len(filtered_albums)} 个相册", 'ui.grid')
         return filtered_albums
     
     def apply_filter(self, filter_type):
         """应用筛选条件（外部调用）"""
         try:
             self.current_filter = filter_type
-            print(f"应用筛选条件: {filter_type}")
+            log_debug(f"应用筛选条件: {filter_type}", 'ui.grid')
             
             # 重新筛选并显示
-            filtered_albums = self._apply_filter(self.all_albums, filter_type)
+            filtered_albums = self._get_visible_albums()
+            self._update_display(filtered_albums)
+            
+        except Exception as e:
+            log_error(f"应用筛选条件时出错: {e}", 'ui.grid')
+            import traceback
+            traceback.print_exc()
+    
+    def _get_search_index(self):
+        """获取搜索索引（按需构建）"""
+        if self.search_index is None:
+            self.search_index = AlbumSearchIndex(
+                self.all_albums,
+                author_extractor=ImageProcessor._extract_author_from_name
+            )
+        return self.search_index
+    
+    def _get_sort_keys(self):
+        """获取排序键（按需构建）"""
+        if self.sort_keys is None:
+            self.sort_keys = AlbumSortKeys(self.all_albums, last_read_lookup=self.last_read_lookup)
+        return self.sort_keys
+    
+    def _get_visible_albums(self):
+        """获取应用搜索、排序和筛选后的相册列表"""
+        albums = self.all_albums
+        if not albums:
+            return albums
+        
+        album_ids = None
+        if self.current_search:
+            album_ids = self._get_search_index().search_ids(self.current_search)
+            if self.current_sort != SORT_DEFAULT:
+                album_ids = self._get_sort_keys().sort_ids(album_ids, self.current_sort)
+        elif self.current_sort != SORT_DEFAULT:
+            album_ids = self._get_sort_keys().order(self.current_sort)
+        
+        if album_ids is not None:
+            albums = [self.all_albums[album_id] for album_id in album_ids]
+        return self._apply_filter(albums, self.current_filter)
+    
+    def apply_sort(self, sort_mode):
+        """应用排序方式（外部调用）"""
+        try:
+            self.current_sort = sort_mode
+            log_debug(f"应用排序方式: {sort_mode}", 'ui.grid')
+            
+            # 最近阅读记录可能已变化
+            if sort_mode == SORT_LAST_READ and self.sort_keys is not None:
+                self.sort_keys.invalidate_last_read()
+            
+            self._update_display(self._get_visible_albums())
+            
+        except Exception as e:
+            log_error(f"应用排序方式时出错: {e}", 'ui.grid')
+            import traceback
+            traceback.print_exc()
+    
+    def apply_search(self, query):
+        """应用搜索关键字（外部调用，随输入增量过滤）"""
+        try:
+            self.current_search = (query or '').strip()
+            filtered_albums = self._get_visible_albums()
             self._update_display(filtered_albums)
+            return len(filtered_albums)
             
         except Exception as e:
-            print(f"应用筛选条件时出错: {e}")
+            log_error(f"应用搜索关键字时出错: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
+            return 0
     
     def get_filter_stats(self):
         """获取筛选统计信息"""
@@ -572,25 +944,44 @@ class AlbumGrid:
         return stats
     
     def _start_cover_preload(self, albums):
-        """启动封面预加载"""
+        """启动封面预加载：只预加载首屏的封面，渲染代次变化（如搜索输入）时停止"""
         try:
+            self._cancel_cover_preload()
             if not albums:
                 return
             
-            # 提取相册路径
-            album_paths = [album.get('path') for album in albums if album.get('path')]
+            # 首屏可见的卡片数（多预加载一行）
+            columns = self.columns or self._calculate_columns()
+            canvas_height = self.canvas.winfo_height() if self.canvas else 0
+            rows = max(1, canvas_height // (560 + self.card_spacing)) + 1
+            album_paths = [album.get('path') for album in albums[:columns * rows] if album.get('path')]
             
             if album_paths:
                 # 延迟启动预加载，避免阻塞UI创建
-                self.parent.after(500, lambda: self._preload_covers(album_paths))
-                print(f"计划预加载 {len(album_paths)} 个相册的封面")
+                generation = self.render_generation
+                self.cover_preload_timer = self.parent.after(
+                    500, lambda: self._preload_covers(album_paths, generation))
+                log_debug(f"计划预加载 {len(album_paths)} 个相册的封面", 'ui.grid')
                 
         except Exception as e:
-            print(f"启动封面预加载失败: {e}")
+            log_error(f"启动封面预加载失败: {e}", 'ui.grid')
+    
+    def _cancel_cover_preload(self):
+        """取消尚未执行的封面预加载批次"""
+        if self.cover_preload_timer is not None:
+            try:
+                self.parent.after_cancel(self.cover_preload_timer)
+            except Exception:
+                pass
+            self.cover_preload_timer = None
     
-    def _preload_covers(self, album_paths):
-        """执行封面预加载"""
+    def _preload_covers(self, album_paths, generation):
+        """执行封面预加载（已有新的渲染时放弃）"""
         try:
+            self.cover_preload_timer = None
+            if generation != self.render_generation:
+                return
+            
             # 分批预加载，避免一次性加载太多
             batch_size = 10
             current_batch = album_paths[:batch_size]
@@ -605,14 +996,15 @@ class AlbumGrid:
             
             # 如果还有剩余，安排下一批预加载
             if remaining_paths:
-                self.parent.after(2000, lambda: self._preload_covers(remaining_paths))
-                print(f"预加载了 {len(current_batch)} 个封面，剩余 {len(remaining_paths)} 个")
+                self.cover_preload_timer = self.parent.after(
+                    2000, lambda: self._preload_covers(remaining_paths, generation))
+                log_debug(f"预加载了 {len(current_batch)} 个封面，剩余 {len(remaining_paths)} 个", 'ui.grid')
             else:
-                print("所有封面预加载完成")
+                log_debug("所有封面预加载完成", 'ui.grid')
                 
         except Exception as e:
-            print(f"执行封面预加载失败: {e}")
-
+            log_error(f"执行封面预加载失败: {e}", 'ui.grid')
+    
     def _load_cover_async(self, album_path, cover_label):
         """异步加载封面图片 - 使用新的缓存系统"""
         try:
@@ -648,7 +1040,7 @@ class AlbumGrid:
                         cover_label.configure(image=photo, text='')
                         cover_label.image = photo  # 保持引用
                 except Exception as e:
-                    print(f"更新封面图片失败: {e}")
+                    log_error(f"更新封面图片失败: {e}", 'ui.grid')
             
             def on_error(error):
                 """加载失败回调"""
@@ -660,7 +1052,7 @@ class AlbumGrid:
                             fg=self.style_manager.colors['error']
                         )
                 except Exception as e:
-                    print(f"更新错误状态失败: {e}")
+                    log_error(f"更新错误状态失败: {e}", 'ui.grid')
             
             # 异步加载图片
             self.image_cache.load_image_async(
@@ -672,7 +1064,7 @@ class AlbumGrid:
             )
                         
         except Exception as e:
-            print(f"启动封面加载失败: {e}")
+            log_error(f"启动封面加载失败: {e}", 'ui.grid')
             try:
                 cover_label.configure(
                     text='❌\n加载失败', 
@@ -702,7 +1094,7 @@ class AlbumGrid:
                 callback(photo)
             
             def on_error(error):
-                print(f"加载封面失败 {album_path}: {error}")
+                log_error(f"加载封面失败 {album_path}: {error}", 'ui.grid')
                 callback(None)
             
             # 使用缓存系统异步加载 - 需要一个widget来执行回调
@@ -716,13 +1108,13 @@ class AlbumGrid:
             )
                 
         except Exception as e:
-            print(f"查找封面图片失败 {album_path}: {e}")
+            log_error(f"查找封面图片失败 {album_path}: {e}", 'ui.grid')
             callback(None)
     
     def _load_specific_cover_image(self, image_path, callback, size=(320, 350)):
         """加载指定的封面图片"""
         try:
-            if not image_path or not os.path.exists(image_path):
+            if not image_path or not ImageProcessor.image_exists(image_path):
                 callback(None)
                 return
             
@@ -730,7 +1122,7 @@ class AlbumGrid:
                 callback(photo)
             
             def on_error(error):
-                print(f"加载指定封面失败 {image_path}: {error}")
+                log_error(f"加载指定封面失败 {image_path}: {error}", 'ui.grid')
                 callback(None)
             
             # 使用缓存系统异步加载
@@ -743,7 +1135,7 @@ class AlbumGrid:
             )
                 
         except Exception as e:
-            print(f"加载指定封面图片失败 {image_path}: {e}")
+            log_error(f"加载指定封面图片失败 {image_path}: {e}", 'ui.grid')
             callback(None)
     
     def _open_collection(self, collection):
@@ -751,21 +1143,21 @@ class AlbumGrid:
         try:
             albums = collection.get('albums', [])
             if not albums:
-                print("合集中没有相册")
+                log_debug("合集中没有相册", 'ui.grid')
                 return
             
-            # 更新当前显示的相册列表为合集内的相册
-            self.albums = albums
-            self._create_modern_album_cards(albums)
+            # 合集作为新层级压入导航栈，返回时上一级卡片和滚动位置保持不变
+            collection_name = collection.get('name', '未知合集')
+            self.update_albums(albums,
+                               level_key=f"collection:{collection.get('path', collection_name)}",
+                               title=collection_name)
+            log_info(f"进入合集: {collection_name}", 'ui.grid')
             
-            # 如果有导航栏，更新导航状态
-            if hasattr(self, 'nav_bar') and self.nav_bar:
-                collection_name = collection.get('name', '未知合集')
-                # 这里可以添加面包屑导航或返回按钮的逻辑
-                print(f"进入合集: {collection_name}")
+            if self.level_changed_callback:
+                self.level_changed_callback(self.navigation.current)
             
         except Exception as e:
-            print(f"打开合集失败: {e}")
+            log_error(f"打开合集失败: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
     
@@ -775,26 +1167,29 @@ class AlbumGrid:
             if not self.scrollable_frame:
                 return
             
-            # 计算响应式列数 - 基于固定卡片宽度420px
-            canvas_width = self.canvas.winfo_width()
-            if canvas_width > 1:
-                # 根据固定卡片宽度420和间距计算最佳列数
-                available_width = canvas_width - (self.card_spacing * 2)  # 减去左右边距
-                card_total_width = 420 + self.card_spacing
-                calculated_columns = max(self.min_columns, available_width // card_total_width)
-                self.columns = min(self.max_columns, calculated_columns)
-            else:
-                # 窗口尚未完全初始化时使用默认值
-                self.columns = 2
+            # 计算响应式列数
+            self.columns = self._calculate_columns()
             
-            # 清空现有内容 - 批量操作减少重绘
-            for widget in self.scrollable_frame.winfo_children():
-                widget.destroy()
+            # 新的渲染代次，之前未完成的分批任务将被丢弃
+            self.render_generation += 1
+            generation = self.render_generation
+            
+            # 清空当前层级的卡片 - 其他层级缓存的卡片保持不变
+            level = self.navigation.current
+            if level is None:
+                level = self.navigation.push(GridLevel('home', '', self.all_albums))
+            level.release()
             
             # 创建网格容器
             grid_container = tk.Frame(self.scrollable_frame, bg=self.style_manager.colors['bg_primary'])
             grid_container.pack(fill='both', expand=True, padx=self.card_spacing, pady=self.card_spacing)
             
+            level.container = grid_container
+            level.columns = self.columns
+            level.albums = albums
+            level.complete = False
+            level.cards = {}
+            
             # 批量创建卡片 - 减少单次操作
             cards_to_create = []
             for i, album in enumerate(albums):
@@ -816,26 +1211,40 @@ class AlbumGrid:
                     cards_to_create.append((i, album, row, col))
                         
                 except Exception as e:
-                    print(f"准备漫画项时出错 {i}: {e}")
+                    log_error(f"准备漫画项时出错 {i}: {e}", 'ui.grid')
                     continue
             
             # 分批创建卡片，减少UI阻塞
-            self._create_cards_batch(grid_container, cards_to_create, 0)
+            self._create_cards_batch(grid_container, cards_to_create, 0, generation=generation, cards=level.cards)
                 
         except Exception as e:
-            print(f"创建漫画卡片时出错: {e}")
+            log_error(f"创建漫画卡片时出错: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
     
-    def _create_cards_batch(self, grid_container, cards_to_create, start_index, batch_size=5):
-        """分批创建卡片，避免UI阻塞"""
+    @traced('grid.card_batch')
+    def _create_cards_batch(self, grid_container, cards_to_create, start_index, batch_size=5, generation=None,
+                            cards=None):
+        """分批创建卡片，避免UI阻塞
+        
+        Args:
+            cards: 记录 相册路径 -> 卡片 的字典（层级用于增量更新）
+        """
         try:
+            # 已有更新的渲染（如搜索关键字变化），放弃本批
+            if generation is not None and generation != self.render_generation:
+                return
+            if not grid_container.winfo_exists():
+                return
+            
             end_index = min(start_index + batch_size, len(cards_to_create))
             
             for i in range(start_index, end_index):
                 album_index, album, row, col = cards_to_create[i]
                 
                 card = self._create_modern_album_card(grid_container, album)
+                if cards is not None:
+                    cards[album['path']] = card
                 card.grid(row=row, column=col, 
                          padx=self.card_spacing//2, 
                          pady=self.card_spacing//2, 
@@ -844,18 +1253,22 @@ class AlbumGrid:
             # 如果还有更多卡片要创建，安排下一批
             if end_index < len(cards_to_create):
                 self.parent.after(10, lambda: self._create_cards_batch(
-                    grid_container, cards_to_create, end_index, batch_size))
+                    grid_container, cards_to_create, end_index, batch_size, generation, cards))
             else:
                 # 所有卡片创建完成，配置网格权重
                 for i in range(self.columns):
                     grid_container.grid_columnconfigure(i, weight=1)
                 
-                # 更新滚动区域
-                self.scrollable_frame.update_idletasks()
-                self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+                level = self.navigation.current
+                if level is not None and level.container is grid_container:
+                    level.complete = True
+                
+                # 更新滚动区域，并恢复层级保存的滚动位置
+                self._restore_scroll(self.pending_scroll_offset or 0.0)
+                self.pending_scroll_offset = None
                 
         except Exception as e:
-            print(f"分批创建卡片时出错: {e}")
+            log_error(f"分批创建卡片时出错: {e}", 'ui.grid')
     
     def _create_modern_album_card(self, parent, album):
         """创建现代化单个漫画卡片 - 支持合集和相册"""
@@ -895,7 +1308,7 @@ class AlbumGrid:
             
             # 绑定右键菜单到卡片 - 使用更强的绑定
             def show_menu(event):
-                print(f"卡片右键事件触发: {album_path}")
+                log_debug(f"卡片右键事件触发: {album_path}", 'ui.grid')
                 self._show_context_menu(event, album_path)
                 return "break"  # 阻止事件继续传播
             
@@ -1096,7 +1509,7 @@ class AlbumGrid:
             
             # 添加双击打开功能
             def on_double_click(event):
-                print(f"双击打开相册: {album_path}")
+                log_debug(f"双击打开相册: {album_path}", 'ui.grid')
                 self.open_callback(album_path)
                 return "break"
             
@@ -1104,11 +1517,17 @@ class AlbumGrid:
             for widget in [card, cover_container, cover_label, info_frame, name_label]:
                 widget.bind("<Double-Button-1>", on_double_click)
             
-            print(f"创建卡片完成，路径: {album_path}")
+            # 悬停或单击选中相册时预热续读页
+            if album_type == 'album':
+                card.bind('<Enter>', lambda e: self._schedule_warm(card, album), add='+')
+                for widget in [card, cover_container, cover_label, info_frame, name_label]:
+                    widget.bind('<Button-1>', lambda e: self._warm_album(album), add='+')
+            
+            log_debug(f"创建卡片完成，路径: {album_path}", 'ui.grid')
             return card
             
         except Exception as e:
-            print(f"创建漫画卡片时出错: {e}")
+            log_error(f"创建漫画卡片时出错: {e}", 'ui.grid')
             import traceback
             traceback.print_exc()
             # 返回错误卡片
@@ -1124,6 +1543,27 @@ class AlbumGrid:
             error_label.pack(pady=20)
             return error_card
     
+    def _schedule_warm(self, card, album):
+        """指针进入卡片后延迟预热，快速划过的卡片不预热"""
+        if self.warm_timer:
+            self.parent.after_cancel(self.warm_timer)
+        self.warm_timer = self.parent.after(self.warm_delay, self._warm_if_hovered, card, album)
+    
+    def _warm_if_hovered(self, card, album):
+        """指针仍停留在卡片（或其子组件）上时预热"""
+        self.warm_timer = None
+        try:
+            widget = card.winfo_containing(*card.winfo_pointerxy())
+            if widget is not None and (widget == card or str(widget).startswith(str(card) + '.')):
+                self._warm_album(album)
+        except Exception:
+            pass  # 卡片已销毁
+    
+    def _warm_album(self, album):
+        """在后台解码相册的续读页及其相邻页"""
+        get_page_warmer().warm(album['path'], resume_lookup=self.resume_page_lookup,
+                               image_files=album.get('image_files'))
+    
     def _toggle_favorite(self, album_path, button):
         """切换收藏状态并更新按钮"""
         try:
@@ -1141,7 +1581,7 @@ class AlbumGrid:
                 button.configure(fg=self.style_manager.colors['text_primary'])
                 
         except Exception as e:
-            print(f"切换收藏状态时出错: {e}")
+            log_error(f"切换收藏状态时出错: {e}", 'ui.grid')
     
     def _add_hover_effects(self, album_frame, open_btn, fav_btn):
         """添加悬停效果"""
@@ -1185,7 +1625,7 @@ class AlbumGrid:
             fav_btn.bind('<Leave>', on_fav_btn_leave)
             
         except Exception as e:
-            print(f"添加悬停效果时出错: {e}")
+            log_error(f"添加悬停效果时出错: {e}", 'ui.grid')
     
     def _create_fallback_display(self, albums):
         """创建基本的显示方式作为备用"""
@@ -1219,11 +1659,11 @@ class AlbumGrid:
                             tk.Button(simple_frame, text="打开", 
                                     command=lambda p=album_path: self.open_callback(p)).pack(side='right', padx=10)
                     except Exception as e:
-                        print(f"创建简化漫画项时出错: {e}")
+                        log_error(f"创建简化漫画项时出错: {e}", 'ui.grid')
                         continue
                         
         except Exception as e:
-            print(f"创建备用显示时出错: {e}")
+            log_error(f"创建备用显示时出错: {e}", 'ui.grid')
     
     def _update_cover(self, label, photo):
         """更新封面图片"""
@@ -1232,7 +1672,7 @@ class AlbumGrid:
                 label.configure(image=photo, text="")
                 label.image = photo  # 保持引用
         except Exception as e:
-            print(f"更新封面时出错: {e}")
+            log_error(f"更新封面时出错: {e}", 'ui.grid')
     
     def __del__(self):
         """清理资源"""
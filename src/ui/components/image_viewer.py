@@ -3,25 +3,85 @@ import os
 from ...utils.image_utils import ImageProcessor, SlideshowManager
 from PIL import Image, ImageTk
 import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from .style_manager import StyleManager, get_safe_font
 from .status_bar import StatusBar
+from .tiled_renderer import TiledRenderer
+from .strip_view import VerticalStripView
+from ...utils.image_metadata import get_metadata_index
+from ...utils.read_ahead import get_read_ahead
+from ...utils.page_warmer import get_page_warmer
+from ...utils.spread_layout import read_page_sizes, build_spreads, page_to_spread_map, fit_spread
 from tkinter import messagebox
+from ...utils.logger import log_info, log_error
+from ...utils.tracing import traced, trace_span
 
 
 class ImageViewer:
     """图片查看器"""
     
-    def __init__(self, parent, image_files, config_manager, album_list=None, current_album_index=None, album_viewer_manager=None):
+    def __init__(self, parent, image_files, config_manager, album_list=None, current_album_index=None,
+                 album_viewer_manager=None, album_path=None, start_index=0):
         self.parent = parent
         self.image_files = image_files
         self.config_manager = config_manager
-        self.current_index = 0
+        self.album_path = album_path  # 用于保存阅读进度
+        self.current_index = max(0, min(start_index, len(image_files) - 1))
         self.current_image = None
         self.zoom_factor = 1.0
         self.is_fullscreen = False
         self.rotation = 0  # 旋转角度
         
+        # 已解码的原图缓存，缩放和平移时不再重复解码
+        self.source_key = None  # (路径, 旋转角度)
+        self.source_image = None
+        self.drag_start = None  # 拖动平移起点
+        
+        # 渐进式渲染：单线程执行高质量渲染，代次用于丢弃过期任务
+        self.render_generation = 0
+        self.render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ViewerRender')
+        
+        # 跨相册预取：临近相册边界时，在后台列出相邻相册的图片并解码开头/结尾几页
+        self.prefetch_pages = 2  # 每个相邻相册预解码的页数
+        self.max_prefetched_pages = 4
+        self.max_prefetched_bytes = 128 * 1024 * 1024  # 已解码原图的像素内存上限（宽×高×通道数）
+        self.prefetch_lock = threading.Lock()
+        self.prefetched_files = {}  # 相册路径 -> 图片文件列表
+        self.prefetched_pages = OrderedDict()  # (图片路径, 旋转角度) -> 已解码原图
+        self.prefetch_requested = set()  # 已发起预取的(相册路径, 方向)
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ViewerPrefetch')
+        
+        # 顺序预读：按阅读顺序提前把后续页面文件整块读入内存
+        self.read_ahead_pages = 6
+        self.read_ahead_index = None  # 最近一次计划预读时的页码
+        
+        # 窗口缩放：拖动期间合并Configure事件并快速缩放上一次的渲染，停止后只做一次高质量渲染
+        self.resize_settle_delay = 200  # 尺寸稳定判定（毫秒）
+        self.resize_timer = None
+        self.resize_preview_pending = False
+        self.canvas_size = None  # 最近一次处理的Canvas尺寸
+        self.rendered_canvas_size = None  # 最近一次渲染时的Canvas尺寸
+        self.page_image = None  # 当前显示页面的PIL图片，用于拖动时快速缩放
+        self.page_source_size = None  # 当前页面原图尺寸（已旋转）
+        
+        # 幻灯片：下一张在后台预先解码缩放，到点后直接替换
+        self.slideshow = None
+        self.prepared_slide = None
+        
+        # 条漫模式（连续纵向滚动），为None时为单页模式
+        self.strip_view = None
+        
+        # 双页模式：按文件头尺寸分组跨页，合成图按跨页缓存并预取下一组
+        self.spread_mode = False
+        self.spread_rtl = config_manager.get_spread_right_to_left() if config_manager else True
+        self.spreads = []
+        self.page_spread = []  # 页面索引 -> 跨页索引
+        self.spread_page_sizes = []
+        self.spread_cache = OrderedDict()  # (页面路径, 画布尺寸, 从右到左) -> 合成图
+        self.spread_pending = set()
+        self.max_cached_spreads = 4
+        
         # 相册切换相关
         self.album_list = album_list  # 相册列表
         self.current_album_index = current_album_index  # 当前相册在列表中的索引
@@ -112,6 +172,8 @@ class ImageViewer:
         # 功能按钮
         tk.Button(btn_frame, text="🖥️ 全屏", command=self.toggle_fullscreen, **btn_style).pack(side='left', padx=2)
         tk.Button(btn_frame, text="▶️ 幻灯片", command=self.start_slideshow, **btn_style).pack(side='left', padx=2)
+        tk.Button(btn_frame, text="📜 条漫", command=self.toggle_strip_mode, **btn_style).pack(side='left', padx=2)
+        tk.Button(btn_frame, text="📖 双页", command=self.toggle_spread_mode, **btn_style).pack(side='left', padx=2)
         tk.Button(btn_frame, text="ℹ️ 信息", command=self.show_image_info, **btn_style).pack(side='left', padx=2)
         tk.Button(btn_frame, text="❓ 帮助", command=self.show_help, **btn_style).pack(side='left', padx=2)
         
@@ -123,8 +185,14 @@ class ImageViewer:
         self.canvas = tk.Canvas(self.main_frame, bg='#1D1D1F', highlightthickness=0)
         self.canvas.pack(fill='both', expand=True)
         
+        # 放大后超出画布的图片按分块渲染
+        self.tiled_renderer = TiledRenderer(self.canvas, self.render_executor)
+        
         # 绑定Canvas事件
         self.canvas.bind('<Configure>', self.on_window_resize)
+        self.canvas.bind('<ButtonPress-1>', self.on_drag_start)
+        self.canvas.bind('<B1-Motion>', self.on_drag_move)
+        self.canvas.bind('<ButtonRelease-1>', self.on_drag_end)
         
         # 状态栏
         self.status_frame = tk.Frame(self.parent, bg='#2C2C2E', height=30)
@@ -144,8 +212,8 @@ class ImageViewer:
         
         # 绑定键盘事件
         self.parent.bind('<Key>', self.on_key_press)
-        self.parent.bind('<Left>', lambda e: self.prev_image())
-        self.parent.bind('<Right>', lambda e: self.next_image())
+        self.parent.bind('<Left>', lambda e: self.on_left_arrow())
+        self.parent.bind('<Right>', lambda e: self.on_right_arrow())
         self.parent.bind('<Home>', lambda e: self.goto_first_image())
         self.parent.bind('<End>', lambda e: self.goto_last_image())
         self.parent.bind('<plus>', lambda e: self.zoom_in())
@@ -156,8 +224,10 @@ class ImageViewer:
         # 绑定鼠标滚轮事件
         self.canvas.bind('<MouseWheel>', self.on_mouse_wheel)
         
-        # 绑定窗口大小变化事件
-        self.parent.bind('<Configure>', self.on_window_resize)
+        # 窗口大小变化统一由Canvas的<Configure>处理（见create_widgets）
+        
+        # 窗口关闭时停止后台渲染
+        self.canvas.bind('<Destroy>', self.on_destroy)
     
     def on_key_press(self, event):
         """处理键盘按键事件"""
@@ -173,80 +243,124 @@ class ImageViewer:
             self.start_slideshow()
         elif key == 'equal':  # + 键（不按Shift）
             self.zoom_in()
+        elif key == 'w':
+            self.toggle_strip_mode()
+        elif key == 'd':
+            self.toggle_spread_mode()
+        elif self.strip_view:
+            # 条漫模式下的滚动按键
+            if key == 'down':
+                self.strip_view.scroll(3)
+            elif key == 'up':
+                self.strip_view.scroll(-3)
+            elif key == 'next':  # PageDown
+                self.strip_view.scroll_pages(1)
+            elif key == 'prior':  # PageUp
+                self.strip_view.scroll_pages(-1)
     
-    def load_current_image(self):
-        """加载当前图片"""
+    @traced('viewer.render')
+    def load_current_image(self, draft=True):
+        """加载当前图片
+        
+        先在当前帧内显示快速的低质量渲染（JPEG草稿解码 + 双线性缩放），
+        再由后台线程完成LANCZOS高质量渲染后替换。翻页时旧的渲染任务作废。
+        PNG/WEBP等格式不支持草稿解码，先显示占位框，只在后台解码一次。
+        
+        Args:
+            draft: 是否先显示低质量渲染；窗口缩放结束时画面上已有预览，可跳过
+        """
         if not self.image_files or self.current_index >= len(self.image_files):
             return
         
+        # 新的渲染代次，之前未完成的高质量渲染将被丢弃
+        self.render_generation += 1
+        generation = self.render_generation
+        
+        self._schedule_read_ahead()
+        self._record_progress()
+        
+        if self.strip_view:
+            # 条漫模式：滚动到当前页（宽度变化时重新布局）
+            self._update_file_info(self.image_files[self.current_index])
+            self.strip_view.refresh(self.current_index)
+            return
+        
         try:
             image_path = self.image_files[self.current_index]
             
             # 更新文件信息
-            filename = os.path.basename(image_path)
-            file_info = f"{self.current_index + 1}/{len(self.image_files)} - {filename}"
+            self._update_file_info(image_path)
             
-            # 如果有相册列表信息，添加相册位置信息
-            if self.album_list and self.current_album_index is not None:
-                album_info = f" | 相册 {self.current_album_index + 1}/{len(self.album_list)}"
-                file_info += album_info
+            # 获取Canvas尺寸
+            canvas_width = self.canvas.winfo_width()
+            canvas_height = self.canvas.winfo_height()
             
-            self.file_info_var.set(file_info)
+            if canvas_width <= 1 or canvas_height <= 1:
+                # Canvas还没有正确初始化，延迟加载
+                self.parent.after(100, self.load_current_image)
+                return
             
-            # 加载图片
-            with Image.open(image_path) as img:
-                # 应用旋转
-                if self.rotation != 0:
-                    img = img.rotate(-self.rotation, expand=True)
-                
-                # 获取Canvas尺寸
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                
-                if canvas_width <= 1 or canvas_height <= 1:
-                    # Canvas还没有正确初始化，延迟加载
-                    self.parent.after(100, self.load_current_image)
-                    return
-                
-                # 计算缩放后的尺寸
-                img_width, img_height = img.size
-                
-                # 应用用户缩放
-                display_width = int(img_width * self.zoom_factor)
-                display_height = int(img_height * self.zoom_factor)
-                
-                # 如果图片太大，自动适应Canvas
-                if self.zoom_factor == 1.0:  # 只在默认缩放时自动适应
-                    scale_x = canvas_width / img_width
-                    scale_y = canvas_height / img_height
-                    scale = min(scale_x, scale_y, 1.0)  # 不放大，只缩小
-                    
-                    display_width = int(img_width * scale)
-                    display_height = int(img_height * scale)
-                
-                # 调整图片大小
-                if display_width != img_width or display_height != img_height:
-                    img = img.resize((display_width, display_height), Image.Resampling.LANCZOS)
-                
-                # 转换为PhotoImage
-                self.current_image = ImageTk.PhotoImage(img)
-                
-                # 清空Canvas并显示图片
-                self.canvas.delete('all')
-                
-                # 计算居中位置
-                x = (canvas_width - display_width) // 2
-                y = (canvas_height - display_height) // 2
-                
-                self.canvas.create_image(x, y, anchor='nw', image=self.current_image)
+            if self.spread_mode:
+                if self.spreads:
+                    self._load_current_spread((canvas_width, canvas_height), generation, draft)
+                else:
+                    # 跨页布局还在后台读取页面尺寸
+                    self._show_placeholder((canvas_width, canvas_height))
+                return
+            
+            key = (image_path, self.rotation)
+            source = self.source_image if key == self.source_key else self._take_prefetched_page(key)
+            
+            # 获取图片尺寸（未缓存时查元数据索引）
+            can_draft = True
+            if source is not None:
+                img_width, img_height = source.size
+            else:
+                metadata = get_metadata_index().get(image_path)
+                img_width, img_height = metadata.width, metadata.height
+                can_draft = metadata.format == 'JPEG'
+                if self.rotation in (90, 270):
+                    img_width, img_height = img_height, img_width
+            
+            self.canvas_size = (canvas_width, canvas_height)
+            self.rendered_canvas_size = self.canvas_size
+            self.page_source_size = (img_width, img_height)
+            display_width, display_height = self._calculate_display_size(
+                img_width, img_height, canvas_width, canvas_height)
+            
+            if self.zoom_factor != 1.0 and (display_width > canvas_width or display_height > canvas_height):
+                # 放大后超出画布：只渲染可见图块，可拖动平移
+                if source is not None:
+                    self._show_tiled(key, source)
+                else:
+                    # 原图未解码：先显示占位框，后台解码后再分块显示
+                    self._show_placeholder((min(display_width, canvas_width), min(display_height, canvas_height)))
+                    self.render_executor.submit(self._zoom_source_worker, generation, image_path, self.rotation)
+            elif source is not None and (display_width, display_height) == source.size:
+                # 原尺寸显示，无需缩放
+                self._show_page(source)
+            else:
+                # 第一遍：快速低质量渲染（无法草稿解码时显示占位框）
+                if draft or self.page_image is None:
+                    if can_draft:
+                        self._show_page(self._render_draft(image_path, source, (display_width, display_height)))
+                    else:
+                        self._show_placeholder((display_width, display_height))
                 
-                # 更新状态栏
-                status_text = f"尺寸: {img_width}×{img_height} | 缩放: {self.zoom_factor:.1f}x | 旋转: {self.rotation}°"
-                self.status_var.set(status_text)
+                # 第二遍：后台高质量渲染
+                self.render_executor.submit(self._refine_worker, generation, image_path, self.rotation,
+                                            source, (display_width, display_height))
+            
+            # 更新状态栏
+            self._update_status_text(img_width, img_height)
+            
+            # 临近相册边界时预取相邻相册
+            self._prefetch_adjacent_albums()
                 
         except Exception as e:
-            print(f"加载图片失败: {e}")
+            log_error(f"加载图片失败: {e}", 'ui.viewer')
             # 显示错误信息
+            self.tiled_renderer.clear()
             self.canvas.delete('all')
             self.canvas.create_text(
                 self.canvas.winfo_width()//2, 
@@ -257,8 +371,531 @@ class ImageViewer:
                 justify='center'
             )
     
+    def _record_progress(self):
+        """保存当前相册的阅读进度"""
+        if self.album_path and self.config_manager:
+            self.config_manager.set_reading_progress(self.album_path, self.current_index, len(self.image_files))
+    
+    def _schedule_read_ahead(self):
+        """翻页后按阅读顺序预读当前页及后续页面，丢弃跳过的预读"""
+        if self.read_ahead_index == self.current_index:
+            return
+        self.read_ahead_index = self.current_index
+        
+        start = self.current_index
+        if self.source_key and self.source_key[0] == self.image_files[start]:
+            start += 1  # 当前页已解码
+        end = self.current_index + 1 + self.read_ahead_pages
+        get_read_ahead().schedule(self.image_files[start:end], replace=True)
+    
+    def _update_file_info(self, image_path):
+        """更新工具栏的文件信息"""
+        filename = os.path.basename(image_path)
+        position = f"{self.current_index + 1}"
+        if self.spread_mode and self.spreads:
+            pages = self.spreads[self.page_spread[self.current_index]]
+            position = "-".join(str(page + 1) for page in pages)
+        file_info = f"{position}/{len(self.image_files)} - {filename}"
+        
+        # 如果有相册列表信息，添加相册位置信息
+        if self.album_list and self.current_album_index is not None:
+            album_info = f" | 相册 {self.current_album_index + 1}/{len(self.album_list)}"
+            file_info += album_info
+        
+        self.file_info_var.set(file_info)
+    
+    def _update_status_text(self, img_width, img_height):
+        """更新状态栏"""
+        status_text = f"尺寸: {img_width}×{img_height} | 缩放: {self.zoom_factor:.1f}x | 旋转: {self.rotation}°"
+        if self.slideshow and self.slideshow.is_playing:
+            status_text += " | ▶️ 幻灯片播放中"
+        self.status_var.set(status_text)
+    
+    def _calculate_display_size(self, img_width, img_height, canvas_width, canvas_height):
+        """计算显示尺寸"""
+        if self.zoom_factor == 1.0:
+            # 默认缩放时自动适应Canvas，不放大，只缩小
+            scale = min(canvas_width / img_width, canvas_height / img_height, 1.0)
+        else:
+            # 应用用户缩放
+            scale = self.zoom_factor
+        return max(1, int(img_width * scale)), max(1, int(img_height * scale))
+    
+    def _show_page(self, img, photo=None):
+        """在Canvas中居中显示整页图片"""
+        # 转换为PhotoImage（可传入已准备好的PhotoImage）
+        self.page_image = img
+        if photo is None:
+            with trace_span('viewer.photoimage'):
+                photo = ImageTk.PhotoImage(img)
+        self.current_image = photo
+        
+        # 清空Canvas并显示图片
+        self.tiled_renderer.clear()
+        self.canvas.delete('all')
+        
+        # 计算居中位置
+        x = (self.canvas.winfo_width() - img.width) // 2
+        y = (self.canvas.winfo_height() - img.height) // 2
+        
+        self.canvas.create_image(x, y, anchor='nw', image=self.current_image, tags=('page',))
+    
+    def _show_placeholder(self, display_size):
+        """显示与页面等大的占位框，等待后台解码"""
+        self.page_image = None
+        self.current_image = None
+        self.tiled_renderer.clear()
+        self.canvas.delete('all')
+        
+        width, height = display_size
+        x = (self.canvas.winfo_width() - width) // 2
+        y = (self.canvas.winfo_height() - height) // 2
+        self.canvas.create_rectangle(x, y, x + width, y + height, outline='#3A3A3C', fill='#2C2C2E',
+                                     tags=('page',))
+        self.canvas.create_text(x + width // 2, y + height // 2, text="加载中…", fill='#8E8E93',
+                                font=get_safe_font('Arial', 14), tags=('page',))
+    
+    @traced('viewer.draft')
+    def _render_draft(self, image_path, source, display_size):
+        """快速低质量渲染：JPEG按目标尺寸草稿解码，双线性缩放（只用于JPEG或已解码的原图）"""
+        if source is not None:
+            return source.resize(display_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        
+        # 旋转90/270度时，解码尺寸与显示尺寸宽高互换
+        draft_size = display_size
+        if self.rotation in (90, 270):
+            draft_size = (display_size[1], display_size[0])
+        
+        # 只查看预读缓冲：不在主线程等待读取，也不取走缓冲，完整解码仍可命中
+        with ImageProcessor.open_image(image_path, take_buffer=False) as img:
+            img.draft(None, draft_size)
+            img.load()
+            if self.rotation != 0:
+                img = img.rotate(-self.rotation, expand=True)
+            return img.resize(display_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    
+    def _refine_worker(self, generation, image_path, rotation, source, display_size):
+        """后台线程：完整解码并LANCZOS缩放"""
+        try:
+            if generation != self.render_generation:
+                return  # 已翻页，放弃
+            
+            if source is None:
+                source = self._decode_source(image_path, rotation)
+                if generation != self.render_generation:
+                    return
+            
+            with trace_span('viewer.resize'):
+                refined = source.resize(display_size, Image.Resampling.LANCZOS)
+            self.parent.after_idle(self._apply_refined, generation, (image_path, rotation), source, refined)
+        except Exception as e:
+            log_error(f"高质量渲染失败: {e}", 'ui.viewer')
+    
+    def _apply_refined(self, generation, key, source, refined):
+        """主线程：用高质量渲染替换草稿"""
+        try:
+            if generation != self.render_generation or not self.canvas.winfo_exists():
+                return
+            # 缓存原图，之后缩放和旋转复用（过期的渲染不覆盖当前页的缓存）
+            self.source_key = key
+            self.source_image = source
+            self._show_page(refined)
+        except Exception as e:
+            log_error(f"显示高质量渲染失败: {e}", 'ui.viewer')
+    
+    @staticmethod
+    def _decode_source(image_path, rotation):
+        """完整解码图片并应用旋转，灰度内容以L模式缓存"""
+        return ImageProcessor.decode_page(image_path, rotation)
+    
+    def _take_prefetched_page(self, key):
+        """取出预解码的页面（相邻相册预取或卡片悬停预热），并作为当前原图缓存"""
+        with self.prefetch_lock:
+            source = self.prefetched_pages.pop(key, None)
+        if source is None:
+            source = get_page_warmer().take_page(key)
+        if source is not None:
+            self.source_key = key
+            self.source_image = source
+        return source
+    
+    def _prefetch_adjacent_albums(self):
+        """阅读到相册开头或结尾附近时，后台预取相邻相册"""
+        if not (self.album_list and self.current_album_index is not None):
+            return
+        
+        margin = self.prefetch_pages + 1
+        if self.current_index >= len(self.image_files) - margin:
+            self._request_album_prefetch(self.current_album_index + 1, from_end=False)
+        if self.current_index < margin:
+            self._request_album_prefetch(self.current_album_index - 1, from_end=True)
+    
+    def _request_album_prefetch(self, album_index, from_end):
+        """发起一次相邻相册预取（同一相册同一方向只预取一次）"""
+        if not (0 <= album_index < len(self.album_list)):
+            return
+        album_path = self.album_list[album_index]
+        request = (album_path, from_end)
+        if request in self.prefetch_requested:
+            return
+        self.prefetch_requested.add(request)
+        try:
+            self.prefetch_executor.submit(self._prefetch_worker, album_path, from_end)
+        except RuntimeError:
+            pass  # 查看器已关闭
+    
+    def _prefetch_worker(self, album_path, from_end):
+        """后台线程：列出相册图片并解码开头（或结尾）几页"""
+        try:
+            with self.prefetch_lock:
+                image_files = self.prefetched_files.get(album_path)
+            if image_files is None:
+                image_files = ImageProcessor.get_image_files(album_path)
+                with self.prefetch_lock:
+                    self.prefetched_files[album_path] = image_files
+            
+            if from_end:
+                pages = image_files[-self.prefetch_pages:][::-1]
+            else:
+                pages = image_files[:self.prefetch_pages]
+            
+            for image_path in pages:
+                key = (image_path, 0)
+                with self.prefetch_lock:
+                    if key in self.prefetched_pages:
+                        continue
+                source = self._decode_source(image_path, 0)
+                with self.prefetch_lock:
+                    self.prefetched_pages[key] = source
+                    # 超出页数或内存上限时淘汰最早的页面（至少保留刚预取的一页）
+                    while len(self.prefetched_pages) > 1 and (
+                            len(self.prefetched_pages) > self.max_prefetched_pages
+                            or self._prefetched_bytes() > self.max_prefetched_bytes):
+                        self.prefetched_pages.popitem(last=False)
+            
+            log_info(f"已预取相册: {os.path.basename(album_path)} ({len(image_files)} 张图片)", 'ui.viewer')
+        except Exception as e:
+            log_error(f"预取相册失败 {album_path}: {e}", 'ui.viewer')
+    
+    def _prefetched_bytes(self):
+        """预取页面占用的像素内存（调用方持有prefetch_lock）"""
+        return sum(img.width * img.height * len(img.getbands()) for img in self.prefetched_pages.values())
+    
+    def take_prefetched_files(self, album_path):
+        """取出预取的相册图片列表，未预取时返回None"""
+        with self.prefetch_lock:
+            return self.prefetched_files.pop(album_path, None)
+    
+    def switch_album(self, image_files, album_index, start_at_last=False, album_path=None):
+        """在当前窗口中切换到另一个相册（保留窗口、工具栏和Canvas）
+        
+        Args:
+            image_files: 新相册的图片文件列表
+            album_index: 新相册在相册列表中的索引
+            start_at_last: 是否从最后一张图片开始
+            album_path: 新相册路径（用于保存阅读进度）
+        """
+        self.image_files = image_files
+        self.album_path = album_path
+        self.current_album_index = album_index
+        self.current_index = len(image_files) - 1 if start_at_last else 0
+        
+        # 新相册的页面使用默认缩放和旋转
+        self.zoom_factor = 1.0
+        self.rotation = 0
+        self.source_key = None
+        self.source_image = None
+        self.tiled_renderer.clear()
+        
+        # 离开的相册可能再次预取
+        self.prefetch_requested.clear()
+        self.read_ahead_index = None
+        
+        if self.strip_view:
+            # 条漫模式下用新相册重建页面长条
+            self.strip_view.close()
+            self._open_strip_view()
+        elif self.spread_mode:
+            self._build_spread_layout()
+        
+        self.load_current_image()
+    
+    def toggle_spread_mode(self):
+        """切换双页模式和单页模式"""
+        try:
+            if self.strip_view:
+                self.strip_view.close()
+                self.strip_view = None
+            if self.slideshow and self.slideshow.is_playing:
+                self.slideshow.stop_slideshow()
+                self.prepared_slide = None
+            
+            self.spread_mode = not self.spread_mode
+            if self.spread_mode:
+                self.spread_rtl = self.config_manager.get_spread_right_to_left()
+                self._build_spread_layout()
+            else:
+                self.spread_cache.clear()
+            self.load_current_image()
+        except Exception as e:
+            log_error(f"切换双页模式失败: {e}", 'ui.viewer')
+            messagebox.showerror("错误", f"无法切换双页模式\n{str(e)}")
+    
+    def _build_spread_layout(self):
+        """在后台读取文件头尺寸并分组跨页（不解码图片），完成前显示占位框"""
+        self.spreads = []
+        self.page_spread = []
+        self.spread_page_sizes = []
+        self.spread_cache.clear()
+        self.spread_pending.clear()
+        self.render_executor.submit(self._read_spread_sizes_worker, self.image_files)
+    
+    def _read_spread_sizes_worker(self, image_files):
+        """后台线程：读取每页尺寸"""
+        try:
+            sizes = read_page_sizes(image_files)
+            self.parent.after_idle(self._apply_spread_layout, image_files, sizes)
+        except Exception as e:
+            log_error(f"读取跨页尺寸失败: {e}", 'ui.viewer')
+    
+    def _apply_spread_layout(self, image_files, sizes):
+        """主线程：分组跨页并显示当前跨页（已退出双页模式、已切换相册或已布局时忽略）"""
+        try:
+            if not self.spread_mode or self.spreads or image_files is not self.image_files:
+                return
+            self.spread_page_sizes = sizes
+            self.spreads = build_spreads(sizes)
+            self.page_spread = page_to_spread_map(self.spreads, len(image_files))
+            self.load_current_image()
+        except Exception as e:
+            log_error(f"双页布局失败: {e}", 'ui.viewer')
+    
+    def _spread_key(self, spread_index, canvas_size):
+        """跨页合成图的缓存键"""
+        pages = self.spreads[spread_index]
+        return (tuple(self.image_files[page] for page in pages), canvas_size, self.spread_rtl)
+    
+    def _load_current_spread(self, canvas_size, generation, draft):
+        """显示当前页所在的跨页"""
+        spread_index = self.page_spread[self.current_index]
+        pages = self.spreads[spread_index]
+        self.current_index = pages[0]
+        self._update_file_info(self.image_files[self.current_index])
+        
+        self.canvas_size = canvas_size
+        self.rendered_canvas_size = canvas_size
+        self.page_source_size = None
+        
+        key = self._spread_key(spread_index, canvas_size)
+        sizes = [self.spread_page_sizes[page] for page in pages]
+        composite = self.spread_cache.get(key)
+        if composite is not None:
+            # 已预取：直接显示
+            self.spread_cache.move_to_end(key)
+            self._show_page(composite)
+        else:
+            # 第一遍：草稿解码快速合成（有页面无法草稿解码时显示占位框）
+            if draft or self.page_image is None:
+                metadata_index = get_metadata_index()
+                if all(metadata_index.get(image_path).format == 'JPEG' for image_path in key[0]):
+                    self._show_page(self._compose_spread(key, sizes, draft=True))
+                else:
+                    display_sizes = fit_spread(sizes, canvas_size)
+                    self._show_placeholder((sum(width for width, _ in display_sizes), display_sizes[0][1]))
+            
+            # 第二遍：后台高质量合成
+            self.render_executor.submit(self._refine_spread_worker, generation, key, sizes)
+        
+        direction = "从右到左" if self.spread_rtl else "从左到右"
+        self.status_var.set(f"📖 双页模式（{direction}） | 第 {spread_index + 1}/{len(self.spreads)} 组 | D退出")
+        
+        # 预取前后相邻的跨页
+        self._prefetch_spreads(spread_index, canvas_size)
+        self._prefetch_adjacent_albums()
+    
+    @staticmethod
+    @traced('viewer.spread')
+    def _compose_spread(key, sizes, draft=False):
+        """把跨页中的页面缩放到统一高度并排合成
+        
+        Args:
+            key: 跨页缓存键 (页面路径, 画布尺寸, 从右到左)
+            sizes: 各页原图尺寸（来自文件头）
+            draft: 是否使用草稿解码和双线性缩放
+        """
+        paths, canvas_size, rtl = key
+        display_sizes = fit_spread(sizes, canvas_size)
+        resample = Image.Resampling.BILINEAR if draft else Image.Resampling.LANCZOS
+        
+        pages = []
+        for image_path, display_size in zip(paths, display_sizes):
+            with ImageProcessor.open_image(image_path, take_buffer=not draft) as img:
+                if draft:
+                    img.draft(None, display_size)
+                page = img.convert('L') if img.mode == 'L' else img.convert('RGB')
+            page = page.resize(display_size, resample)
+            pages.append(ImageProcessor.to_grayscale_if_possible(page))
+        
+        # 从右到左阅读时第一页在右侧
+        if rtl:
+            pages.reverse()
+        
+        # 全部为灰度页面时以L模式合成
+        mode = 'L' if all(page.mode == 'L' for page in pages) else 'RGB'
+        background = 0x1D if mode == 'L' else '#1D1D1F'
+        composite = Image.new(mode, (sum(page.width for page in pages), display_sizes[0][1]), background)
+        x = 0
+        for page in pages:
+            composite.paste(page, (x, 0))
+            x += page.width
+        return composite
+    
+    def _refine_spread_worker(self, generation, key, sizes):
+        """后台线程：高质量合成当前跨页"""
+        try:
+            if generation != self.render_generation:
+                return
+            composite = self._compose_spread(key, sizes)
+            self.parent.after_idle(self._store_spread, key, composite, generation)
+        except Exception as e:
+            log_error(f"合成跨页失败: {e}", 'ui.viewer')
+    
+    def _prefetch_spreads(self, spread_index, canvas_size):
+        """在后台合成下一组和上一组跨页"""
+        for neighbor in (spread_index + 1, spread_index - 1):
+            if not (0 <= neighbor < len(self.spreads)):
+                continue
+            key = self._spread_key(neighbor, canvas_size)
+            if key in self.spread_cache or key in self.spread_pending:
+                continue
+            self.spread_pending.add(key)
+            sizes = [self.spread_page_sizes[page] for page in self.spreads[neighbor]]
+            try:
+                self.prefetch_executor.submit(self._prefetch_spread_worker, key, sizes)
+            except RuntimeError:
+                pass  # 查看器已关闭
+    
+    def _prefetch_spread_worker(self, key, sizes):
+        """后台线程：预先合成相邻跨页"""
+        try:
+            composite = self._compose_spread(key, sizes)
+            self.parent.after_idle(self._store_spread, key, composite)
+        except Exception as e:
+            log_error(f"预取跨页失败: {e}", 'ui.viewer')
+    
+    def _store_spread(self, key, composite, generation=None):
+        """主线程：缓存合成图，当前跨页的高质量结果直接替换草稿"""
+        try:
+            self.spread_pending.discard(key)
+            if not self.spread_mode:
+                return
+            self.spread_cache[key] = composite
+            self.spread_cache.move_to_end(key)
+            while len(self.spread_cache) > self.max_cached_spreads:
+                self.spread_cache.popitem(last=False)
+            
+            if generation is not None and generation == self.render_generation:
+                self._show_page(composite)
+        except Exception as e:
+            log_error(f"显示跨页失败: {e}", 'ui.viewer')
+    
+    def toggle_strip_mode(self):
+        """切换条漫模式（连续纵向滚动）和单页模式"""
+        try:
+            if self.strip_view:
+                self.strip_view.close()
+                self.strip_view = None
+                self.load_current_image()
+                return
+            
+            if self.slideshow and self.slideshow.is_playing:
+                self.slideshow.stop_slideshow()
+                self.prepared_slide = None
+            
+            self.render_generation += 1
+            self.tiled_renderer.clear()
+            self.current_image = None
+            self.page_image = None
+            self._open_strip_view()
+        except Exception as e:
+            log_error(f"切换条漫模式失败: {e}", 'ui.viewer')
+            messagebox.showerror("错误", f"无法切换条漫模式\n{str(e)}")
+    
+    def _open_strip_view(self):
+        """创建并打开条漫视图"""
+        self.spread_mode = False
+        self.spread_cache.clear()
+        self.strip_view = VerticalStripView(self.canvas, self.image_files,
+                                            page_changed_callback=self._on_strip_page_changed)
+        self.strip_view.open(self.current_index)
+        self._on_strip_page_changed(self.strip_view.current_page)
+    
+    def _on_strip_page_changed(self, index):
+        """条漫模式下视口中心所在页变化"""
+        self.current_index = index
+        self._schedule_read_ahead()
+        self._record_progress()
+        self._update_file_info(self.image_files[index])
+        self.status_var.set(f"📜 条漫模式 | 第 {index + 1}/{len(self.image_files)} 页 | 滚轮/↑↓滚动 W退出")
+        
+        # 临近相册边界时预取相邻相册
+        self._prefetch_adjacent_albums()
+    
+    def _show_tiled(self, key, source):
+        """分块显示放大后的原图"""
+        self.current_image = None
+        self.page_image = None
+        self.canvas.delete('page')
+        self.tiled_renderer.set_image(source, self.zoom_factor, key)
+    
+    def _zoom_source_worker(self, generation, image_path, rotation):
+        """后台线程：为放大显示完整解码原图"""
+        try:
+            if generation != self.render_generation:
+                return  # 已翻页，放弃
+            source = self._decode_source(image_path, rotation)
+            self.parent.after_idle(self._apply_zoom_source, generation, (image_path, rotation), source)
+        except Exception as e:
+            log_error(f"解码原图失败: {e}", 'ui.viewer')
+    
+    def _apply_zoom_source(self, generation, key, source):
+        """主线程：缓存解码好的原图并分块显示"""
+        try:
+            if generation != self.render_generation or not self.canvas.winfo_exists():
+                return
+            # 缓存原图，之后缩放和平移复用
+            self.source_key = key
+            self.source_image = source
+            self._show_tiled(key, source)
+        except Exception as e:
+            log_error(f"显示放大图片失败: {e}", 'ui.viewer')
+    
+    def on_left_arrow(self):
+        """←键：从右到左的双页模式下为下一组，其余为上一张"""
+        if self.spread_mode and self.spread_rtl:
+            self.next_image()
+        else:
+            self.prev_image()
+    
+    def on_right_arrow(self):
+        """→键：从右到左的双页模式下为上一组，其余为下一张"""
+        if self.spread_mode and self.spread_rtl:
+            self.prev_image()
+        else:
+            self.next_image()
+    
     def prev_image(self):
         """上一张图片"""
+        if self.spread_mode and self.spreads:
+            # 双页模式按跨页翻页
+            spread_index = self.page_spread[self.current_index]
+            if spread_index > 0:
+                self.current_index = self.spreads[spread_index - 1][0]
+                self.load_current_image()
+            else:
+                self._switch_to_previous_album()
+            return
+        
         if self.current_index > 0:
             self.current_index -= 1
             self.load_current_image()
@@ -268,6 +905,16 @@ class ImageViewer:
     
     def next_image(self):
         """下一张图片"""
+        if self.spread_mode and self.spreads:
+            # 双页模式按跨页翻页
+            spread_index = self.page_spread[self.current_index]
+            if spread_index < len(self.spreads) - 1:
+                self.current_index = self.spreads[spread_index + 1][0]
+                self.load_current_image()
+            else:
+                self._switch_to_next_album()
+            return
+        
         if self.current_index < len(self.image_files) - 1:
             self.current_index += 1
             self.load_current_image()
@@ -327,18 +974,100 @@ class ImageViewer:
             self.toolbar.pack(side='top', fill='x', before=self.main_frame)
             self.status_frame.pack(side='bottom', fill='x')
         
-        # 重新加载图片以适应新的窗口大小
-        self.parent.after(100, self.load_current_image)
+        # 窗口尺寸变化会触发Canvas的<Configure>，这里确保稳定后重新渲染一次
+        self._schedule_settled_render()
     
     def start_slideshow(self):
-        """开始幻灯片播放"""
+        """开始/暂停幻灯片播放"""
         try:
-            slideshow = SlideshowManager(self.parent, self.image_files, self.current_index)
-            slideshow.start()
+            if self.strip_view:
+                self.status_var.set("条漫模式下不支持幻灯片播放，按 W 返回单页模式")
+                return
+            if self.spread_mode:
+                self.status_var.set("双页模式下不支持幻灯片播放，按 D 返回单页模式")
+                return
+            if self.slideshow is None:
+                self.slideshow = SlideshowManager(self)
+            playing = self.slideshow.toggle()
+            if not playing:
+                self.prepared_slide = None
+            if self.page_source_size:
+                self._update_status_text(*self.page_source_size)
         except Exception as e:
-            print(f"启动幻灯片失败: {e}")
+            log_error(f"启动幻灯片失败: {e}", 'ui.viewer')
             messagebox.showerror("错误", f"无法启动幻灯片播放\n{str(e)}")
     
+    def prepare_slide(self, index):
+        """在后台解码并按当前画布尺寸缩放指定页，供幻灯片到点时直接显示"""
+        if not (0 <= index < len(self.image_files)):
+            return
+        request = (index, self.image_files[index], self.rotation, self.zoom_factor,
+                   (self.canvas.winfo_width(), self.canvas.winfo_height()))
+        if self.prepared_slide and self.prepared_slide['request'] == request:
+            return
+        try:
+            self.prefetch_executor.submit(self._prepare_slide_worker, request)
+        except RuntimeError:
+            pass  # 查看器已关闭
+    
+    def _prepare_slide_worker(self, request):
+        """后台线程：解码并高质量缩放幻灯片的下一张"""
+        try:
+            index, image_path, rotation, zoom_factor, canvas_size = request
+            with self.prefetch_lock:
+                source = self.prefetched_pages.get((image_path, rotation))
+            if source is None:
+                source = self._decode_source(image_path, rotation)
+            
+            display_size = self._calculate_display_size(*source.size, *canvas_size)
+            if zoom_factor != 1.0 and (display_size[0] > canvas_size[0] or display_size[1] > canvas_size[1]):
+                return  # 分块显示的页面不预先准备
+            
+            img = source
+            if display_size != source.size:
+                img = source.resize(display_size, Image.Resampling.LANCZOS)
+            self.parent.after_idle(self._store_prepared_slide, request, source, img)
+        except Exception as e:
+            log_error(f"准备幻灯片失败: {e}", 'ui.viewer')
+    
+    def _store_prepared_slide(self, request, source, img):
+        """主线程：创建PhotoImage，到点时只需替换"""
+        try:
+            if not (self.slideshow and self.slideshow.is_playing):
+                return
+            self.prepared_slide = {
+                'request': request,
+                'source': source,
+                'image': img,
+                'photo': ImageTk.PhotoImage(img),
+            }
+        except Exception as e:
+            log_error(f"准备幻灯片失败: {e}", 'ui.viewer')
+    
+    def show_prepared_slide(self, index):
+        """显示幻灯片的下一张：已准备好时直接替换，否则按普通方式加载"""
+        prepared = self.prepared_slide
+        self.prepared_slide = None
+        self.current_index = index
+        
+        request = (index, self.image_files[index], self.rotation, self.zoom_factor,
+                   (self.canvas.winfo_width(), self.canvas.winfo_height()))
+        if not prepared or prepared['request'] != request:
+            self.load_current_image()
+            return
+        
+        # 作废未完成的高质量渲染
+        self.render_generation += 1
+        image_path = self.image_files[index]
+        self.source_key = (image_path, self.rotation)
+        self.source_image = prepared['source']
+        self.page_source_size = prepared['source'].size
+        self.rendered_canvas_size = request[4]
+        
+        self._update_file_info(image_path)
+        self._show_page(prepared['image'], prepared['photo'])
+        self._update_status_text(*self.page_source_size)
+    
     def show_image_info(self):
         """显示图片信息"""
         if not self.image_files or self.current_index >= len(self.image_files):
@@ -348,8 +1077,7 @@ class ImageViewer:
             image_path = self.image_files[self.current_index]
             
             # 获取文件信息
-            file_stat = os.stat(image_path)
-            file_size = file_stat.st_size
+            file_size = ImageProcessor.get_image_stat(image_path)[0]
             
             # 格式化文件大小
             if file_size < 1024:
@@ -359,11 +1087,12 @@ class ImageViewer:
             else:
                 size_str = f"{file_size / (1024 * 1024):.1f} MB"
             
-            # 获取图片信息
-            with Image.open(image_path) as img:
-                width, height = img.size
-                format_name = img.format or "未知"
-                mode = img.mode
+            # 获取图片信息（来自元数据索引，无需解码）
+            metadata = get_metadata_index().get(image_path)
+            width, height = metadata.width, metadata.height
+            format_name = metadata.format or "未知"
+            mode = metadata.mode
+            grayscale_stats = ImageProcessor.get_grayscale_stats()
             
             # 构建信息文本
             info_text = f"""文件信息:
@@ -375,11 +1104,13 @@ class ImageViewer:
 尺寸: {width} × {height} 像素
 格式: {format_name}
 颜色模式: {mode}
+EXIF方向: {metadata.orientation}
 
 当前状态:
 缩放: {self.zoom_factor:.1f}x
 旋转: {self.rotation}°
-位置: {self.current_index + 1} / {len(self.image_files)}"""
+位置: {self.current_index + 1} / {len(self.image_files)}
+灰度转换: 累计 {grayscale_stats['conversions']} 次, 累计少分配 {grayscale_stats['avoided']}"""
             
             # 显示信息对话框
             messagebox.showinfo("图片信息", info_text)
@@ -408,13 +1139,16 @@ R : 向右旋转90度
 
 功能:
 F11 : 切换全屏模式
-Space : 开始幻灯片播放
+Space : 开始/暂停幻灯片播放
+W : 切换条漫模式（连续纵向滚动）
+D : 切换双页模式（从右到左可在设置中调整）
 I : 显示图片信息
 H : 显示此帮助
 ESC : 退出查看器
 
 鼠标操作:
-滚轮 : 缩放图片"""
+滚轮 : 缩放图片
+拖动 : 放大后平移图片"""
         
         messagebox.showinfo("帮助", help_text)
     
@@ -441,19 +1175,16 @@ ESC : 退出查看器
             # 获取上一个相册路径
             prev_album_path = self.album_list[self.current_album_index - 1]
             
-            # 关闭当前窗口
-            self.parent.destroy()
-            
-            # 打开上一个相册，并跳转到最后一张图片
-            self.album_viewer_manager.open_album(
-                prev_album_path, 
-                album_list=self.album_list, 
-                current_album_index=self.current_album_index - 1,
+            # 在当前窗口中切换到上一个相册，并跳转到最后一张图片
+            self.album_viewer_manager.switch_album(
+                self,
+                prev_album_path,
+                self.current_album_index - 1,
                 start_at_last=True
             )
             
         except Exception as e:
-            print(f"切换到上一个相册失败: {e}")
+            log_error(f"切换到上一个相册失败: {e}", 'ui.viewer')
             messagebox.showerror("错误", f"无法切换到上一个相册: {str(e)}")
     
     def _switch_to_next_album(self):
@@ -479,30 +1210,127 @@ ESC : 退出查看器
             # 获取下一个相册路径
             next_album_path = self.album_list[self.current_album_index + 1]
             
-            # 关闭当前窗口
-            self.parent.destroy()
-            
-            # 打开下一个相册，从第一张图片开始
-            self.album_viewer_manager.open_album(
-                next_album_path, 
-                album_list=self.album_list, 
-                current_album_index=self.current_album_index + 1,
+            # 在当前窗口中切换到下一个相册，从第一张图片开始
+            self.album_viewer_manager.switch_album(
+                self,
+                next_album_path,
+                self.current_album_index + 1,
                 start_at_last=False
             )
             
         except Exception as e:
-            print(f"切换到下一个相册失败: {e}")
+            log_error(f"切换到下一个相册失败: {e}", 'ui.viewer')
             messagebox.showerror("错误", f"无法切换到下一个相册: {str(e)}")
     
     def on_mouse_wheel(self, event):
         """处理鼠标滚轮事件"""
+        if self.strip_view:
+            # 条漫模式下滚轮用于滚动
+            units = -int(event.delta / 120) * 3 or (-3 if event.delta > 0 else 3)
+            self.strip_view.scroll(units)
+            return
         if event.delta > 0:
             self.zoom_in()
         else:
             self.zoom_out()
     
+    def on_drag_start(self, event):
+        """开始拖动平移"""
+        self.drag_start = (event.x, event.y)
+        if self.strip_view:
+            self.canvas.scan_mark(0, event.y)
+            self.canvas.configure(cursor='fleur')
+        elif self.tiled_renderer.active:
+            self.canvas.configure(cursor='fleur')
+    
+    def on_drag_move(self, event):
+        """拖动平移放大后的图片"""
+        if self.drag_start is not None and self.strip_view:
+            # 条漫模式下拖动滚动
+            self.canvas.scan_dragto(0, event.y, gain=1)
+            self.strip_view.on_scroll()
+            return
+        if self.drag_start is None or not self.tiled_renderer.active:
+            return
+        dx = event.x - self.drag_start[0]
+        dy = event.y - self.drag_start[1]
+        self.drag_start = (event.x, event.y)
+        self.tiled_renderer.pan(dx, dy)
+    
+    def on_drag_end(self, event):
+        """结束拖动平移"""
+        self.drag_start = None
+        self.canvas.configure(cursor='')
+    
+    def on_destroy(self, event=None):
+        """查看器关闭时作废未完成的渲染任务"""
+        if self.strip_view:
+            self.strip_view.close()
+            self.strip_view = None
+        if self.slideshow:
+            self.slideshow.stop_slideshow()
+        self.prepared_slide = None
+        self.render_generation += 1
+        self.render_executor.shutdown(wait=False)
+        self.prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        with self.prefetch_lock:
+            self.prefetched_pages.clear()
+            self.prefetched_files.clear()
+        get_read_ahead().cancel()
+    
     def on_window_resize(self, event):
-        """处理窗口大小变化"""
-        # 只在主窗口大小变化时重新加载图片
-        if event.widget == self.parent:
-            self.parent.after(100, self.load_current_image)
\ No newline at end of file
+        """处理窗口大小变化 - 合并连续的Configure事件"""
+        size = (event.width, event.height)
+        if size == self.canvas_size or event.width <= 1 or event.height <= 1:
+            return
+        self.canvas_size = size
+        
+        # 每个空闲周期最多做一次快速预览
+        if not self.resize_preview_pending:
+            self.resize_preview_pending = True
+            self.parent.after_idle(self._preview_resize)
+        
+        self._schedule_settled_render()
+    
+    def _schedule_settled_render(self):
+        """尺寸停止变化后执行一次高质量渲染"""
+        if self.resize_timer:
+            self.parent.after_cancel(self.resize_timer)
+        self.resize_timer = self.parent.after(self.resize_settle_delay, self._on_resize_settled)
+    
+    def _on_resize_settled(self):
+        """窗口尺寸稳定：重新渲染当前图片"""
+        self.resize_timer = None
+        size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        if size == self.rendered_canvas_size:
+            return  # 已按当前尺寸渲染
+        self.load_current_image(draft=False)
+    
+    def _preview_resize(self):
+        """拖动期间的快速预览：缩放上一次的渲染结果，不重新解码"""
+        self.resize_preview_pending = False
+        if self.strip_view:
+            return  # 条漫模式在尺寸稳定后重新布局
+        try:
+            canvas_width = self.canvas.winfo_width()
+            canvas_height = self.canvas.winfo_height()
+            
+            if self.tiled_renderer.active:
+                # 分块模式：只需按新视口补齐图块
+                self.tiled_renderer.pan(0, 0)
+                return
+            
+            if self.page_image is None or not self.page_source_size:
+                return
+            
+            display_size = self._calculate_display_size(*self.page_source_size, canvas_width, canvas_height)
+            if display_size != self.page_image.size:
+                self.current_image = ImageTk.PhotoImage(
+                    self.page_image.resize(display_size, Image.Resampling.NEAREST))
+                self.canvas.itemconfigure('page', image=self.current_image)
+            
+            # 重新居中
+            self.canvas.coords('page', (canvas_width - display_size[0]) // 2,
+                               (canvas_height - display_size[1]) // 2)
+        except Exception as e:
+            log_error(f"窗口缩放预览失败: {e}", 'ui.viewer')
\ No newline at end of file
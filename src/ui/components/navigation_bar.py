@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from .style_manager import get_safe_font, StyleManager
+from ...utils.album_sort import SORT_OPTIONS, SORT_DEFAULT
 from ...utils.logger import get_logger, log_info, log_error, log_exception
 
 class NavigationBar:
@@ -18,12 +19,29 @@ class NavigationBar:
         # 新增回调
         self.home_callback = None  # 将由app_manager设置
         self.settings_callback = None  # 将由app_manager设置
+        self.back_callback = None  # 后退，将由app_manager设置
+        self.forward_callback = None  # 前进，将由app_manager设置
+        self.back_btn = None
+        self.forward_btn = None
         
         # 筛选相关变量
         self.filter_var = None
         self.filter_combobox = None
         self.filter_callback = None  # 筛选回调函数
         
+        # 排序相关变量
+        self.sort_var = None
+        self.sort_combobox = None
+        self.sort_callback = None  # 排序回调函数
+        
+        # 搜索相关变量
+        self.search_var = None
+        self.search_entry = None
+        self.search_callback = None  # 搜索回调函数
+        self.search_timer = None
+        self.search_delay = 150  # 输入防抖（毫秒）
+        self._suppress_search_event = False  # 同步层级状态时不触发搜索
+        
         # 使用传入的样式管理器或创建新实例
         if style_manager:
             self.style_manager = style_manager
@@ -164,7 +182,7 @@ class NavigationBar:
             # 路径标签和显示
             self.create_path_display(path_frame)
         except Exception as e:
-            print(f"创建导航栏组件时出错: {e}")
+            log_error(f"创建导航栏组件时出错: {e}", 'ui.navigation')
             # 创建简化版本
             self._create_simple_widgets()
     
@@ -194,6 +212,11 @@ class NavigationBar:
         breadcrumb_container = tk.Frame(self.breadcrumb_frame, bg=self.style_manager.colors['card_bg'])
         breadcrumb_container.pack(side='left')
         
+        # 后退/前进按钮
+        self.back_btn = self._create_history_button(breadcrumb_container, "◀", self.go_back)
+        self.forward_btn = self._create_history_button(breadcrumb_container, "▶", self.go_forward)
+        self.update_history_buttons(False, False)
+        
         # 首页按钮
         home_btn = tk.Button(breadcrumb_container,
                            text="🏠 首页",
@@ -222,6 +245,68 @@ class NavigationBar:
                                              fg=self.style_manager.colors['text_secondary'])
         self.current_location_label.pack(side='left', padx=(4, 0))
     
+    def _create_history_button(self, parent, text, command):
+        """创建后退/前进按钮"""
+        btn = tk.Button(parent,
+                      text=text,
+                      command=command,
+                      font=self.style_manager.fonts['caption'],
+                      bg=self.style_manager.colors['card_bg'],
+                      fg=self.style_manager.colors['accent'],
+                      disabledforeground=self.style_manager.colors['text_tertiary'],
+                      relief='flat',
+                      borderwidth=0,
+                      padx=4,
+                      pady=4,
+                      cursor='hand2')
+        btn.pack(side='left')
+        
+        self.style_manager.create_hover_effect(
+            btn,
+            self.style_manager.colors['accent_light'],
+            self.style_manager.colors['card_bg']
+        )
+        return btn
+    
+    def update_history_buttons(self, can_go_back, can_go_forward):
+        """更新后退/前进按钮的可用状态"""
+        try:
+            if self.back_btn:
+                self.back_btn.configure(state='normal' if can_go_back else 'disabled')
+            if self.forward_btn:
+                self.forward_btn.configure(state='normal' if can_go_forward else 'disabled')
+        except Exception as e:
+            log_error(f"更新历史按钮状态时出错: {e}", 'ui.navigation')
+    
+    def go_back(self):
+        """后退到上一个视图"""
+        if self.back_callback:
+            self.back_callback()
+    
+    def go_forward(self):
+        """前进到下一个视图"""
+        if self.forward_callback:
+            self.forward_callback()
+    
+    def sync_view_state(self, filter_value, sort_mode, search_query):
+        """切换层级时同步筛选、排序和搜索控件（不触发回调）"""
+        try:
+            if self.filter_var and self.filter_var.get() != filter_value:
+                self.filter_var.set(filter_value)
+            if self.sort_var and sort_mode and self.sort_var.get() != sort_mode:
+                self.sort_var.set(sort_mode)
+            if self.search_var is not None and self.search_var.get() != search_query:
+                if self.search_timer:
+                    self.parent.after_cancel(self.search_timer)
+                    self.search_timer = None
+                self._suppress_search_event = True
+                try:
+                    self.search_var.set(search_query)
+                finally:
+                    self._suppress_search_event = False
+        except Exception as e:
+            log_error(f"同步视图状态时出错: {e}", 'ui.navigation')
+    
     def update_breadcrumb(self, location_type="home", location_name=""):
         """更新面包屑显示"""
         if location_type == "home":
@@ -239,6 +324,11 @@ class NavigationBar:
             if len(folder_name) > 20:
                 folder_name = folder_name[:17] + "..."
             self.current_location_label.configure(text=f" > 📁 {folder_name}")
+        elif location_type == "collection":
+            collection_name = location_name or "合集"
+            if len(collection_name) > 20:
+                collection_name = collection_name[:17] + "..."
+            self.current_location_label.configure(text=f" > 📚 {collection_name}")
     
     def _preload_recent_covers(self):
         """预加载最近浏览的封面"""
@@ -275,7 +365,7 @@ class NavigationBar:
             # 这里可以与history manager协作获取最近路径
             pass
         except Exception as e:
-            print(f"执行最近浏览预加载失败: {e}")
+            log_error(f"执行最近浏览预加载失败: {e}", 'ui.navigation')
     
     def _do_preload_favorites(self):
         """执行收藏预加载"""
@@ -283,7 +373,7 @@ class NavigationBar:
             # 这里可以与favorites manager协作获取收藏路径
             pass
         except Exception as e:
-            print(f"执行收藏预加载失败: {e}")
+            log_error(f"执行收藏预加载失败: {e}", 'ui.navigation')
 
     def go_home(self):
         """返回首页（扫描结果）"""
@@ -396,6 +486,49 @@ class NavigationBar:
         
         # 绑定筛选事件
         self.filter_combobox.bind('<<ComboboxSelected>>', self._on_filter_changed)
+        
+        # 创建排序区域
+        sort_frame = tk.Frame(parent, bg=self.style_manager.colors['card_bg'])
+        sort_frame.pack(side='right', padx=(12, 0))
+        
+        sort_label = tk.Label(sort_frame,
+                             text="↕ 排序:",
+                             font=self.style_manager.fonts['caption'],
+                             bg=self.style_manager.colors['card_bg'],
+                             fg=self.style_manager.colors['text_secondary'])
+        sort_label.pack(side='left', padx=(0, 8))
+        
+        self.sort_var = tk.StringVar(value=SORT_DEFAULT)
+        self.sort_combobox = ttk.Combobox(sort_frame,
+                                         textvariable=self.sort_var,
+                                         values=SORT_OPTIONS,
+                                         state="readonly",
+                                         width=8,
+                                         font=self.style_manager.fonts['caption'])
+        self.sort_combobox.pack(side='left')
+        self.sort_combobox.bind('<<ComboboxSelected>>', self._on_sort_changed)
+        
+        # 创建搜索区域
+        search_frame = tk.Frame(parent, bg=self.style_manager.colors['card_bg'])
+        search_frame.pack(side='right', padx=(12, 0))
+        
+        search_label = tk.Label(search_frame,
+                               text="🔎 搜索:",
+                               font=self.style_manager.fonts['caption'],
+                               bg=self.style_manager.colors['card_bg'],
+                               fg=self.style_manager.colors['text_secondary'])
+        search_label.pack(side='left', padx=(0, 8))
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame,
+                                      textvariable=self.search_var,
+                                      width=20,
+                                      font=self.style_manager.fonts['caption'])
+        self.search_entry.pack(side='left')
+        
+        # 输入即搜索，ESC清空
+        self.search_var.trace_add('write', self._on_search_changed)
+        self.search_entry.bind('<Escape>', lambda e: self.clear_search())
     
     def _on_filter_changed(self, event=None):
         """处理筛选变化事件"""
@@ -407,6 +540,52 @@ class NavigationBar:
         except Exception as e:
             log_error(f"处理筛选变化时出错: {e}", 'ui.navigation')
     
+    def _on_sort_changed(self, event=None):
+        """处理排序方式变化事件"""
+        try:
+            if self.sort_callback:
+                sort_value = self.sort_var.get()
+                self.sort_callback(sort_value)
+                log_info(f"排序方式已更改为: {sort_value}", 'ui.navigation')
+        except Exception as e:
+            log_error(f"处理排序变化时出错: {e}", 'ui.navigation')
+    
+    def set_sort_callback(self, callback):
+        """设置排序回调函数"""
+        self.sort_callback = callback
+    
+    def _on_search_changed(self, *args):
+        """处理搜索输入变化（防抖后回调）"""
+        if self._suppress_search_event:
+            return
+        if self.search_timer:
+            self.parent.after_cancel(self.search_timer)
+        self.search_timer = self.parent.after(self.search_delay, self._emit_search)
+    
+    def _emit_search(self):
+        """触发搜索回调"""
+        self.search_timer = None
+        try:
+            if self.search_callback:
+                self.search_callback(self.get_search_query())
+        except Exception as e:
+            log_error(f"处理搜索输入时出错: {e}", 'ui.navigation')
+    
+    def set_search_callback(self, callback):
+        """设置搜索回调函数"""
+        self.search_callback = callback
+    
+    def get_search_query(self):
+        """获取当前搜索关键字"""
+        if self.search_var:
+            return self.search_var.get()
+        return ""
+    
+    def clear_search(self):
+        """清空搜索关键字"""
+        if self.search_var and self.search_var.get():
+            self.search_var.set("")
+    
     def set_filter_callback(self, callback):
         """设置筛选回调函数"""
         self.filter_callback = callback
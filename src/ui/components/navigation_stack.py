@@ -0,0 +1,155 @@
+from ...utils.logger import get_logger, log_info, log_error
+
+
+class GridLevel:
+    """网格导航层级 - 保存一个视图的数据、卡片容器和浏览状态"""
+
+    def __init__(self, key, title, albums):
+        self.key = key  # 视图标识，如 "scan"、"recent"、"collection:<路径>"
+        self.title = title
+        self.all_albums = albums or []
+        self.albums = []  # 当前显示（搜索、排序、筛选后）的相册
+
+        # 浏览状态
+        self.filter = "全部"
+        self.search = ""
+        self.sort = None
+        self.scroll_offset = 0.0
+
+        # 派生数据，随层级缓存避免返回时重建
+        self.search_index = None
+        self.sort_keys = None
+
+        # 卡片容器
+        self.container = None
+        self.columns = None
+        self.complete = False  # 卡片是否已全部创建
+        self.cards = {}  # 相册路径 -> 卡片控件，用于增量更新
+
+    @property
+    def card_count(self):
+        """容器中的卡片数量"""
+        return len(self.albums) if self.is_alive() else 0
+
+    def same_albums(self, albums):
+        """判断给定相册列表是否与本层级数据一致"""
+        if albums is self.all_albums:
+            return True
+        if len(albums or []) != len(self.all_albums):
+            return False
+        return all(a.get('path') == b.get('path') for a, b in zip(albums, self.all_albums))
+
+    def is_alive(self):
+        """卡片容器是否仍然存在"""
+        try:
+            return self.container is not None and bool(self.container.winfo_exists())
+        except Exception:
+            return False
+
+    def release(self):
+        """释放卡片容器，仅保留数据和浏览状态"""
+        if self.container is not None:
+            try:
+                self.container.destroy()
+            except Exception:
+                pass
+        self.container = None
+        self.complete = False
+        self.cards = {}
+
+
+class NavigationStack:
+    """网格导航栈 - 支持前进/后退，并在内存上限内保留各层级的卡片
+
+    超出上限时，优先释放距离当前位置最远的层级的卡片容器，
+    被释放的层级返回时根据保存的数据和浏览状态重建。
+    """
+
+    def __init__(self, max_cached_levels=4, max_cached_cards=600):
+        """初始化导航栈
+
+        Args:
+            max_cached_levels: 最多保留卡片容器的层级数（含当前层级）
+            max_cached_cards: 所有保留层级的卡片总数上限（不含当前层级）
+        """
+        self.logger = get_logger('ui.navigation_stack')
+        self.levels = []
+        self.index = -1
+        self.max_cached_levels = max_cached_levels
+        self.max_cached_cards = max_cached_cards
+
+    @property
+    def current(self):
+        """当前层级"""
+        if 0 <= self.index < len(self.levels):
+            return self.levels[self.index]
+        return None
+
+    def can_go_back(self):
+        return self.index > 0
+
+    def can_go_forward(self):
+        return self.index < len(self.levels) - 1
+
+    def push(self, level):
+        """进入新层级，丢弃前进历史"""
+        for dropped in self.levels[self.index + 1:]:
+            dropped.release()
+        del self.levels[self.index + 1:]
+
+        self.levels.append(level)
+        self.index = len(self.levels) - 1
+        log_info(f"进入层级: {level.key} (深度 {len(self.levels)})", 'ui.navigation_stack')
+        self.enforce_memory_cap()
+        return level
+
+    def replace_current(self, level):
+        """替换当前层级（同一视图刷新数据）"""
+        current = self.current
+        if current is None:
+            return self.push(level)
+        if current is not level:
+            current.release()
+        self.levels[self.index] = level
+        return level
+
+    def find_cached(self, key, albums):
+        """查找卡片仍然存活且数据一致的同名层级"""
+        for level in reversed(self.levels):
+            if level.key == key and level.is_alive() and level.same_albums(albums):
+                return level
+        return None
+
+    def back(self):
+        """后退一级，返回目标层级"""
+        if not self.can_go_back():
+            return None
+        self.index -= 1
+        return self.current
+
+    def forward(self):
+        """前进一级，返回目标层级"""
+        if not self.can_go_forward():
+            return None
+        self.index += 1
+        return self.current
+
+    def enforce_memory_cap(self):
+        """按距离当前位置由远到近释放超出上限的卡片容器"""
+        try:
+            cached = [(abs(i - self.index), level) for i, level in enumerate(self.levels)
+                      if i != self.index and level.is_alive()]
+            cached.sort(key=lambda item: item[0])
+
+            kept_levels = 1  # 当前层级始终保留
+            kept_cards = 0
+            for distance, level in cached:
+                if (kept_levels < self.max_cached_levels and
+                        kept_cards + level.card_count <= self.max_cached_cards):
+                    kept_levels += 1
+                    kept_cards += level.card_count
+                else:
+                    level.release()
+                    log_info(f"释放层级卡片: {level.key}", 'ui.navigation_stack')
+        except Exception as e:
+            log_error(f"回收导航层级失败: {e}", 'ui.navigation_stack')
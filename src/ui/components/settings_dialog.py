@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .style_manager import StyleManager
+from ...utils.tracing import get_tracer
 
 class SettingsDialog:
     """设置对话框"""
@@ -13,7 +14,7 @@ class SettingsDialog:
         # 创建对话框窗口
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("设置")
-        self.dialog.geometry("500x400")
+        self.dialog.geometry("500x640")
         self.dialog.resizable(False, False)
         
         # 设置窗口属性
@@ -133,6 +134,68 @@ class SettingsDialog:
             )
         notif_desc_label.pack(anchor='w', padx=25, pady=(0, 10))
         
+        # 阅读设置组
+        reading_frame = tk.LabelFrame(main_frame, text="阅读设置", font=('Microsoft YaHei', 12))
+        if self.style_manager:
+            reading_frame.configure(
+                bg=self.style_manager.colors['bg_primary'],
+                fg=self.style_manager.colors['text_primary']
+            )
+        reading_frame.pack(fill='x', pady=(0, 15))
+        
+        # 双页从右到左选项
+        self.spread_rtl_var = tk.BooleanVar()
+        spread_rtl_cb = tk.Checkbutton(
+            reading_frame,
+            text="双页模式从右到左阅读（日漫）",
+            variable=self.spread_rtl_var,
+            font=('Microsoft YaHei', 10)
+        )
+        if self.style_manager:
+            spread_rtl_cb.configure(
+                bg=self.style_manager.colors['bg_primary'],
+                fg=self.style_manager.colors['text_primary'],
+                selectcolor=self.style_manager.colors['card_bg']
+            )
+        spread_rtl_cb.pack(anchor='w', padx=10, pady=5)
+        
+        # 性能诊断设置组
+        diagnostics_frame = tk.LabelFrame(main_frame, text="性能诊断", font=('Microsoft YaHei', 12))
+        if self.style_manager:
+            diagnostics_frame.configure(
+                bg=self.style_manager.colors['bg_primary'],
+                fg=self.style_manager.colors['text_primary']
+            )
+        diagnostics_frame.pack(fill='x', pady=(0, 15))
+        
+        # 记录性能追踪选项
+        self.tracing_var = tk.BooleanVar()
+        tracing_cb = tk.Checkbutton(
+            diagnostics_frame,
+            text="记录性能追踪（Ctrl+Shift+T）",
+            variable=self.tracing_var,
+            font=('Microsoft YaHei', 10)
+        )
+        if self.style_manager:
+            tracing_cb.configure(
+                bg=self.style_manager.colors['bg_primary'],
+                fg=self.style_manager.colors['text_primary'],
+                selectcolor=self.style_manager.colors['card_bg']
+            )
+        tracing_cb.pack(anchor='w', padx=10, pady=5)
+        
+        # 导出追踪按钮
+        export_trace_btn = tk.Button(
+            diagnostics_frame,
+            text="导出追踪文件（Ctrl+Shift+E）",
+            command=self.export_trace,
+            font=('Microsoft YaHei', 9)
+        )
+        if self.style_manager:
+            btn_style = self.style_manager.get_button_style('secondary')
+            export_trace_btn.configure(**btn_style)
+        export_trace_btn.pack(anchor='w', padx=25, pady=(0, 10))
+        
         # 按钮区域
         button_frame = tk.Frame(main_frame)
         if self.style_manager:
@@ -182,6 +245,8 @@ class SettingsDialog:
         """加载当前设置"""
         self.auto_switch_var.set(self.config_manager.get_auto_switch_album())
         self.show_notification_var.set(self.config_manager.get_show_switch_notification())
+        self.spread_rtl_var.set(self.config_manager.get_spread_right_to_left())
+        self.tracing_var.set(self.config_manager.get_tracing_enabled())
         
     def save_settings(self):
         """保存设置"""
@@ -189,6 +254,9 @@ class SettingsDialog:
             # 保存设置
             self.config_manager.set_auto_switch_album(self.auto_switch_var.get())
             self.config_manager.set_show_switch_notification(self.show_notification_var.get())
+            self.config_manager.set_spread_right_to_left(self.spread_rtl_var.get())
+            self.config_manager.set_tracing_enabled(self.tracing_var.get())
+            get_tracer().set_enabled(self.tracing_var.get())
             
             # 显示成功消息
             messagebox.showinfo("设置", "设置已保存")
@@ -204,7 +272,21 @@ class SettingsDialog:
         if messagebox.askyesno("确认", "确定要恢复默认设置吗？"):
             self.auto_switch_var.set(True)
             self.show_notification_var.set(True)
+            self.spread_rtl_var.set(True)
+            self.tracing_var.set(False)
             
+    def export_trace(self):
+        """导出性能追踪为Chrome trace文件"""
+        tracer = get_tracer()
+        if tracer.event_count() == 0:
+            messagebox.showinfo("性能追踪", "还没有记录到追踪事件，请先开启性能追踪并操作一段时间")
+            return
+        file_path = tracer.export_to_directory(self.config_manager.get_trace_dir())
+        if file_path:
+            messagebox.showinfo("性能追踪", f"已导出到：\n{file_path}\n\n可在 chrome://tracing 或 Perfetto 中打开")
+        else:
+            messagebox.showerror("错误", "导出性能追踪失败")
+    
     def cancel(self):
         """取消设置"""
         self.dialog.destroy()
@@ -101,6 +101,17 @@ class StatusBar:
                                       fg=self.style_manager.colors['text_tertiary'])
         self.timestamp_label.pack(side='right')
         
+        # 界面卡顿统计（有卡顿时才显示，点击查看详情）
+        self.stall_var = tk.StringVar()
+        self.stall_label = tk.Label(right_frame,
+                                  textvariable=self.stall_var,
+                                  font=self.style_manager.fonts['small'],
+                                  bg=self.style_manager.colors['card_bg'],
+                                  fg=self.style_manager.colors['warning'],
+                                  cursor='hand2')
+        self.stall_click_callback = None
+        self.stall_label.bind('<Button-1>', lambda e: self.stall_click_callback and self.stall_click_callback())
+        
         # 初始化时间戳
         self.update_timestamp()
         log_info("状态栏组件初始化完成", 'ui.status')
@@ -150,6 +161,14 @@ class StatusBar:
         """设置信息消息"""
         self.info_var.set(message)
     
+    def set_stall_info(self, message):
+        """设置界面卡顿统计，空字符串时隐藏"""
+        self.stall_var.set(message)
+        if message:
+            self.stall_label.pack(side='right', padx=(0, 10))
+        else:
+            self.stall_label.pack_forget()
+    
     def set_progress(self, message):
         """设置进度信息"""
         self.progress_var.set(message)
@@ -0,0 +1,270 @@
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
+from ...utils.logger import get_logger, log_info, log_debug, log_error
+from ...utils.spread_layout import read_page_sizes
+from ...utils.image_utils import ImageProcessor
+
+
+class VerticalStripView:
+    """条漫（连续纵向滚动）视图 - 虚拟化的页面长条
+
+    根据图片文件头读取的尺寸把所有页面首尾相接排布在Canvas上，
+    只有视口附近的页面会在后台解码并显示，离开保留范围的页面立即释放，
+    内存占用只与视口大小有关，与相册页数无关。
+    """
+
+    PAGE_GAP = 4  # 页面间距（像素）
+    SCROLL_UNIT = 40  # 滚轮/方向键每格滚动的像素
+    PLACEHOLDER_SIZE = (800, 1200)  # 尺寸读取完成前按竖版页面比例占位
+
+    def __init__(self, canvas, image_files, page_changed_callback=None, max_workers=2):
+        """初始化条漫视图
+
+        Args:
+            canvas: 用于显示的Canvas
+            image_files: 图片文件列表
+            page_changed_callback: 视口中心所在页变化时回调 callback(index)
+            max_workers: 后台解码线程数
+        """
+        self.logger = get_logger('ui.strip_view')
+        self.canvas = canvas
+        self.image_files = image_files
+        self.page_changed_callback = page_changed_callback
+
+        # 布局：每页的原图尺寸、显示尺寸和纵向起点
+        self.page_sizes = []
+        self.display_sizes = []
+        self.page_tops = []
+        self.total_height = 0
+        self.layout_width = None
+        self.sizes_ready = False  # 后台读取页面尺寸完成前只显示占位框
+        self.closed = False
+
+        # 已显示的页面：索引 -> (画布项目ID, PhotoImage)
+        self.loaded_pages = {}
+        self.pending_pages = set()
+        self.keep_range = (0, -1)  # 保留范围（首页, 末页），主线程更新，解码线程据此跳过已滚走的页面
+        self.current_page = 0
+
+        # 布局代次，布局变化后丢弃旧的解码结果
+        self.generation = 0
+        self.update_pending = False
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='StripView')
+
+    def open(self, start_index=0):
+        """进入条漫模式并滚动到指定页"""
+        self.canvas.delete('all')
+        self.canvas.configure(yscrollincrement=self.SCROLL_UNIT)
+        
+        # 先按占位比例布局，文件头在后台读取（网络存储上数百页的文件头会明显卡住界面）
+        self.page_sizes = [self.PLACEHOLDER_SIZE] * len(self.image_files)
+        self.sizes_ready = False
+        self.relayout()
+        self.scroll_to_page(start_index)
+        self.executor.submit(self._read_page_sizes)
+        log_info(f"进入条漫模式: {len(self.image_files)} 页", 'ui.strip_view')
+
+    def close(self):
+        """退出条漫模式，释放所有页面并恢复Canvas视图"""
+        self.closed = True
+        self.generation += 1
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending_pages.clear()
+        try:
+            self._release_pages(set(self.loaded_pages))
+            self.canvas.delete('all')
+            self.canvas.configure(scrollregion=(0, 0, 0, 0), yscrollincrement=0)
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+        except Exception:
+            self.loaded_pages.clear()  # Canvas已销毁
+
+    def _read_page_sizes(self):
+        """后台线程：只读取文件头获取每页尺寸"""
+        try:
+            sizes = read_page_sizes(self.image_files)
+            self.canvas.after_idle(self._apply_page_sizes, sizes)
+        except Exception as e:
+            log_error(f"读取条漫页面尺寸失败: {e}", 'ui.strip_view')
+
+    def _apply_page_sizes(self, sizes):
+        """主线程：用实际尺寸重新布局，并保持当前页位置"""
+        if self.closed:
+            return
+        self.sizes_ready = True
+        anchor = self.current_page
+        if sizes != self.page_sizes:
+            self.page_sizes = sizes
+            self.relayout()
+            log_debug(f"条漫布局更新: 总高度 {self.total_height}px", 'ui.strip_view')
+        self.scroll_to_page(anchor)
+
+    def relayout(self):
+        """按当前Canvas宽度重新排布所有页面"""
+        canvas_width = max(1, self.canvas.winfo_width())
+        self.layout_width = canvas_width
+        self.generation += 1
+        self._release_pages(set(self.loaded_pages))
+        self.pending_pages.clear()
+        self.canvas.delete('placeholder')
+
+        self.display_sizes = []
+        self.page_tops = []
+        y = 0
+        for index, (width, height) in enumerate(self.page_sizes):
+            # 适应宽度，不放大
+            display_width = min(canvas_width, width)
+            display_height = max(1, int(height * display_width / width))
+            self.display_sizes.append((display_width, display_height))
+            self.page_tops.append(y)
+
+            # 占位框，页面解码完成前显示
+            x = (canvas_width - display_width) // 2
+            self.canvas.create_rectangle(x, y, x + display_width, y + display_height,
+                                         outline='#3A3A3C', fill='#2C2C2E', tags=('placeholder',))
+            self.canvas.create_text(canvas_width // 2, y + min(display_height // 2, 200),
+                                    text=str(index + 1), fill='#8E8E93', tags=('placeholder',))
+            y += display_height + self.PAGE_GAP
+
+        self.total_height = max(1, y - self.PAGE_GAP)
+        self.canvas.configure(scrollregion=(0, 0, canvas_width, self.total_height))
+
+    def refresh(self, index=None):
+        """宽度变化时重新布局，并保持当前页位置"""
+        if self.canvas.winfo_width() != self.layout_width:
+            anchor = self.current_page if index is None else index
+            self.relayout()
+            self.scroll_to_page(anchor)
+        elif index is not None and index != self.current_page:
+            self.scroll_to_page(index)
+        else:
+            self.on_scroll()
+
+    def scroll_to_page(self, index):
+        """滚动到指定页顶部"""
+        if not self.page_tops:
+            return
+        index = max(0, min(index, len(self.page_tops) - 1))
+        self.canvas.yview_moveto(self.page_tops[index] / self.total_height)
+        self.on_scroll()
+
+    def scroll(self, units):
+        """按滚动单位滚动"""
+        self.canvas.yview_scroll(units, 'units')
+        self.on_scroll()
+
+    def scroll_pages(self, pages):
+        """按视口高度翻屏"""
+        self.canvas.yview_scroll(pages, 'pages')
+        self.on_scroll()
+
+    def on_scroll(self):
+        """视口变化后更新可见页面（同一空闲周期内合并）"""
+        if not self.update_pending:
+            self.update_pending = True
+            self.canvas.after_idle(self._update_visible_pages)
+
+    def _visible_range(self, margin):
+        """返回与[视口顶部-margin, 视口底部+margin]相交的页面索引范围"""
+        viewport_top = self.canvas.canvasy(0)
+        viewport_bottom = viewport_top + self.canvas.winfo_height()
+        first = max(0, bisect_right(self.page_tops, viewport_top - margin) - 1)
+        last = max(first, bisect_right(self.page_tops, viewport_bottom + margin) - 1)
+        return first, min(last, len(self.page_tops) - 1)
+
+    def _update_visible_pages(self):
+        """解码视口附近的页面，释放保留范围外的页面"""
+        self.update_pending = False
+        if not self.page_tops:
+            return
+
+        try:
+            viewport_height = self.canvas.winfo_height()
+
+            # 视口上下各预载半屏，超出一屏的页面释放
+            load_first, load_last = self._visible_range(viewport_height // 2)
+            keep_first, keep_last = self._visible_range(viewport_height)
+            self.keep_range = (keep_first, keep_last)
+
+            released = {i for i in self.loaded_pages if i < keep_first or i > keep_last}
+            self._release_pages(released)
+
+            # 页面尺寸读取完成前不解码（按占位尺寸解码的结果在重新布局后会被丢弃）
+            if self.sizes_ready:
+                for index in range(load_first, load_last + 1):
+                    if index not in self.loaded_pages and index not in self.pending_pages:
+                        self.pending_pages.add(index)
+                        self.executor.submit(self._decode_page, self.generation, index,
+                                             self.image_files[index], self.display_sizes[index])
+
+            # 视口中心所在页作为当前页
+            center = self.canvas.canvasy(0) + viewport_height / 2
+            page = max(0, bisect_right(self.page_tops, center) - 1)
+            if page != self.current_page:
+                self.current_page = page
+                if self.page_changed_callback:
+                    self.page_changed_callback(page)
+        except RuntimeError:
+            pass  # 已退出条漫模式
+        except Exception as e:
+            log_error(f"更新条漫可见页面失败: {e}", 'ui.strip_view')
+
+    def _decode_page(self, generation, index, image_path, display_size):
+        """后台线程：按显示尺寸解码页面"""
+        try:
+            if generation != self.generation:
+                return
+            keep_first, keep_last = self.keep_range
+            if index < keep_first or index > keep_last:
+                # 排队期间已滚出保留范围，不再解码
+                self.canvas.after_idle(self._decode_skipped, generation, index)
+                return
+            with ImageProcessor.open_image(image_path) as img:
+                img.draft(None, display_size)
+                img.load()
+                if img.size != display_size:
+                    img = img.resize(display_size, Image.Resampling.LANCZOS)
+            self.canvas.after_idle(self._show_page, generation, index, img)
+        except Exception as e:
+            log_error(f"解码条漫页面失败 {image_path}: {e}", 'ui.strip_view')
+            # 移出待解码集合，下次滚动到该页时重试
+            try:
+                self.canvas.after_idle(self._decode_failed, generation, index)
+            except Exception:
+                pass  # Canvas已销毁
+
+    def _decode_failed(self, generation, index):
+        """主线程：解码失败的页面不再视为正在解码"""
+        if generation == self.generation:
+            self.pending_pages.discard(index)
+
+    def _decode_skipped(self, generation, index):
+        """主线程：跳过的页面移出待解码集合，若已滚回视口附近则重新安排解码"""
+        if generation == self.generation:
+            self.pending_pages.discard(index)
+            self.on_scroll()
+
+    def _show_page(self, generation, index, img):
+        """主线程：把解码好的页面放到Canvas上"""
+        if generation != self.generation:
+            return
+        self.pending_pages.discard(index)
+        if index in self.loaded_pages:
+            return
+
+        # 解码期间可能已滚出保留范围
+        keep_first, keep_last = self._visible_range(self.canvas.winfo_height())
+        if index < keep_first or index > keep_last:
+            return
+
+        photo = ImageTk.PhotoImage(img)
+        x = (self.layout_width - img.width) // 2
+        item = self.canvas.create_image(x, self.page_tops[index], anchor='nw', image=photo, tags=('strip_page',))
+        self.loaded_pages[index] = (item, photo)
+
+    def _release_pages(self, indexes):
+        """释放页面的画布项目和PhotoImage"""
+        for index in indexes:
+            item, _photo = self.loaded_pages.pop(index)
+            self.canvas.delete(item)
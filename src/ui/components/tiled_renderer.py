@@ -0,0 +1,247 @@
+import math
+from collections import OrderedDict
+from PIL import Image, ImageTk
+from ...utils.logger import get_logger, log_error
+
+
+class TiledRenderer:
+    """分块视口渲染器 - 大倍率缩放时只重采样可见区域
+
+    缩放后的图片按固定大小切分为图块，只对与画布可见区域相交的图块
+    从原图对应区域重采样并创建PhotoImage。图块按(缩放比例, 列, 行)缓存，
+    超出上限时淘汰最久未用且不可见的图块，内存占用与图片尺寸无关。
+
+    新图块先在主线程用最近邻快速缩放显示，再由后台线程LANCZOS重采样后替换，
+    拖动和缩放时主线程不做高质量重采样。
+    """
+
+    def __init__(self, canvas, executor=None, tile_size=256, max_cached_tiles=96):
+        """初始化渲染器
+
+        Args:
+            canvas: 用于显示的Canvas
+            executor: 执行LANCZOS精细重采样的线程池，为None时直接在主线程重采样
+            tile_size: 图块边长（像素）
+            max_cached_tiles: 最多缓存的图块数量
+        """
+        self.logger = get_logger('ui.tiled_renderer')
+        self.canvas = canvas
+        self.executor = executor
+        self.tile_size = tile_size
+        self.max_cached_tiles = max_cached_tiles
+
+        self.image = None  # 原图（已旋转）
+        self.image_key = None
+        self.scale = 1.0
+        self.display_width = 0
+        self.display_height = 0
+
+        # 图片左上角在画布中的位置，平移时改变
+        self.offset_x = 0
+        self.offset_y = 0
+
+        self.tile_cache = OrderedDict()  # (scale, 列, 行) -> (PhotoImage, 是否已精细重采样)
+        self.tile_items = {}  # (列, 行) -> 画布项目ID
+
+        # 后台精细重采样：代次在换图或改变缩放比例时递增，过期结果直接丢弃
+        self.generation = 0
+        self.pending_tiles = set()  # 已提交精细重采样的图块键
+
+    @property
+    def active(self):
+        """是否正在显示分块图片"""
+        return self.image is not None
+
+    def set_image(self, image, scale, image_key):
+        """设置要显示的图片和缩放比例
+
+        同一图片仅改变缩放比例时，保持视口中心对应的图片位置不变。
+
+        Args:
+            image: PIL图片（已应用旋转）
+            scale: 显示尺寸相对原图的比例
+            image_key: 图片标识（如路径和旋转角度），变化时清空图块缓存
+        """
+        canvas_width, canvas_height = self._canvas_size()
+
+        if image_key == self.image_key and self.image is not None and self.scale:
+            # 以视口中心为锚点缩放
+            center_x = (canvas_width / 2 - self.offset_x) / self.scale
+            center_y = (canvas_height / 2 - self.offset_y) / self.scale
+            if scale != self.scale:
+                # 旧比例的精细重采样不再需要（已缓存的图块保留，缩放回来时复用）
+                self.generation += 1
+                self.pending_tiles.clear()
+        else:
+            self.clear()
+            center_x = image.width / 2
+            center_y = image.height / 2
+
+        self.image = image
+        self.image_key = image_key
+        self.scale = scale
+        self.display_width = max(1, int(image.width * scale))
+        self.display_height = max(1, int(image.height * scale))
+
+        self.offset_x = canvas_width / 2 - center_x * scale
+        self.offset_y = canvas_height / 2 - center_y * scale
+        self._clamp_offset(canvas_width, canvas_height)
+        self.render()
+
+    def pan(self, dx, dy):
+        """平移视口（画布像素）"""
+        if not self.active:
+            return
+        self.offset_x += dx
+        self.offset_y += dy
+        self._clamp_offset(*self._canvas_size())
+        self.render()
+
+    def render(self):
+        """绘制与可见区域相交的图块，移除不可见的图块"""
+        if not self.active:
+            return
+
+        try:
+            canvas_width, canvas_height = self._canvas_size()
+            tile_size = self.tile_size
+            offset_x = int(round(self.offset_x))
+            offset_y = int(round(self.offset_y))
+
+            columns = math.ceil(self.display_width / tile_size)
+            rows = math.ceil(self.display_height / tile_size)
+            first_col = max(0, -offset_x // tile_size)
+            last_col = min(columns - 1, (canvas_width - offset_x - 1) // tile_size)
+            first_row = max(0, -offset_y // tile_size)
+            last_row = min(rows - 1, (canvas_height - offset_y - 1) // tile_size)
+
+            visible = set()
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    visible.add((col, row))
+                    photo, refined = self._get_tile(col, row)
+                    x = offset_x + col * tile_size
+                    y = offset_y + row * tile_size
+                    item = self.tile_items.get((col, row))
+                    if item is None:
+                        self.tile_items[(col, row)] = self.canvas.create_image(
+                            x, y, anchor='nw', image=photo, tags=('tile',))
+                    else:
+                        self.canvas.coords(item, x, y)
+                        self.canvas.itemconfigure(item, image=photo)
+                    if not refined:
+                        self._request_refine((self.scale, col, row))
+
+            # 移除离开视口的图块（缓存中的PhotoImage保留以便平移回来）
+            for position in [p for p in self.tile_items if p not in visible]:
+                self.canvas.delete(self.tile_items.pop(position))
+
+            self._evict(visible)
+        except Exception as e:
+            log_error(f"分块渲染失败: {e}", 'ui.tiled_renderer')
+
+    def clear(self):
+        """清除图块和缓存"""
+        try:
+            self.canvas.delete('tile')
+        except Exception:
+            pass
+        self.tile_items.clear()
+        self.tile_cache.clear()
+        self.pending_tiles.clear()
+        self.generation += 1
+        self.image = None
+        self.image_key = None
+
+    def _get_tile(self, col, row):
+        """获取图块及是否已精细重采样，未缓存时先快速缩放"""
+        key = (self.scale, col, row)
+        cached = self.tile_cache.get(key)
+        if cached is not None:
+            self.tile_cache.move_to_end(key)
+            return cached
+
+        size, box = self._tile_region(col, row)
+        if self.executor is None:
+            tile = self.image.resize(size, Image.Resampling.LANCZOS, box=box)
+            refined = True
+        else:
+            tile = self.image.resize(size, Image.Resampling.NEAREST, box=box)
+            refined = False
+
+        self.tile_cache[key] = (ImageTk.PhotoImage(tile), refined)
+        return self.tile_cache[key]
+
+    def _tile_region(self, col, row):
+        """图块的显示尺寸和原图中对应的区域（浮点坐标，保证图块边缘连续）"""
+        tile_size = self.tile_size
+        left = col * tile_size
+        top = row * tile_size
+        right = min(left + tile_size, self.display_width)
+        bottom = min(top + tile_size, self.display_height)
+        box = (left / self.scale, top / self.scale, right / self.scale, bottom / self.scale)
+        return (right - left, bottom - top), box
+
+    def _request_refine(self, key):
+        """提交图块的后台LANCZOS重采样（同一图块只提交一次）"""
+        if key in self.pending_tiles:
+            return
+        size, box = self._tile_region(key[1], key[2])
+        try:
+            self.executor.submit(self._refine_worker, self.generation, key, self.image, size, box)
+        except RuntimeError:
+            return  # 线程池已关闭，保留快速缩放的图块
+        self.pending_tiles.add(key)
+
+    def _refine_worker(self, generation, key, image, size, box):
+        """后台线程：LANCZOS重采样图块（已离开视口或已过期的图块跳过）"""
+        tile = None
+        try:
+            if generation == self.generation and key[1:] in self.tile_items:
+                tile = image.resize(size, Image.Resampling.LANCZOS, box=box)
+            self.canvas.after_idle(self._apply_tile, generation, key, tile)
+        except Exception as e:
+            log_error(f"图块重采样失败: {e}", 'ui.tiled_renderer')
+
+    def _apply_tile(self, generation, key, tile):
+        """主线程：用精细重采样的图块替换快速缩放的图块"""
+        if generation != self.generation:
+            return
+        self.pending_tiles.discard(key)
+        if tile is None or key not in self.tile_cache:
+            return
+        try:
+            photo = ImageTk.PhotoImage(tile)
+            self.tile_cache[key] = (photo, True)
+            item = self.tile_items.get(key[1:])
+            if item is not None and key[0] == self.scale:
+                self.canvas.itemconfigure(item, image=photo)
+        except Exception as e:
+            log_error(f"显示图块失败: {e}", 'ui.tiled_renderer')
+
+    def _evict(self, visible):
+        """淘汰超出上限的图块缓存（不淘汰可见图块）"""
+        if len(self.tile_cache) <= self.max_cached_tiles:
+            return
+        visible_keys = {(self.scale, col, row) for col, row in visible}
+        for key in list(self.tile_cache):
+            if len(self.tile_cache) <= self.max_cached_tiles:
+                break
+            if key not in visible_keys:
+                del self.tile_cache[key]
+
+    def _clamp_offset(self, canvas_width, canvas_height):
+        """限制平移范围：图片大于画布时不留空边，小于画布时居中"""
+        if self.display_width <= canvas_width:
+            self.offset_x = (canvas_width - self.display_width) / 2
+        else:
+            self.offset_x = min(0, max(canvas_width - self.display_width, self.offset_x))
+
+        if self.display_height <= canvas_height:
+            self.offset_y = (canvas_height - self.display_height) / 2
+        else:
+            self.offset_y = min(0, max(canvas_height - self.display_height, self.offset_y))
+
+    def _canvas_size(self):
+        """画布尺寸"""
+        return max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height())
@@ -0,0 +1,147 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .image_utils import ImageProcessor
+from .archive_reader import is_archive
+from .logger import get_logger, log_info, log_error
+
+
+class AlbumRecordCache:
+    """相册记录缓存 - 保存扫描得到的相册数据及其目录修改时间
+
+    最近浏览和收藏视图先直接用缓存记录显示，再在后台并发校验：
+    目录（或压缩包）修改时间未变的记录直接沿用，变化或没有记录的才重新列出图片。
+    """
+
+    def __init__(self, max_workers=8):
+        """初始化缓存
+
+        Args:
+            max_workers: 后台校验的并发线程数（网络存储上主要耗时在往返延迟）
+        """
+        self.logger = get_logger('album_records')
+        self.max_workers = max_workers
+        self._records = {}  # 相册路径 -> (目录修改时间, 相册数据)
+        self._lock = threading.Lock()
+
+    def record(self, album_info, dir_mtime=None):
+        """记录一个相册
+
+        Args:
+            album_info: build_album_info 生成的相册数据
+            dir_mtime: 相册目录的修改时间，为None时读取
+        """
+        album_path = album_info['path']
+        if dir_mtime is None:
+            try:
+                dir_mtime = os.stat(album_path).st_mtime
+            except OSError:
+                return
+        with self._lock:
+            self._records[album_path] = (dir_mtime, album_info)
+
+    def record_scan(self, albums):
+        """记录扫描结果中的所有相册（包括合集内的相册）"""
+        count = 0
+        for album in albums:
+            for sub_album in album.get('albums', [album]):
+                if sub_album.get('type', 'album') == 'album' and 'image_files' in sub_album:
+                    self.record(sub_album)
+                    count += 1
+        log_info(f"记录相册扫描结果: {count} 个", 'album_records')
+
+    def lookup(self, album_path):
+        """直接返回缓存的相册数据（不访问文件系统），没有记录时返回None"""
+        with self._lock:
+            record = self._records.get(album_path)
+        return record[1] if record else None
+
+    def export_records(self, album_paths):
+        """导出指定相册的记录 [(路径, 目录修改时间, 相册数据), ...]，用于会话快照"""
+        with self._lock:
+            return [(path, self._records[path][0], self._records[path][1])
+                    for path in album_paths if path in self._records]
+    
+    def load_records(self, records):
+        """载入会话快照中的记录（不覆盖本次会话已有的记录）"""
+        with self._lock:
+            for album_path, dir_mtime, album_info in records:
+                self._records.setdefault(album_path, (dir_mtime, album_info))
+    
+    def validate(self, album_path):
+        """按目录修改时间校验记录，变化时重新列出图片
+
+        Returns:
+            最新的相册数据；路径不存在或没有图片时返回None
+        """
+        try:
+            dir_mtime = os.stat(album_path).st_mtime
+        except OSError:
+            with self._lock:
+                self._records.pop(album_path, None)
+            return None
+
+        with self._lock:
+            record = self._records.get(album_path)
+        if record and record[0] == dir_mtime:
+            return record[1]
+
+        image_entries = ImageProcessor.get_image_entries(album_path)
+        if not image_entries:
+            with self._lock:
+                self._records.pop(album_path, None)
+            return None
+
+        name = Path(album_path).stem if is_archive(album_path) else os.path.basename(album_path)
+        album_info = ImageProcessor.build_album_info(album_path, name, image_entries)
+        album_info['type'] = 'album'
+        self.record(album_info, dir_mtime)
+        return album_info
+
+    def resolve(self, album_paths, widget, update_callback):
+        """立即返回已缓存的相册，并在后台并发校验全部路径
+
+        Args:
+            album_paths: 相册路径列表（保持该顺序）
+            widget: 用于把结果交回主线程的Tk组件
+            update_callback: 校验完成后在主线程调用 callback(albums)
+
+        Returns:
+            list: 已有缓存记录的相册数据
+        """
+        cached = [album for album in map(self.lookup, album_paths) if album is not None]
+        thread = threading.Thread(target=self._revalidate, args=(list(album_paths), widget, update_callback),
+                                  daemon=True, name='AlbumRevalidate')
+        thread.start()
+        return cached
+
+    def _revalidate(self, album_paths, widget, update_callback):
+        """后台线程：并发校验并按原顺序交回有效的相册"""
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='AlbumValidate') as executor:
+                results = list(executor.map(self._safe_validate, album_paths))
+            albums = [album for album in results if album is not None]
+            widget.after_idle(update_callback, albums)
+        except Exception as e:
+            log_error(f"后台校验相册失败: {e}", 'album_records')
+
+    def _safe_validate(self, album_path):
+        """校验单个相册，出错时视为无效"""
+        try:
+            return self.validate(album_path)
+        except Exception as e:
+            log_error(f"校验相册失败 {album_path}: {e}", 'album_records')
+            return None
+
+
+# 全局记录缓存实例
+_global_records = None
+
+
+def get_album_records():
+    """获取全局相册记录缓存"""
+    global _global_records
+    if _global_records is None:
+        _global_records = AlbumRecordCache()
+    return _global_records
@@ -0,0 +1,117 @@
+import re
+from array import array
+from .logger import get_logger, log_info, log_error
+
+# 排序方式 - 与导航栏下拉菜单选项一致
+SORT_DEFAULT = "默认"
+SORT_NAME = "名称"
+SORT_SIZE = "大小"
+SORT_PAGES = "页数"
+SORT_MODIFIED = "修改时间"
+SORT_LAST_READ = "最近阅读"
+
+SORT_OPTIONS = [SORT_DEFAULT, SORT_NAME, SORT_SIZE, SORT_PAGES, SORT_MODIFIED, SORT_LAST_READ]
+
+# 数值类排序默认从大到小（最大、最多、最新在前）
+_DESCENDING_MODES = {SORT_SIZE, SORT_PAGES, SORT_MODIFIED, SORT_LAST_READ}
+
+_DIGITS_PATTERN = re.compile(r'(\d+)')
+
+
+def natural_sort_key(name):
+    """自然排序键：数字按数值比较，使"第2话"排在"第10话"之前"""
+    parts = _DIGITS_PATTERN.split((name or '').casefold())
+    # split的结果中奇数位总是数字串，保证同位置元素类型一致
+    for i in range(1, len(parts), 2):
+        parts[i] = int(parts[i])
+    return tuple(parts)
+
+
+class AlbumSortKeys:
+    """相册排序键 - 扫描时计算的键值紧凑存储，重新排序只需一次键数组排序
+
+    数值键保存在array中，名称键预先转换为自然排序元组。
+    排序结果按方式缓存，切换回已用过的排序方式无需重新计算。
+    """
+
+    def __init__(self, albums, last_read_lookup=None):
+        """构建排序键
+
+        Args:
+            albums: 相册数据列表
+            last_read_lookup: 获取相册最近阅读时间的函数 lookup(path) -> 时间戳
+        """
+        self.logger = get_logger('album_sort')
+        self.albums = albums or []
+        self.last_read_lookup = last_read_lookup
+
+        self.name_keys = []
+        self.size_keys = array('q')
+        self.page_keys = array('q')
+        self.mtime_keys = array('d')
+        self.last_read_keys = None  # 最近阅读随时会变化，按需生成
+
+        self._order_cache = {}
+        self._build()
+
+    def _build(self):
+        """从相册数据中提取排序键（不访问文件系统）"""
+        try:
+            for album in self.albums:
+                sort_name = album.get('sort_name')
+                if sort_name is None:
+                    sort_name = natural_sort_key(album.get('name', ''))
+                self.name_keys.append(sort_name)
+                self.size_keys.append(int(album.get('folder_size_bytes', 0) or 0))
+                self.page_keys.append(int(album.get('image_count', 0) or 0))
+                self.mtime_keys.append(float(album.get('modified_time', 0) or 0))
+        except Exception as e:
+            log_error(f"构建排序键失败: {e}", 'album_sort')
+
+    def _keys_for(self, mode):
+        """获取指定排序方式的键数组"""
+        if mode == SORT_NAME:
+            return self.name_keys
+        if mode == SORT_SIZE:
+            return self.size_keys
+        if mode == SORT_PAGES:
+            return self.page_keys
+        if mode == SORT_MODIFIED:
+            return self.mtime_keys
+        if mode == SORT_LAST_READ:
+            if self.last_read_keys is None:
+                lookup = self.last_read_lookup
+                self.last_read_keys = array('d', (
+                    float(lookup(album.get('path', '')) or 0) if lookup else 0.0
+                    for album in self.albums
+                ))
+            return self.last_read_keys
+        return None
+
+    def invalidate_last_read(self):
+        """最近阅读记录变化后调用，下次排序时重新生成"""
+        self.last_read_keys = None
+        self._order_cache.pop(SORT_LAST_READ, None)
+
+    def order(self, mode):
+        """返回按指定方式排序后的相册下标列表"""
+        if mode in self._order_cache:
+            return self._order_cache[mode]
+
+        keys = self._keys_for(mode)
+        if keys is None:
+            order = list(range(len(self.albums)))
+        else:
+            order = sorted(range(len(self.albums)), key=keys.__getitem__,
+                           reverse=mode in _DESCENDING_MODES)
+            log_info(f"按 {mode} 排序 {len(order)} 个相册", 'album_sort')
+
+        self._order_cache[mode] = order
+        return order
+
+    def sort_ids(self, album_ids, mode):
+        """对部分相册下标（如搜索结果）按指定方式排序"""
+        keys = self._keys_for(mode)
+        if keys is None:
+            return list(album_ids)
+        return sorted(album_ids, key=keys.__getitem__, reverse=mode in _DESCENDING_MODES)
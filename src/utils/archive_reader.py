@@ -0,0 +1,188 @@
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
+from .album_sort import natural_sort_key
+from .logger import get_logger, log_info, log_error
+
+# 作为相册处理的压缩包扩展名
+ARCHIVE_EXTENSIONS = ('.cbz', '.zip')
+
+# 与 ImageProcessor.IMAGE_EXTENSIONS 保持一致
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff')
+
+
+def is_archive(path):
+    """是否为可作为相册打开的压缩包文件名"""
+    return str(path).lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class ArchiveReader:
+    """压缩包读取器 - 把CBZ/ZIP压缩包当作相册，页面直接从压缩成员解码
+
+    压缩包内的页面使用虚拟路径表示：压缩包路径 + 路径分隔符 + 成员名，
+    例如 "/漫画/第1卷.cbz/001.jpg"。成员列表只读取ZIP中央目录，
+    按压缩包的修改时间和大小缓存；打开的ZipFile句柄按LRU复用，
+    读取成员时整块解压到内存，不产生临时文件。
+    """
+
+    def __init__(self, max_open_archives=8):
+        """初始化读取器
+
+        Args:
+            max_open_archives: 同时保持打开的压缩包句柄数量上限
+        """
+        self.logger = get_logger('archive_reader')
+        self.max_open_archives = max_open_archives
+
+        self._lock = threading.Lock()
+        self._index_cache = {}  # 压缩包路径 -> (修改时间, 大小, 条目列表, {虚拟路径: (字节数, 修改时间)})
+        self._handles = OrderedDict()  # 压缩包路径 -> (ZipFile, 读取锁)
+
+    def split_path(self, path):
+        """拆分虚拟路径
+
+        Returns:
+            (压缩包路径, 成员名)；不是压缩包内的路径时返回 (None, None)
+        """
+        path = str(path)
+        lower = path.lower()
+        for extension in ARCHIVE_EXTENSIONS:
+            start = 0
+            while True:
+                position = lower.find(extension, start)
+                if position == -1:
+                    break
+                end = position + len(extension)
+                if end < len(path) and path[end] in ('/', os.sep):
+                    archive_path = path[:end]
+                    if archive_path in self._index_cache or os.path.isfile(archive_path):
+                        member = path[end + 1:].replace(os.sep, '/')
+                        return archive_path, member
+                start = end
+        return None, None
+
+    def is_archive_member(self, path):
+        """是否为压缩包内页面的虚拟路径"""
+        return self.split_path(path)[0] is not None
+
+    def get_entries(self, archive_path):
+        """获取压缩包内的图片条目（只读取中央目录）
+
+        Returns:
+            [(虚拟路径, 解压后字节数, 修改时间), ...]，按成员名自然排序
+        """
+        return self._get_index(str(archive_path))[0]
+
+    def _get_index(self, archive_path):
+        """获取压缩包索引（压缩包修改时间或大小变化时重新读取中央目录）
+
+        Returns:
+            (条目列表, {虚拟路径: (字节数, 修改时间)})
+        """
+        try:
+            stat = os.stat(archive_path)
+        except OSError:
+            return [], {}
+
+        with self._lock:
+            cached = self._index_cache.get(archive_path)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            return cached[2], cached[3]
+
+        entries = []
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    if info.is_dir() or info.file_size <= 0:
+                        continue
+                    base_name = name.rsplit('/', 1)[-1]
+                    # 跳过macOS资源目录和隐藏文件
+                    if name.startswith('__MACOSX/') or base_name.startswith('.'):
+                        continue
+                    if not base_name.lower().endswith(_IMAGE_EXTENSIONS):
+                        continue
+                    virtual_path = os.path.join(archive_path, *name.split('/'))
+                    entries.append((virtual_path, info.file_size, stat.st_mtime))
+
+            entries.sort(key=lambda entry: natural_sort_key(entry[0][len(archive_path) + 1:]))
+            log_info(f"索引压缩包: {os.path.basename(archive_path)} ({len(entries)} 张图片)", 'archive_reader')
+        except (zipfile.BadZipFile, OSError) as e:
+            log_error(f"读取压缩包失败 {archive_path}: {e}", 'archive_reader')
+            entries = []
+
+        members = {virtual_path: (size, mtime) for virtual_path, size, mtime in entries}
+        with self._lock:
+            self._index_cache[archive_path] = (stat.st_mtime, stat.st_size, entries, members)
+            # 压缩包已变化时关闭旧句柄
+            handle = self._handles.pop(archive_path, None)
+        if handle:
+            handle[0].close()
+        return entries, members
+
+    def read_member(self, path):
+        """读取压缩包成员的完整内容"""
+        archive_path, member = self.split_path(path)
+        if archive_path is None:
+            raise FileNotFoundError(path)
+
+        archive, read_lock = self._get_handle(archive_path)
+        with read_lock:
+            return archive.read(member)
+
+    def open_image(self, path):
+        """从压缩包成员打开图片（惰性解码，与Image.open用法一致）"""
+        from PIL import Image
+        return Image.open(BytesIO(self.read_member(path)))
+
+    def stat_member(self, path):
+        """返回压缩包成员的(字节数, 修改时间)，修改时间取压缩包的修改时间"""
+        archive_path, member = self.split_path(path)
+        if archive_path is None:
+            raise FileNotFoundError(path)
+        stat = self._get_index(archive_path)[1].get(str(path))
+        if stat is None:
+            raise FileNotFoundError(path)
+        return stat
+
+    def _get_handle(self, archive_path):
+        """获取（或打开）压缩包句柄，超出上限时关闭最久未用的句柄"""
+        with self._lock:
+            handle = self._handles.get(archive_path)
+            if handle is not None:
+                self._handles.move_to_end(archive_path)
+                return handle
+
+            handle = (zipfile.ZipFile(archive_path), threading.Lock())
+            self._handles[archive_path] = handle
+            evicted = []
+            while len(self._handles) > self.max_open_archives:
+                evicted.append(self._handles.popitem(last=False)[1])
+
+        for archive, read_lock in evicted:
+            with read_lock:
+                archive.close()
+        return handle
+
+    def close(self):
+        """关闭所有压缩包句柄"""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for archive, read_lock in handles:
+            with read_lock:
+                archive.close()
+
+
+# 全局读取器实例
+_global_reader = None
+
+
+def get_archive_reader():
+    """获取全局压缩包读取器实例"""
+    global _global_reader
+    if _global_reader is None:
+        _global_reader = ArchiveReader()
+    return _global_reader
@@ -2,13 +2,19 @@ import os
 import hashlib
 import threading
 import queue
+import time
+from collections import OrderedDict
 from pathlib import Path
-from PIL import Image, ImageTk
 from concurrent.futures import ThreadPoolExecutor
-from .logger import get_logger, log_info, log_error, log_exception
+from .logger import get_logger, log_info, log_debug, log_error, log_exception
+from .image_utils import ImageProcessor
+from .archive_reader import is_archive
+from .read_ahead import ReadAheadBuffer
+from .io_scheduler import BulkReadScheduler
+from .tracing import get_tracer, trace_span
 
 class ImageCache:
-    """异步图片缓存管理器"""
+    """异步图片缓存管理器（PIL在加载任务中导入，导入本模块不会加载图片库）"""
     
     def __init__(self, cache_dir=None, max_memory_items=100, max_workers=2):
         """初始化缓存管理器
@@ -35,17 +41,33 @@ class ImageCache:
         self.load_queue = queue.Queue()
         self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ImageCache')
         
+        # 批量预加载：按磁盘位置排序并按设备限制并发，同时按读取顺序预读原图文件
+        self.read_ahead = ReadAheadBuffer(max_bytes_in_flight=32 * 1024 * 1024, name='ImageCacheReadAhead')
+        self.bulk_scheduler = BulkReadScheduler(self._process_load_task,
+                                                lookahead_callback=self._schedule_read_ahead)
+        
+        # 会话快照提供的缓存键：(图片路径, 尺寸) -> 缓存键，启动时免去逐个stat封面
+        self.cache_key_hints = {}
+        self.recent_cache_keys = OrderedDict()  # 最近生成的缓存键，用于保存快照
+        self.max_recent_cache_keys = 500
+        
         # 回调管理
         self.callbacks = {}  # {cache_key: [callback_list]}
         self.loading_set = set()  # 正在加载的项目
+        self.enqueued_at = {}  # 开启追踪时记录入队时间 {cache_key: perf_counter}
         
-        # 启动工作线程
-        self._start_workers()
+        # 工作线程在第一个加载任务入队时启动
+        self._workers_started = False
+        self._workers_lock = threading.Lock()
         
         log_info(f"图片缓存管理器初始化完成，缓存目录: {self.cache_dir}", 'image_cache')
     
     def _start_workers(self):
-        """启动工作线程"""
+        """启动工作线程（只启动一次）"""
+        with self._workers_lock:
+            if self._workers_started:
+                return
+            self._workers_started = True
         for i in range(2):  # 启动2个工作线程
             thread = threading.Thread(target=self._worker, daemon=True)
             thread.start()
@@ -65,21 +87,36 @@ class ImageCache:
             except Exception as e:
                 log_error(f"工作线程处理任务时出错: {e}", 'image_cache')
     
+    def _schedule_read_ahead(self, tasks):
+        """预读即将执行的批量任务中需要解码原图的文件（已有磁盘缓存的跳过，避免缓冲无人取走）"""
+        paths = [image_path for image_path, _, cache_key in tasks
+                 if not self._get_cache_path(cache_key).exists()]
+        if paths:
+            self.read_ahead.schedule(paths)
+    
     def _process_load_task(self, task):
         """处理加载任务"""
         try:
             image_path, size, cache_key = task
             
+            # 记录任务在队列中的等待时间
+            enqueued_at = self.enqueued_at.pop(cache_key, None)
+            if enqueued_at is not None:
+                get_tracer().add_complete('cache.queue_wait', enqueued_at, time.perf_counter())
+            
             # 检查磁盘缓存
             cached_path = self._get_cache_path(cache_key)
             
             if cached_path.exists():
                 # 从磁盘缓存加载
                 try:
-                    with Image.open(cached_path) as img:
+                    from PIL import Image, ImageTk
+                    with trace_span('cache.disk_load'), Image.open(cached_path) as img:
+                        img.load()
+                    with trace_span('cache.photoimage'):
                         photo = ImageTk.PhotoImage(img)
-                        self._cache_loaded_image(cache_key, photo)
-                        return
+                    self._cache_loaded_image(cache_key, photo)
+                    return
                 except Exception as e:
                     log_error(f"从磁盘缓存加载图片失败: {e}", 'image_cache')
                     # 删除损坏的缓存文件
@@ -97,8 +134,30 @@ class ImageCache:
     def _load_and_cache_image(self, image_path, size, cache_key, cached_path):
         """加载并缓存图片"""
         try:
-            # 安全地加载图片
-            with Image.open(image_path) as img:
+            thumbnail = self.render_thumbnail(image_path, size, cached_path)
+            
+            # 创建PhotoImage并缓存到内存
+            from PIL import ImageTk
+            with trace_span('cache.photoimage'):
+                photo = ImageTk.PhotoImage(thumbnail)
+            self._cache_loaded_image(cache_key, photo)
+            
+        except Exception as e:
+            log_error(f"加载图片失败 {image_path}: {e}", 'image_cache')
+            self._notify_load_error(cache_key, e)
+    
+    def render_thumbnail(self, image_path, size, cached_path):
+        """解码原图、生成缩略图并写入磁盘缓存（不涉及Tk，可在无界面环境中调用）
+        
+        Returns:
+            PIL.Image: 缩略图
+        """
+        # 安全地加载图片（优先使用预读缓冲，支持压缩包内页面）
+        with trace_span('cache.decode'):
+            source = self.read_ahead.open_image(image_path)
+            if source is None:
+                source = ImageProcessor.open_image(image_path)
+            with source as img:
                 # 检查图片尺寸是否合理
                 width, height = img.size
                 max_pixels = 50 * 1024 * 1024  # 50兆像素
@@ -108,24 +167,23 @@ class ImageCache:
                 # 安全加载图片
                 img.load()
                 original_img = img.copy()
-            
-            # 创建缩略图
+        
+        # 创建缩略图
+        from PIL import Image
+        with trace_span('cache.resize'):
             thumbnail = original_img.copy()
             thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
             
-            # 保存到磁盘缓存
-            try:
-                thumbnail.save(cached_path, 'PNG', optimize=True)
-            except Exception as e:
-                log_error(f"保存缓存文件失败: {e}", 'image_cache')
-            
-            # 创建PhotoImage并缓存到内存
-            photo = ImageTk.PhotoImage(thumbnail)
-            self._cache_loaded_image(cache_key, photo)
-            
+            # 灰度内容以L模式保存，磁盘缓存和内存占用更小
+            thumbnail = ImageProcessor.to_grayscale_if_possible(thumbnail)
+        
+        # 保存到磁盘缓存
+        try:
+            thumbnail.save(cached_path, 'PNG', optimize=True)
         except Exception as e:
-            log_error(f"加载图片失败 {image_path}: {e}", 'image_cache')
-            self._notify_load_error(cache_key, e)
+            log_error(f"保存缓存文件失败: {e}", 'image_cache')
+        
+        return thumbnail
     
     def _cache_loaded_image(self, cache_key, photo):
         """将加载的图片缓存到内存并通知回调"""
@@ -182,10 +240,39 @@ class ImageCache:
     
     def _generate_cache_key(self, image_path, size):
         """生成缓存键"""
+        hint_key = (str(image_path), tuple(size))
+        cache_key = self.cache_key_hints.get(hint_key)
+        if cache_key and self._get_cache_path(cache_key).exists():
+            return cache_key
+        
+        cache_key = self._compute_cache_key(image_path, size)
+        self.recent_cache_keys[hint_key] = cache_key
+        self.recent_cache_keys.move_to_end(hint_key)
+        while len(self.recent_cache_keys) > self.max_recent_cache_keys:
+            self.recent_cache_keys.popitem(last=False)
+        return cache_key
+    
+    def seed_cache_keys(self, hints):
+        """载入会话快照保存的缓存键 [(图片路径, [宽, 高], 缓存键), ...]"""
+        for image_path, size, cache_key in hints:
+            self.cache_key_hints[(image_path, tuple(size))] = cache_key
+    
+    def export_cache_keys(self, image_paths):
+        """导出指定图片最近使用的缓存键，格式同 seed_cache_keys"""
+        image_paths = set(image_paths)
+        return [(path, list(size), cache_key) for (path, size), cache_key in self.recent_cache_keys.items()
+                if path in image_paths]
+    
+    def clear_cache_key_hints(self):
+        """后台校验完成后不再信任快照中的缓存键"""
+        self.cache_key_hints.clear()
+    
+    def _compute_cache_key(self, image_path, size):
+        """根据文件修改时间计算缓存键"""
         # 使用文件路径、修改时间和尺寸生成唯一键
         try:
-            stat = os.stat(image_path)
-            key_data = f"{image_path}_{stat.st_mtime}_{size[0]}x{size[1]}"
+            modified_time = ImageProcessor.get_image_stat(image_path)[1]
+            key_data = f"{image_path}_{modified_time}_{size[0]}x{size[1]}"
             return hashlib.md5(key_data.encode()).hexdigest()
         except Exception:
             # 如果获取文件信息失败，使用路径和尺寸
@@ -220,6 +307,9 @@ class ImageCache:
         if cache_key not in self.loading_set:
             self.loading_set.add(cache_key)
             task = (image_path, size, cache_key)
+            if get_tracer().enabled:
+                self.enqueued_at[cache_key] = time.perf_counter()
+            self._start_workers()
             self.load_queue.put(task)
     
     def clear_memory_cache(self):
@@ -267,6 +357,10 @@ class ImageCache:
                 except Exception as e:
                     log_error(f"停止工作线程时出错: {e}", 'image_cache')
             
+            # 停止批量读取和预读
+            self.bulk_scheduler.close()
+            self.read_ahead.close()
+            
             # 关闭线程池
             try:
                 self.executor.shutdown(wait=True)
@@ -311,6 +405,8 @@ class ImageCache:
                     # 添加到加载队列
                     self.loading_set.add(cache_key)
                     task = (image_path, size, cache_key)
+                    if get_tracer().enabled:
+                        self.enqueued_at[cache_key] = time.perf_counter()
                     
                     if priority:
                         # 优先任务：插入到队列前面
@@ -327,8 +423,10 @@ class ImageCache:
                         
                         # 重新装载队列
                         self.load_queue = temp_queue
+                        self._start_workers()
                     else:
-                        self.load_queue.put(task)
+                        # 后台批量任务交给调度器按磁盘位置排序读取
+                        self.bulk_scheduler.submit(image_path, task)
                     
                     preload_count += 1
                     
@@ -336,7 +434,7 @@ class ImageCache:
                     log_error(f"添加预加载任务失败 {image_path}: {e}", 'image_cache')
                     continue
                 
-            log_info(f"预加载 {preload_count} 张图片，优先级: {priority}", 'image_cache')
+            log_debug(f"预加载 {preload_count} 张图片，优先级: {priority}", 'image_cache')
             
         except Exception as e:
             log_error(f"预加载图片失败: {e}", 'image_cache')
@@ -372,6 +470,11 @@ class ImageCache:
     def _find_album_cover(self, album_path):
         """查找相册的封面图片"""
         try:
+            # 压缩包相册：取中央目录中排序后的第一张
+            if is_archive(album_path):
+                image_files = ImageProcessor.get_image_files(album_path)
+                return image_files[0] if image_files else None
+            
             image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'}
             
             # 按文件名排序查找第一张图片
@@ -453,7 +556,10 @@ class ImageCache:
                 'disk_size_mb': disk_size / (1024 * 1024),
                 'loading_count': loading_count,
                 'pending_callbacks': pending_callbacks,
-                'queue_size': self.load_queue.qsize()
+                'queue_size': self.load_queue.qsize(),
+                'bulk_pending': self.bulk_scheduler.pending_count(),
+                'read_ahead': self.read_ahead.get_stats(),
+                'grayscale': ImageProcessor.get_grayscale_stats()
             }
             
         except Exception as e:
@@ -463,13 +569,38 @@ class ImageCache:
 # 全局缓存实例
 _global_cache = None
 
+# 缓存创建前暂存的会话快照缓存键，启动时不必为此创建缓存（线程池、缓存目录）
+_pending_cache_key_hints = []
+
 def get_image_cache():
     """获取全局图片缓存实例"""
     global _global_cache
     if _global_cache is None:
         _global_cache = ImageCache()
+        _global_cache.seed_cache_keys(_pending_cache_key_hints)
+        _pending_cache_key_hints.clear()
     return _global_cache
 
+def seed_cover_cache_keys(hints):
+    """载入会话快照的缓存键；缓存尚未创建时暂存，首次使用缓存时再载入"""
+    if _global_cache is None:
+        _pending_cache_key_hints.extend(hints)
+    else:
+        _global_cache.seed_cache_keys(hints)
+
+def clear_cover_cache_key_hints():
+    """后台校验完成后丢弃快照中的缓存键"""
+    _pending_cache_key_hints.clear()
+    if _global_cache is not None:
+        _global_cache.clear_cache_key_hints()
+
+def export_cover_cache_keys(image_paths):
+    """导出缓存键用于保存会话快照；缓存未创建过时原样保留暂存的缓存键"""
+    if _global_cache is not None:
+        return _global_cache.export_cache_keys(image_paths)
+    image_paths = set(image_paths)
+    return [list(hint) for hint in _pending_cache_key_hints if hint[0] in image_paths]
+
 def _create_fallback_cache():
     """创建备用缓存（当主缓存创建失败时）"""
     class FallbackCache:
@@ -477,7 +608,7 @@ def _create_fallback_cache():
             """简单的同步加载实现"""
             try:
                 from PIL import Image, ImageTk
-                with Image.open(image_path) as img:
+                with ImageProcessor.open_image(image_path) as img:
                     img.thumbnail(size, Image.Resampling.LANCZOS)
                     photo = ImageTk.PhotoImage(img)
                     widget.after_idle(success_callback, photo)
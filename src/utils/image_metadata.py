@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .image_utils import ImageProcessor
+from .logger import get_logger, log_info, log_error
+
+# EXIF方向标签
+EXIF_ORIENTATION_TAG = 0x0112
+
+# 单页元数据：全部来自文件头，不解码像素
+ImageMetadata = namedtuple('ImageMetadata', ['width', 'height', 'mode', 'format', 'orientation'])
+
+
+def read_image_header(image_path):
+    """只读取文件头获取图片元数据（支持压缩包内页面）"""
+    # 已预读的文件直接从缓冲读取文件头，但不取走缓冲，留给随后的解码
+    with ImageProcessor.open_image(image_path, take_buffer=False) as img:
+        orientation = 1
+        try:
+            orientation = img.getexif().get(EXIF_ORIENTATION_TAG, 1)
+        except Exception:
+            pass
+        return ImageMetadata(img.width, img.height, img.mode, img.format or '', orientation)
+
+
+class ImageMetadataIndex:
+    """图片元数据索引 - 扫描时并行读取文件头，之后的布局决策无需解码
+
+    索引按图片路径保存宽、高、颜色模式、格式和EXIF方向，并记下读取时文件的(字节数, 修改时间)；
+    查询和重建时文件已被替换或重新编码则重新读取文件头，避免使用过期的尺寸。
+    扫描完成后在后台线程中构建（同一时间只有一次构建，新的扫描请求排在后面并取代未开始的旧请求）；
+    查询尚未索引的路径时同步读取文件头并补入索引。
+    """
+
+    # 每个线程任务处理的文件数
+    CHUNK_SIZE = 256
+
+    def __init__(self, max_workers=None):
+        """初始化索引
+
+        Args:
+            max_workers: 读取文件头的线程数，默认按CPU数量确定
+        """
+        self.logger = get_logger('image_metadata')
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 2) * 2)
+        self._entries = {}  # 路径 -> ((字节数, 修改时间), 元数据)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()  # 串行化构建
+        self._build_thread = None
+        self._pending_build = None  # 等待后台构建的 (路径列表, 是否清理)
+        self.last_build_stats = None
+
+    def get(self, image_path):
+        """获取单页元数据，未索引或文件已变化时读取文件头"""
+        try:
+            stamp = ImageProcessor.get_image_stat(image_path)
+        except OSError:
+            stamp = None
+        entry = self._entries.get(image_path)
+        if entry is not None and (stamp is None or entry[0] == stamp):
+            return entry[1]
+        metadata = read_image_header(image_path)
+        with self._lock:
+            self._entries[image_path] = (stamp, metadata)
+        return metadata
+
+    def get_size(self, image_path):
+        """获取图片尺寸 (宽, 高)"""
+        metadata = self.get(image_path)
+        return metadata.width, metadata.height
+
+    def build(self, image_paths, prune=False):
+        """并行读取文件头并写入索引（阻塞直到完成）
+
+        已索引且(字节数, 修改时间)未变的文件跳过。
+
+        Args:
+            image_paths: 图片路径列表
+            prune: 是否移除不在本次列表中的条目（重新扫描后调用）
+
+        Returns:
+            dict: files, reused, pruned, failed, seconds, files_per_second
+        """
+        with self._build_lock:
+            paths = list(image_paths)
+            start_time = time.perf_counter()
+            read_count = 0
+            failed = 0
+            pruned = 0
+
+            if prune:
+                wanted = set(paths)
+                with self._lock:
+                    stale = [path for path in self._entries if path not in wanted]
+                    for path in stale:
+                        del self._entries[path]
+                pruned = len(stale)
+
+            if paths:
+                chunks = [paths[i:i + self.CHUNK_SIZE] for i in range(0, len(paths), self.CHUNK_SIZE)]
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ImageMetadata') as executor:
+                    for results, chunk_failed in executor.map(self._read_chunk, chunks):
+                        failed += chunk_failed
+                        read_count += len(results)
+                        with self._lock:
+                            self._entries.update(results)
+
+            elapsed = time.perf_counter() - start_time
+            stats = {
+                'files': read_count,
+                'reused': len(paths) - read_count - failed,
+                'pruned': pruned,
+                'failed': failed,
+                'seconds': elapsed,
+                'files_per_second': len(paths) / elapsed if elapsed > 0 else 0.0,
+            }
+            self.last_build_stats = stats
+            if read_count or failed or pruned:
+                log_info(f"元数据索引: 读取 {read_count} 个文件, 复用 {stats['reused']}, 移除 {pruned}, "
+                         f"失败 {failed}, 耗时 {elapsed:.2f}s ({stats['files_per_second']:.0f} 文件/秒)",
+                         'image_metadata')
+            return stats
+
+    def build_async(self, image_paths, prune=True):
+        """在后台线程中构建索引，不阻塞扫描结果显示
+
+        已有构建在进行时，本次请求在其完成后执行（取代尚未开始的旧请求）。
+        """
+        with self._lock:
+            self._pending_build = (list(image_paths), prune)
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return self._build_thread
+            self._build_thread = threading.Thread(target=self._build_loop, daemon=True,
+                                                  name='ImageMetadataIndex')
+            self._build_thread.start()
+            return self._build_thread
+
+    def _build_loop(self):
+        """后台线程：依次执行排队的构建请求"""
+        while True:
+            with self._lock:
+                request, self._pending_build = self._pending_build, None
+                if request is None:
+                    self._build_thread = None
+                    return
+            try:
+                self.build(*request)
+            except Exception as e:
+                log_error(f"构建元数据索引失败: {e}", 'image_metadata')
+
+    @property
+    def building(self):
+        """后台构建是否仍在进行"""
+        with self._lock:
+            return self._build_thread is not None
+
+    def clear(self):
+        """清空索引"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _read_chunk(self, paths):
+        """读取一组文件中新增或已变化文件的文件头"""
+        results = {}
+        failed = 0
+        for path in paths:
+            try:
+                stamp = ImageProcessor.get_image_stat(path)
+                entry = self._entries.get(path)
+                if entry is not None and entry[0] == stamp:
+                    continue
+                results[path] = (stamp, read_image_header(path))
+            except Exception as e:
+                failed += 1
+                log_error(f"读取图片文件头失败 {path}: {e}", 'image_metadata')
+        return results, failed
+
+
+# 全局索引实例
+_global_index = None
+
+
+def get_metadata_index():
+    """获取全局图片元数据索引"""
+    global _global_index
+    if _global_index is None:
+        _global_index = ImageMetadataIndex()
+    return _global_index
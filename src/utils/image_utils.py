@@ -1,50 +1,61 @@
 import os
-import glob
-import sys
-from PIL import Image, ImageTk, ExifTags
 from pathlib import Path
 import threading
 import time
-import difflib
 import re
-import os
+from .album_sort import natural_sort_key
+from .archive_reader import is_archive, get_archive_reader
+from .read_ahead import get_read_ahead
+from .logger import log_debug, log_error
+from .tracing import get_tracer, traced
 
 class ImageProcessor:
-    """图片处理器，负责图片的扫描、加载和处理"""
+    """图片处理器，负责图片的扫描、加载和处理
+
+    PIL只在解码相关的方法中导入，扫描和分组不加载图片库，启动时无需导入PIL。
+    """
     
     IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff']
     
+    # 灰度检测：在缩小的采样图上比较通道差，允许少量像素超出容差（JPEG色度噪声）
+    GRAYSCALE_SAMPLE_SIZE = 64
+    GRAYSCALE_TOLERANCE = 12
+    GRAYSCALE_OUTLIER_RATIO = 0.005
+    
+    _grayscale_lock = threading.Lock()
+    _grayscale_stats = {'conversions': 0, 'bytes_avoided': 0}
+    
     @classmethod
     def scan_albums(cls, root_path):
         """扫描漫画文件夹，支持合集功能"""
         albums = []
+        walk_start = time.perf_counter()
         
         try:
             # 使用pathlib处理路径，更好地支持Unicode
             root_path = Path(root_path)
             
             if not root_path.exists():
-                print(f"路径不存在: {root_path}")
+                log_error(f"路径不存在: {root_path}", 'image_utils')
                 return albums
             
-            # 扫描根目录的直接子文件夹
+            # 扫描根目录的直接子文件夹和压缩包
             for item in root_path.iterdir():
-                if item.is_dir():
+                if is_archive(item.name) and item.is_file():
+                    # CBZ/ZIP压缩包作为单个相册（只读取中央目录）
+                    image_entries = cls.get_image_entries(str(item))
+                    if image_entries:
+                        album_info = cls.build_album_info(str(item), item.stem, image_entries)
+                        album_info['type'] = 'album'
+                        albums.append(album_info)
+                elif item.is_dir():
                     # 检查这个文件夹是否包含图片（作为单个相册）
-                    image_files = cls.get_image_files(str(item))
+                    image_entries = cls.get_image_entries(str(item))
                     
-                    if image_files:
+                    if image_entries:
                         # 这是一个包含图片的相册
-                        folder_size = cls.get_folder_size(image_files)
-                        album_info = {
-                            'path': str(item),
-                            'name': item.name,
-                            'image_files': image_files,
-                            'cover_image': image_files[0],
-                            'image_count': len(image_files),
-                            'folder_size': folder_size,
-                            'type': 'album'  # 标记为单个相册
-                        }
+                        album_info = cls.build_album_info(str(item), item.name, image_entries)
+                        album_info['type'] = 'album'  # 标记为单个相册
                         albums.append(album_info)
                     else:
                         # 检查是否包含子相册（作为合集）
@@ -54,7 +65,7 @@ class ImageProcessor:
                         if sub_albums:
                             # 这是一个合集，包含多个相册
                             total_images = sum(len(album['image_files']) for album in sub_albums)
-                            total_size_bytes = sum(cls._parse_size_to_bytes(album['folder_size']) for album in sub_albums)
+                            total_size_bytes = sum(cls._get_size_bytes(album) for album in sub_albums)
                             
                             # 使用第一个相册的第一张图作为合集封面
                             cover_image = sub_albums[0]['cover_image'] if sub_albums else None
@@ -67,56 +78,72 @@ class ImageProcessor:
                                 'album_count': len(sub_albums),
                                 'image_count': total_images,
                                 'folder_size': cls.format_size(total_size_bytes),
+                                'folder_size_bytes': total_size_bytes,
+                                'modified_time': max(album.get('modified_time', 0) for album in sub_albums),
+                                'sort_name': natural_sort_key(item.name),
                                 'type': 'collection'  # 标记为合集
                             }
                             albums.append(collection_info)
                         
         except Exception as e:
-            print(f"扫描根目录时出错 {root_path}: {e}")
+            log_error(f"扫描根目录时出错 {root_path}: {e}", 'image_utils')
+        get_tracer().add_complete('scan.walk', walk_start, time.perf_counter(), {'items': len(albums)})
+        
+        # 在后台并行读取所有页面的文件头，建立元数据索引
+        cls._index_album_metadata(albums)
+        
+        # 记录相册数据和目录修改时间，最近浏览和收藏视图直接复用
+        from .album_records import get_album_records
+        get_album_records().record_scan(albums)
         
         # 智能分组：对非合集的相册进行相似度分析
         albums = cls.create_smart_groups(albums)
             
         return albums
     
+    @classmethod
+    def _index_album_metadata(cls, albums):
+        """为扫描到的所有页面建立元数据索引（后台并行，不阻塞扫描结果）"""
+        from .image_metadata import get_metadata_index
+        
+        image_paths = []
+        for album in albums:
+            for sub_album in album.get('albums', [album]):
+                image_paths.extend(sub_album.get('image_files', []))
+        if image_paths:
+            get_metadata_index().build_async(image_paths)
+    
     @classmethod
     def _scan_folder_recursive(cls, folder_path, albums):
         """递归扫描文件夹"""
         try:
             for item in folder_path.iterdir():
-                if item.is_dir():
+                if is_archive(item.name) and item.is_file():
+                    # 合集中的压缩包同样作为相册
+                    image_entries = cls.get_image_entries(str(item))
+                    if image_entries:
+                        albums.append(cls.build_album_info(str(item), item.stem, image_entries))
+                elif item.is_dir():
                     try:
-                        # 获取当前文件夹中的图片文件
-                        image_files = cls.get_image_files(str(item))
+                        # 获取当前文件夹中的图片文件（同时得到大小和修改时间）
+                        image_entries = cls.get_image_entries(str(item))
                         
-                        if image_files and len(image_files) > 0:
-                            # 计算文件夹大小
-                            folder_size = cls.get_folder_size(image_files)
-                            
-                            # 确保有封面图片
-                            cover_image = image_files[0] if image_files else None
-                            
-                            album_info = {
-                                'path': str(item),
-                                'name': item.name,
-                                'image_files': image_files,
-                                'cover_image': cover_image,
-                                'image_count': len(image_files),
-                                'folder_size': folder_size
-                            }
+                        if image_entries:
+                            album_info = cls.build_album_info(str(item), item.name, image_entries)
                             albums.append(album_info)
                         
                         # 递归扫描子文件夹
                         cls._scan_folder_recursive(item, albums)
                         
                     except Exception as e:
-                        print(f"处理文件夹时出错 {item}: {e}")
+                        log_error(f"处理文件夹时出错 {item}: {e}", 'image_utils')
                         continue
                         
         except Exception as e:
-            print(f"递归扫描文件夹时出错 {folder_path}: {e}")
+            log_error(f"递归扫描文件夹时出错 {folder_path}: {e}", 'image_utils')
     
     @classmethod
+    @traced('scan.grouping')
     def create_smart_groups(cls, albums):
         """智能分组：基于路径名称相似度和作者信息创建智能合集"""
         if len(albums) < 2:
@@ -234,7 +261,8 @@ class ImageProcessor:
         if not clean_name1 or not clean_name2:
             return 0.0
         
-        # 使用difflib计算序列相似度
+        # 使用difflib计算序列相似度（只在智能分组时用到，按需导入）
+        import difflib
         similarity = difflib.SequenceMatcher(None, clean_name1, clean_name2).ratio()
         
         # 额外检查：如果一个名称是另一个的子串，提高相似度
@@ -280,7 +308,7 @@ class ImageProcessor:
         
         # 计算合集统计信息
         total_images = sum(album['image_count'] for album in albums)
-        total_size_bytes = sum(cls._parse_size_to_bytes(album['folder_size']) for album in albums)
+        total_size_bytes = sum(cls._get_size_bytes(album) for album in albums)
         
         # 选择封面：优先选择图片数量最多的相册的封面
         cover_album = max(albums, key=lambda x: x['image_count'])
@@ -298,6 +326,9 @@ class ImageProcessor:
             'album_count': len(albums),
             'image_count': total_images,
             'folder_size': cls.format_size(total_size_bytes),
+            'folder_size_bytes': total_size_bytes,
+            'modified_time': max(album.get('modified_time', 0) for album in albums),
+            'sort_name': natural_sort_key(collection_name),
             'type': 'smart_collection'  # 标记为智能分组合集
         }
     
@@ -358,7 +389,7 @@ class ImageProcessor:
         total_size = 0
         for file_path in image_files:
             try:
-                total_size += os.path.getsize(file_path)
+                total_size += cls.get_image_stat(file_path)[0]
             except OSError:
                 continue
         return cls.format_size(total_size)
@@ -375,6 +406,14 @@ class ImageProcessor:
             i += 1
         return f"{size_bytes:.1f}{size_names[i]}"
     
+    @classmethod
+    def _get_size_bytes(cls, album):
+        """获取相册字节数，优先使用扫描时记录的精确值"""
+        size_bytes = album.get('folder_size_bytes')
+        if size_bytes is not None:
+            return size_bytes
+        return cls._parse_size_to_bytes(album.get('folder_size'))
+    
     @classmethod
     def _parse_size_to_bytes(cls, size_str):
         """将格式化的大小字符串转换回字节数"""
@@ -397,53 +436,187 @@ class ImageProcessor:
             return 0
     
     @classmethod
-    def get_image_files(cls, folder_path):
-        """获取文件夹中的所有图片文件，支持Unicode路径"""
-        image_files = []
+    def build_album_info(cls, folder_path, name, image_entries):
+        """根据图片条目构建相册数据，同时记录排序所需的键值
+        
+        Args:
+            folder_path: 相册路径
+            name: 相册名称
+            image_entries: get_image_entries 返回的 [(路径, 大小, 修改时间), ...]
+        """
+        image_files = [entry[0] for entry in image_entries]
+        total_size = sum(entry[1] for entry in image_entries)
+        
+        return {
+            'path': folder_path,
+            'name': name,
+            'image_files': image_files,
+            'cover_image': image_files[0] if image_files else None,
+            'image_count': len(image_files),
+            'folder_size': cls.format_size(total_size),
+            'folder_size_bytes': total_size,
+            'modified_time': max((entry[2] for entry in image_entries), default=0),
+            'sort_name': natural_sort_key(name)
+        }
+    
+    @classmethod
+    def get_image_entries(cls, folder_path):
+        """获取文件夹中的图片文件及其大小、修改时间，每个文件只stat一次
+        
+        Returns:
+            [(路径, 字节数, 修改时间), ...]，按文件名自然排序
+        """
+        image_entries = []
+        
+        # 压缩包相册：条目来自中央目录索引
+        if is_archive(folder_path) and os.path.isfile(str(folder_path)):
+            return list(get_archive_reader().get_entries(str(folder_path)))
         
         try:
-            folder_path = Path(folder_path)
-            
-            if not folder_path.exists():
-                return image_files
-            
-            # 遍历文件夹中的所有文件
-            for file_path in folder_path.iterdir():
-                if file_path.is_file():
-                    # 检查文件扩展名
-                    if file_path.suffix.lower() in cls.IMAGE_EXTENSIONS:
-                        try:
-                            # 验证文件是否可读
-                            if file_path.exists() and file_path.stat().st_size > 0:
-                                image_files.append(str(file_path))
-                        except Exception as e:
-                            print(f"检查文件时出错 {file_path}: {e}")
+            with os.scandir(str(folder_path)) as entries:
+                for entry in entries:
+                    # 先检查扩展名，避免对非图片文件stat
+                    if os.path.splitext(entry.name)[1].lower() not in cls.IMAGE_EXTENSIONS:
+                        continue
+                    try:
+                        if not entry.is_file():
                             continue
-                            
+                        stat = entry.stat()
+                        # 验证文件是否可读
+                        if stat.st_size > 0:
+                            image_entries.append((entry.path, stat.st_size, stat.st_mtime))
+                    except OSError as e:
+                        log_error(f"检查文件时出错 {entry.path}: {e}", 'image_utils')
+                        continue
+                        
+        except FileNotFoundError:
+            return image_entries
         except Exception as e:
-            print(f"读取文件夹时出错 {folder_path}: {e}")
+            log_error(f"读取文件夹时出错 {folder_path}: {e}", 'image_utils')
             
-        # 按文件名排序
+        # 按文件名自然排序（数字按数值比较）
         try:
-            image_files.sort(key=lambda x: Path(x).name.lower())
+            image_entries.sort(key=lambda entry: natural_sort_key(os.path.basename(entry[0])))
         except Exception as e:
-            print(f"排序文件时出错: {e}")
+            log_error(f"排序文件时出错: {e}", 'image_utils')
             
-        return image_files
+        return image_entries
+    
+    @classmethod
+    def get_image_files(cls, folder_path):
+        """获取文件夹中的所有图片文件，支持Unicode路径"""
+        return [entry[0] for entry in cls.get_image_entries(folder_path)]
+    
+    @classmethod
+    def open_image(cls, image_path, use_read_ahead=True, take_buffer=True):
+        """打开图片，支持压缩包内页面的虚拟路径（用法与Image.open一致）
+        
+        Args:
+            image_path: 图片路径
+            use_read_ahead: 已被顺序预读时从内存缓冲打开
+            take_buffer: 是否取走预读缓冲；主线程上的草稿解码传False，只查看不等待，缓冲留给后台完整解码
+        """
+        image_path = str(image_path)
+        if use_read_ahead:
+            img = get_read_ahead().open_image(image_path, take=take_buffer)
+            if img is not None:
+                return img
+        reader = get_archive_reader()
+        if reader.is_archive_member(image_path):
+            return reader.open_image(image_path)
+        from PIL import Image
+        return Image.open(image_path)
+    
+    @classmethod
+    def is_grayscale(cls, img):
+        """判断图片内容是否为灰度（RGB保存的黑白漫画也视为灰度）"""
+        if img.mode in ('1', 'L', 'LA', 'I', 'F'):
+            return True
+        if img.mode not in ('RGB', 'RGBA', 'P'):
+            return False
+        
+        from PIL import Image, ImageChops
+        
+        # 在缩小的采样图上检测，避免处理整张图片
+        scale = min(1.0, cls.GRAYSCALE_SAMPLE_SIZE / max(img.size))
+        sample_size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        if img.mode == 'P':
+            sample = img.convert('RGB').resize(sample_size, Image.Resampling.BOX)
+        else:
+            sample = img.resize(sample_size, Image.Resampling.BOX).convert('RGB')
+        
+        red, green, blue = sample.split()
+        difference = ImageChops.lighter(ImageChops.difference(red, green), ImageChops.difference(green, blue))
+        outliers = sum(difference.histogram()[cls.GRAYSCALE_TOLERANCE + 1:])
+        return outliers <= sample.width * sample.height * cls.GRAYSCALE_OUTLIER_RATIO
+    
+    @classmethod
+    def to_grayscale_if_possible(cls, img):
+        """RGB图片内容为灰度时转换为L模式，像素内存减少三分之二"""
+        if img.mode != 'RGB' or not cls.is_grayscale(img):
+            return img
+        
+        gray = img.convert('L')
+        with cls._grayscale_lock:
+            cls._grayscale_stats['conversions'] += 1
+            cls._grayscale_stats['bytes_avoided'] += img.width * img.height * 2
+        return gray
+    
+    @classmethod
+    def get_grayscale_stats(cls):
+        """获取灰度转换统计：累计转换次数和累计少分配的像素内存
+
+        同一页面重新解码时会再次计数，统计的是转换总量，不是缓存中当前节省的内存。
+        """
+        with cls._grayscale_lock:
+            stats = dict(cls._grayscale_stats)
+        stats['avoided'] = cls.format_size(stats['bytes_avoided'])
+        return stats
+    
+    @classmethod
+    @traced('decode.page')
+    def decode_page(cls, image_path, rotation=0):
+        """完整解码页面并应用旋转，灰度内容以L模式返回"""
+        with cls.open_image(image_path) as img:
+            img.load()
+            img = cls.to_grayscale_if_possible(img)
+            if rotation != 0:
+                img = img.rotate(-rotation, expand=True)
+        return img
+    
+    @classmethod
+    def get_image_stat(cls, image_path):
+        """获取图片的(字节数, 修改时间)，支持压缩包内页面"""
+        image_path = str(image_path)
+        reader = get_archive_reader()
+        if reader.is_archive_member(image_path):
+            return reader.stat_member(image_path)
+        stat = os.stat(image_path)
+        return stat.st_size, stat.st_mtime
+    
+    @classmethod
+    def image_exists(cls, image_path):
+        """图片是否存在，支持压缩包内页面"""
+        try:
+            cls.get_image_stat(image_path)
+            return True
+        except OSError:
+            return False
     
     @classmethod
     def create_thumbnail(cls, image_path, size=(200, 200)):
         """创建缩略图，支持Unicode路径"""
+        from PIL import Image
         try:
             # 使用pathlib处理路径
             image_path = Path(image_path)
             
-            if not image_path.exists():
-                print(f"图片文件不存在: {image_path}")
+            if not cls.image_exists(image_path):
+                log_error(f"图片文件不存在: {image_path}", 'image_utils')
                 return None
                 
             # 打开图片
-            with Image.open(str(image_path)) as img:
+            with cls.open_image(image_path) as img:
                 # 转换为RGB模式（处理RGBA和其他模式）
                 if img.mode in ('RGBA', 'LA', 'P'):
                     # 创建白色背景
@@ -452,27 +625,48 @@ class ImageProcessor:
                         img = img.convert('RGBA')
                     background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
                     img = background
-                elif img.mode != 'RGB':
+                elif img.mode not in ('RGB', 'L'):
                     img = img.convert('RGB')
                 
-                # 创建缩略图 - 保持比例
+                # 创建缩略图 - 保持比例，灰度内容保存为L模式
                 img.thumbnail(size, Image.Resampling.LANCZOS)
-                return img.copy()
+                return cls.to_grayscale_if_possible(img.copy())
                 
         except Exception as e:
-            print(f"创建缩略图时出错 {image_path}: {e}")
+            log_error(f"创建缩略图时出错 {image_path}: {e}", 'image_utils')
             return None
     
     @classmethod
     def load_image_with_mode(cls, image_path, window_width, window_height, mode="fit", rotation=0):
         """加载图片并按指定模式调整大小"""
+        img, width, height, orig_width, orig_height = cls.prepare_image_with_mode(
+            image_path, window_width, window_height, mode, rotation)
+        if img is None:
+            return None, 0, 0, 0, 0
+        try:
+            # 转换为PhotoImage
+            from PIL import ImageTk
+            photo = ImageTk.PhotoImage(img)
+            return photo, width, height, orig_width, orig_height
+        except Exception as e:
+            log_error(f"加载图片失败 {image_path}: {e}", 'image_utils')
+            return None, 0, 0, 0, 0
+    
+    @classmethod
+    def prepare_image_with_mode(cls, image_path, window_width, window_height, mode="fit", rotation=0):
+        """解码图片并按指定模式调整大小，返回PIL图片（不涉及Tk）
+        
+        Returns:
+            (图片, 宽, 高, 原始宽, 原始高)，失败时图片为None
+        """
+        from PIL import Image
         try:
             image_path = Path(image_path)
             
-            if not image_path.exists():
+            if not cls.image_exists(image_path):
                 return None, 0, 0, 0, 0
                 
-            with Image.open(str(image_path)) as img:
+            with cls.open_image(image_path) as img:
                 orig_width, orig_height = img.size
                 
                 # 转换颜色模式
@@ -482,7 +676,7 @@ class ImageProcessor:
                         img = img.convert('RGBA')
                     background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
                     img = background
-                elif img.mode != 'RGB':
+                elif img.mode not in ('RGB', 'L'):
                     img = img.convert('RGB')
                 
                 # 旋转图片
@@ -499,22 +693,20 @@ class ImageProcessor:
                     new_width = int(img.width * ratio)
                     new_height = int(img.height * ratio)
                     img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                elif mode == "original":
-                    # 保持原始大小
-                    pass
                 
-                # 转换为PhotoImage
-                from PIL import ImageTk
-                photo = ImageTk.PhotoImage(img)
-                return photo, img.width, img.height, orig_width, orig_height
+                # 文件关闭前完成解码（未缩放的RGB/L页面仍是惰性图片，原始大小模式同理）
+                img.load()
+                
+                return img, img.width, img.height, orig_width, orig_height
                 
         except Exception as e:
-            print(f"加载图片失败 {image_path}: {e}")
+            log_error(f"加载图片失败 {image_path}: {e}", 'image_utils')
             return None, 0, 0, 0, 0
     
     @classmethod
     def auto_rotate_image(cls, img):
         """根据EXIF信息自动旋转图片"""
+        from PIL import ExifTags
         try:
             exif = img._getexif()
             if exif is not None:
@@ -534,55 +726,114 @@ class ImageProcessor:
     @classmethod
     def get_image_exif(cls, image_path):
         """获取图片EXIF信息"""
+        from PIL import ExifTags
         try:
-            img = Image.open(image_path)
             exif_data = {}
-            
-            if hasattr(img, '_getexif'):
-                exif = img._getexif()
-                if exif is not None:
-                    for tag_id, value in exif.items():
-                        tag = ExifTags.TAGS.get(tag_id, tag_id)
-                        exif_data[tag] = value
+            with cls.open_image(image_path) as img:
+                if hasattr(img, '_getexif'):
+                    exif = img._getexif()
+                    if exif is not None:
+                        for tag_id, value in exif.items():
+                            tag = ExifTags.TAGS.get(tag_id, tag_id)
+                            exif_data[tag] = value
+                exif_data['图片尺寸'] = f"{img.width}x{img.height}"
             
             # 添加文件信息
-            stat = os.stat(image_path)
-            exif_data['文件大小'] = cls.format_size(stat.st_size)
-            exif_data['修改时间'] = time.ctime(stat.st_mtime)
-            exif_data['图片尺寸'] = f"{img.width}x{img.height}"
+            file_size, modified_time = cls.get_image_stat(image_path)
+            exif_data['文件大小'] = cls.format_size(file_size)
+            exif_data['修改时间'] = time.ctime(modified_time)
             
             return exif_data
         except Exception as e:
-            print(f"无法获取EXIF信息 {image_path}: {e}")
+            log_debug(f"无法获取EXIF信息 {image_path}: {e}", 'image_utils')
             return {}
 
 class SlideshowManager:
-    """幻灯片管理器"""
+    """幻灯片管理器 - 在Tk主循环中按截止时间推进
+    
+    每次切换后立即让查看器在后台解码并缩放下一张，到点时只需替换已准备好的图片。
+    下一次的截止时间在上一次的截止时间上累加，回调延迟不会累积成漂移；
+    落后超过一个间隔时跳过积压的节拍，从当前时间重新计时。
+    """
     
     def __init__(self, image_viewer, interval=3):
+        """初始化幻灯片
+        
+        Args:
+            image_viewer: 图片查看器（需提供prepare_slide/show_prepared_slide）
+            interval: 播放间隔（秒）
+        """
         self.image_viewer = image_viewer
         self.interval = interval
         self.is_playing = False
         self.timer = None
+        self.next_deadline = None
     
     def start_slideshow(self):
         """开始幻灯片播放"""
         if not self.is_playing:
             self.is_playing = True
-            self._next_slide()
+            self.next_deadline = time.monotonic() + self.interval
+            self._prepare_next()
+            self._schedule_tick()
     
     def stop_slideshow(self):
         """停止幻灯片播放"""
         self.is_playing = False
         if self.timer:
-            self.timer.cancel()
+            try:
+                self.image_viewer.parent.after_cancel(self.timer)
+            except Exception:
+                pass
+            self.timer = None
+    
+    def toggle(self):
+        """切换播放/暂停"""
+        if self.is_playing:
+            self.stop_slideshow()
+        else:
+            self.start_slideshow()
+        return self.is_playing
+    
+    def _next_index(self):
+        """下一张的索引（播放到最后一张后从头循环）"""
+        count = len(self.image_viewer.image_files)
+        if count == 0:
+            return None
+        return (self.image_viewer.current_index + 1) % count
+    
+    def _prepare_next(self):
+        """在后台准备下一张"""
+        index = self._next_index()
+        if index is not None:
+            self.image_viewer.prepare_slide(index)
+    
+    def _schedule_tick(self):
+        """按截止时间安排下一次切换"""
+        delay_ms = max(0, int((self.next_deadline - time.monotonic()) * 1000))
+        self.timer = self.image_viewer.parent.after(delay_ms, self._next_slide)
     
     def _next_slide(self):
         """播放下一张"""
-        if self.is_playing:
-            self.image_viewer.next_image()
-            self.timer = threading.Timer(self.interval, self._next_slide)
-            self.timer.start()
+        self.timer = None
+        if not self.is_playing:
+            return
+        
+        try:
+            index = self._next_index()
+            if index is not None:
+                self.image_viewer.show_prepared_slide(index)
+        except Exception as e:
+            log_error(f"幻灯片切换失败: {e}", 'image_utils')
+        
+        # 在上一次截止时间上累加，避免漂移
+        self.next_deadline += self.interval
+        now = time.monotonic()
+        if self.next_deadline <= now:
+            self.next_deadline = now + self.interval
+        
+        self._prepare_next()
+        self._schedule_tick()
     
     def set_interval(self, interval):
         """设置播放间隔"""
@@ -590,7 +841,3 @@ class SlideshowManager:
         if self.is_playing:
             self.stop_slideshow()
             self.start_slideshow()
-    
-    def set_interval(self, interval):
-        """设置播放间隔"""
-        self.interval = interval
@@ -0,0 +1,174 @@
+import os
+import threading
+from bisect import bisect_left, insort
+from .archive_reader import get_archive_reader
+from .logger import get_logger, log_info, log_error
+
+
+def _is_rotational(device_id):
+    """通过 /sys/dev/block/<主:次>/queue/rotational 判断设备是否为机械硬盘
+
+    Returns:
+        True/False；无法判断（网络文件系统、非Linux等）时返回 None
+    """
+    if not hasattr(os, 'major'):
+        return None
+    sys_path = f'/sys/dev/block/{os.major(device_id)}:{os.minor(device_id)}'
+    if not os.path.exists(sys_path):
+        return None
+    real_path = os.path.realpath(sys_path)
+    # 分区没有queue目录，取所在磁盘的
+    for candidate in (real_path, os.path.dirname(real_path)):
+        rotational_file = os.path.join(candidate, 'queue', 'rotational')
+        try:
+            with open(rotational_file) as f:
+                return f.read().strip() == '1'
+        except OSError:
+            continue
+    return None
+
+
+class _DeviceQueue:
+    """单个设备上的待读任务，按(目录, inode)排序，电梯式单向推进"""
+
+    def __init__(self, device_id, concurrency, rotational):
+        self.device_id = device_id
+        self.concurrency = concurrency
+        self.rotational = rotational
+        self.pending = []  # [(排序键, 序号, 任务)]
+        self.last_key = None
+        self.workers = []
+
+
+class BulkReadScheduler:
+    """批量读取调度器 - 按磁盘位置排序后台批量读取，并按设备限制并发
+
+    任务按所在设备分组；同一设备上按(目录, inode, 路径)排序，
+    工作线程从上一次读取的位置继续向后取任务，到末尾再回到开头，
+    使机械硬盘上的读取接近顺序读。机械硬盘只用一个线程，
+    固态硬盘使用多个线程保持并行吞吐，无法识别的设备使用折中的并发数。
+    """
+
+    def __init__(self, worker, hdd_concurrency=1, ssd_concurrency=4, unknown_concurrency=2,
+                 lookahead=4, lookahead_callback=None):
+        """初始化调度器
+
+        Args:
+            worker: 执行任务的函数 worker(task)
+            hdd_concurrency: 机械硬盘上的并发读取数
+            ssd_concurrency: 固态硬盘上的并发读取数
+            unknown_concurrency: 无法识别设备类型时的并发读取数
+            lookahead: 每次取任务时通知的后续任务数量
+            lookahead_callback: 回调 callback(tasks)，告知即将按顺序执行的任务（用于预读，由调用方决定哪些需要读取）
+        """
+        self.logger = get_logger('io_scheduler')
+        self.worker = worker
+        self.hdd_concurrency = hdd_concurrency
+        self.ssd_concurrency = ssd_concurrency
+        self.unknown_concurrency = unknown_concurrency
+        self.lookahead = lookahead
+        self.lookahead_callback = lookahead_callback
+
+        self._condition = threading.Condition()
+        self._devices = {}  # 设备号 -> _DeviceQueue
+        self._sequence = 0
+        self._closed = False
+
+    def submit(self, image_path, task):
+        """提交一个读取任务
+
+        Args:
+            image_path: 任务要读取的图片路径（用于确定设备和磁盘位置）
+            task: 传给worker的任务对象
+        """
+        try:
+            device_id, sort_key = self._locate(str(image_path))
+        except OSError as e:
+            log_error(f"无法定位文件 {image_path}: {e}", 'io_scheduler')
+            device_id, sort_key = None, ('', 0, str(image_path))
+
+        with self._condition:
+            if self._closed:
+                return
+            device = self._devices.get(device_id)
+            if device is None:
+                device = self._create_device(device_id)
+            self._sequence += 1
+            insort(device.pending, (sort_key, self._sequence, task))
+            self._condition.notify_all()
+
+    def pending_count(self):
+        """待执行的任务数"""
+        with self._condition:
+            return sum(len(device.pending) for device in self._devices.values())
+
+    def close(self):
+        """丢弃待执行任务并停止工作线程"""
+        with self._condition:
+            self._closed = True
+            for device in self._devices.values():
+                device.pending.clear()
+            self._condition.notify_all()
+
+    def _locate(self, image_path):
+        """返回(设备号, 排序键)；压缩包内页面使用压缩包文件的位置"""
+        archive_path, _ = get_archive_reader().split_path(image_path)
+        stat = os.stat(archive_path or image_path)
+        directory = os.path.dirname(archive_path or image_path)
+        return stat.st_dev, (directory, stat.st_ino, image_path)
+
+    def _create_device(self, device_id):
+        """为新设备建立任务队列和工作线程（调用方持有锁）"""
+        rotational = _is_rotational(device_id) if device_id is not None else None
+        if rotational is True:
+            concurrency = self.hdd_concurrency
+        elif rotational is False:
+            concurrency = self.ssd_concurrency
+        else:
+            concurrency = self.unknown_concurrency
+
+        device = _DeviceQueue(device_id, concurrency, rotational)
+        self._devices[device_id] = device
+        for i in range(concurrency):
+            thread = threading.Thread(target=self._device_loop, args=(device,), daemon=True,
+                                      name=f'BulkRead-{device_id}-{i}')
+            device.workers.append(thread)
+            thread.start()
+
+        kind = {True: '机械硬盘', False: '固态硬盘', None: '未知设备'}[rotational]
+        log_info(f"批量读取设备 {device_id}: {kind}, 并发 {concurrency}", 'io_scheduler')
+        return device
+
+    def _next_task(self, device):
+        """按电梯顺序取出下一个任务（调用方持有锁）"""
+        index = 0
+        if device.last_key is not None:
+            index = bisect_left(device.pending, (device.last_key,))
+            if index >= len(device.pending):
+                index = 0  # 到达末尾，回到开头
+        sort_key, _, task = device.pending.pop(index)
+        device.last_key = sort_key
+
+        upcoming = [entry[2] for entry in device.pending[index:index + self.lookahead]]
+        return task, upcoming
+
+    def _device_loop(self, device):
+        """设备工作线程：依次执行该设备上的任务"""
+        while True:
+            with self._condition:
+                while not device.pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                task, upcoming = self._next_task(device)
+
+            if upcoming and self.lookahead_callback:
+                try:
+                    self.lookahead_callback(upcoming)
+                except Exception as e:
+                    log_error(f"预读通知失败: {e}", 'io_scheduler')
+
+            try:
+                self.worker(task)
+            except Exception as e:
+                log_error(f"批量读取任务失败: {e}", 'io_scheduler')
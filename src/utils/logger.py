@@ -1,9 +1,127 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# 默认的模块日志级别，子模块继承（如 core 对 core.viewer、core.library 生效）
+DEFAULT_MODULE_LEVELS = {
+    '': 'INFO',
+    'image_cache': 'INFO',
+    'core': 'INFO',
+    'ui': 'INFO',
+}
+
+
+class RateLimitedQueueHandler(QueueHandler):
+    """限流的队列处理器 - 把日志放入队列，由后台线程写出
+
+    同一模块连续重复的日志合并为一条"重复 N 次"的汇总；每个模块在一个时间窗口内
+    最多输出 max_per_window 条普通日志，超出的计数后在下一个窗口输出汇总。
+    警告及以上级别不受条数限制（重复的仍会合并）。
+    """
+
+    def __init__(self, log_queue, window=1.0, max_per_window=50):
+        """初始化处理器
+
+        Args:
+            log_queue: 日志队列
+            window: 限流时间窗口（秒）
+            max_per_window: 每个模块每个窗口最多输出的普通日志数
+        """
+        super().__init__(log_queue)
+        self.window = window
+        self.max_per_window = max_per_window
+        self._lock = threading.Lock()
+        self._states = {}  # 日志器名称 -> 限流状态
+
+    def emit(self, record):
+        """限流后放入队列"""
+        with self._lock:
+            summaries, allowed = self._account(record)
+        for summary in summaries:
+            super().emit(summary)
+        if allowed:
+            super().emit(record)
+
+    def _account(self, record):
+        """更新限流状态，返回 (需要先输出的汇总日志, 本条是否输出)"""
+        message = record.getMessage()
+        state = self._states.get(record.name)
+        if state is None:
+            state = self._states[record.name] = {'start': record.created, 'count': 0, 'suppressed': 0,
+                                                 'last': None, 'repeats': 0}
+        summaries = []
+
+        # 新的时间窗口：输出上个窗口省略的条数
+        if record.created - state['start'] >= self.window:
+            summaries.extend(self._drain(record.name, state))
+            state['start'] = record.created
+            state['count'] = 0
+
+        # 与上一条完全相同：只计数
+        if state['last'] == (record.levelno, message):
+            state['repeats'] += 1
+            return summaries, False
+        summaries.extend(self._drain_repeats(record.name, state))
+        state['last'] = (record.levelno, message)
+
+        if record.levelno < logging.WARNING and state['count'] >= self.max_per_window:
+            state['suppressed'] += 1
+            return summaries, False
+        state['count'] += 1
+        return summaries, True
+
+    def _drain(self, name, state):
+        """取出重复和省略的汇总日志"""
+        summaries = self._drain_repeats(name, state)
+        if state['suppressed']:
+            summaries.append(logging.makeLogRecord({
+                'name': name, 'levelno': logging.INFO, 'levelname': 'INFO',
+                'msg': f"日志过多，已省略 {state['suppressed']} 条"}))
+            state['suppressed'] = 0
+        return summaries
+
+    def _drain_repeats(self, name, state):
+        """取出"上一条重复 N 次"的汇总日志"""
+        if not state['repeats']:
+            return []
+        levelno = state['last'][0]
+        summary = logging.makeLogRecord({
+            'name': name, 'levelno': levelno, 'levelname': logging.getLevelName(levelno),
+            'msg': f"上一条日志又重复了 {state['repeats']} 次"})
+        state['repeats'] = 0
+        return [summary]
+
+    def flush_summaries(self):
+        """输出所有模块尚未输出的汇总（退出前调用）"""
+        with self._lock:
+            summaries = []
+            for name, state in self._states.items():
+                summaries.extend(self._drain(name, state))
+        for summary in summaries:
+            super().emit(summary)
+
+
+def parse_module_levels(text):
+    """解析 "image_cache=WARNING,core.*=DEBUG" 形式的级别设置"""
+    levels = {}
+    for item in text.split(','):
+        if '=' in item:
+            module_name, level = item.split('=', 1)
+            levels[module_name.strip()] = level.strip()
+    return levels
+
 
 class ConsoleLogger:
-    """控制台日志管理器 - 统一管理应用程序日志输出"""
+    """控制台日志管理器 - 统一管理应用程序日志输出
+    
+    日志经限流后放入队列，由后台线程写到控制台，调用方不会被慢速终端阻塞。
+    各模块的级别可通过 COMIC_READER_LOG_LEVELS 环境变量或配置中的 log_levels 调整。
+    """
     
     _instance = None
     _initialized = False
@@ -22,11 +140,12 @@ class ConsoleLogger:
         """设置日志配置"""
         # 创建根日志器
         self.logger = logging.getLogger('comic_reader')
-        self.logger.setLevel(logging.DEBUG)
+        self.queue_handler = None
+        self.listener = None
         
         # 避免重复添加处理器
         if not self.logger.handlers:
-            # 创建控制台处理器
+            # 创建控制台处理器（只在后台写入线程中使用）
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(logging.DEBUG)
             
@@ -36,12 +155,60 @@ class ConsoleLogger:
                 datefmt='%H:%M:%S'
             )
             console_handler.setFormatter(formatter)
+            self.console_handler = console_handler
+            
+            # 调用方只把日志放入队列，后台线程负责格式化和写出
+            log_queue = queue.SimpleQueue()
+            self.queue_handler = RateLimitedQueueHandler(log_queue)
+            self.listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.shutdown)
             
             # 添加处理器到日志器
-            self.logger.addHandler(console_handler)
+            self.logger.addHandler(self.queue_handler)
             
             # 防止日志向上传播到根日志器
             self.logger.propagate = False
+        
+        # 模块级别：默认值，再叠加环境变量
+        self.configure_levels(DEFAULT_MODULE_LEVELS)
+        self.configure_levels(parse_module_levels(os.environ.get('COMIC_READER_LOG_LEVELS', '')))
+    
+    def set_level(self, module_name, level):
+        """设置模块的日志级别，子模块继承
+        
+        Args:
+            module_name: 模块名（如 "image_cache"、"core"、"ui.grid"），"core.*" 与 "core" 等价，空字符串表示全部
+            level: 级别名称或数值（如 "DEBUG"、logging.WARNING）
+        """
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                return
+        module_name = module_name.strip()
+        if module_name.endswith('.*'):
+            module_name = module_name[:-2]
+        if module_name in ('', '*'):
+            self.logger.setLevel(level)
+        else:
+            self.get_logger(module_name).setLevel(level)
+    
+    def configure_levels(self, levels):
+        """批量设置模块日志级别 {模块名: 级别}"""
+        for module_name, level in (levels or {}).items():
+            self.set_level(module_name, level)
+    
+    def shutdown(self):
+        """输出剩余的汇总并等待后台线程写完所有日志"""
+        if self.listener is None:
+            return
+        self.queue_handler.flush_summaries()
+        self.listener.stop()
+        self.listener = None
+        
+        # 之后的日志（如其他退出处理）直接同步写出
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.addHandler(self.console_handler)
     
     def get_logger(self, name=None):
         """获取指定名称的日志器"""
@@ -105,3 +272,7 @@ def log_debug(message, module_name=None):
 def log_exception(message, module_name=None):
     """记录异常日志的便捷函数"""
     console_logger.exception(message, module_name)
+
+def set_log_levels(levels):
+    """设置模块日志级别的便捷函数 {模块名: 级别}"""
+    console_logger.configure_levels(levels)
@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .image_utils import ImageProcessor
+from .logger import get_logger, log_debug, log_error
+
+
+class PageWarmer:
+    """续读页预热 - 鼠标悬停或选中相册卡片时，在后台解码续读页及其相邻页
+
+    打开相册时查看器先从这里取图片列表和已解码的页面，首帧无需等待解码。
+    """
+
+    def __init__(self, neighbours=1, max_pages=6, max_albums=8):
+        """初始化预热器
+
+        Args:
+            neighbours: 续读页前后各预热的页数
+            max_pages: 最多保留的已解码页面数
+            max_albums: 最多保留的相册图片列表数
+        """
+        self.logger = get_logger('page_warmer')
+        self.neighbours = neighbours
+        self.max_pages = max_pages
+        self.max_albums = max_albums
+
+        self._lock = threading.Lock()
+        self._files = OrderedDict()  # 相册路径 -> 图片文件列表
+        self._pages = OrderedDict()  # (图片路径, 旋转角度) -> 已解码原图
+        self._requested = set()  # 正在预热的相册路径
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='PageWarmer')
+
+    def warm(self, album_path, resume_lookup=None, image_files=None):
+        """预热相册的续读页
+
+        Args:
+            album_path: 相册路径
+            resume_lookup: 回调 resume_lookup(album_path, page_count) 返回续读页码
+            image_files: 已知的图片文件列表，为None时在后台列出
+        """
+        with self._lock:
+            if album_path in self._requested:
+                return
+            self._requested.add(album_path)
+        self._executor.submit(self._warm_worker, album_path, resume_lookup, image_files)
+
+    def _warm_worker(self, album_path, resume_lookup, image_files):
+        """后台线程：列出图片并按续读页、下一页、上一页的顺序解码"""
+        try:
+            if image_files is None:
+                with self._lock:
+                    image_files = self._files.get(album_path)
+                if image_files is None:
+                    image_files = ImageProcessor.get_image_files(album_path)
+            if not image_files:
+                return
+
+            with self._lock:
+                self._files[album_path] = image_files
+                self._files.move_to_end(album_path)
+                while len(self._files) > self.max_albums:
+                    self._files.popitem(last=False)
+
+            page = resume_lookup(album_path, len(image_files)) if resume_lookup else 0
+            order = [page]
+            for offset in range(1, self.neighbours + 1):
+                order.extend([page + offset, page - offset])
+
+            for index in order:
+                if 0 <= index < len(image_files):
+                    key = (image_files[index], 0)
+                    with self._lock:
+                        if key in self._pages:
+                            continue
+                    source = ImageProcessor.decode_page(image_files[index])
+                    with self._lock:
+                        self._pages[key] = source
+                        while len(self._pages) > self.max_pages:
+                            self._pages.popitem(last=False)
+            log_debug(f"预热续读页: 第 {page + 1} 页", 'page_warmer')
+        except Exception as e:
+            log_error(f"预热续读页失败 {album_path}: {e}", 'page_warmer')
+        finally:
+            with self._lock:
+                self._requested.discard(album_path)
+
+    def take_files(self, album_path):
+        """取出预热时列出的图片文件列表，没有时返回None"""
+        with self._lock:
+            return self._files.pop(album_path, None)
+
+    def take_page(self, key):
+        """取出已解码的页面
+
+        Args:
+            key: (图片路径, 旋转角度)
+        """
+        with self._lock:
+            return self._pages.pop(key, None)
+
+
+# 全局预热器实例
+_global_warmer = None
+
+
+def get_page_warmer():
+    """获取全局续读页预热器"""
+    global _global_warmer
+    if _global_warmer is None:
+        _global_warmer = PageWarmer()
+    return _global_warmer
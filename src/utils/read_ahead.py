@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from io import BytesIO
+from .archive_reader import get_archive_reader
+from .logger import get_logger, log_info, log_error
+
+
+class ReadAheadBuffer:
+    """顺序预读缓冲 - 按阅读顺序提前把页面文件整块读入内存
+
+    单个读取线程按计划顺序逐个读取整文件，同时在内存中的字节数不超过上限；
+    达到上限时只对下一个文件发出 posix_fadvise(WILLNEED) 提示，由系统缓存预读。
+    解码时从内存缓冲 Image.open(BytesIO) 打开，解码线程不再等待磁盘寻道。
+    """
+
+    def __init__(self, max_bytes_in_flight=64 * 1024 * 1024, stale_seconds=30, name='ReadAhead'):
+        """初始化预读缓冲
+
+        Args:
+            max_bytes_in_flight: 已读入和正在读取的字节数上限
+            stale_seconds: 缓冲超过该时间未被取走时，可被新的预读挤出
+            name: 读取线程名称
+        """
+        self.logger = get_logger('read_ahead')
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.stale_seconds = stale_seconds
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._backlog = deque()  # 待读取的路径，按阅读顺序
+        self._buffers = OrderedDict()  # 路径 -> (数据, 读入时间)
+        self._reading = None  # 正在读取的路径
+        self._bytes_in_flight = 0
+        self._hinted = None
+        self._thread = None
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(self, image_paths, replace=False):
+        """按顺序计划预读
+
+        Args:
+            image_paths: 即将读取的图片路径（按阅读顺序）
+            replace: 为True时丢弃不在本次计划中的缓冲和待读任务（如跳页后）
+        """
+        image_paths = [str(path) for path in image_paths]
+        with self._condition:
+            if self._closed:
+                return
+            if replace:
+                wanted = set(image_paths)
+                self._backlog.clear()
+                for path in [p for p in self._buffers if p not in wanted]:
+                    self._discard(path)
+
+            queued = set(self._backlog)
+            for path in image_paths:
+                if path in self._buffers or path in queued or path == self._reading:
+                    continue
+                self._backlog.append(path)
+                queued.add(path)
+
+            if self._thread is None and self._backlog:
+                self._thread = threading.Thread(target=self._reader_loop, daemon=True, name=self.name)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def take(self, image_path, wait=True):
+        """取走预读好的文件内容
+
+        Args:
+            image_path: 图片路径
+            wait: 该文件正在读取时是否等待读取完成
+
+        Returns:
+            bytes，未预读时返回 None
+        """
+        image_path = str(image_path)
+        with self._condition:
+            while wait and self._reading == image_path:
+                self._condition.wait()
+            entry = self._buffers.get(image_path)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._discard(image_path)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, image_path):
+        """查看预读好的文件内容但不取走（如只读文件头）"""
+        with self._condition:
+            entry = self._buffers.get(str(image_path))
+        return entry[0] if entry else None
+
+    def open_image(self, image_path, take=True):
+        """从预读缓冲打开图片，未预读时返回 None
+
+        Args:
+            image_path: 图片路径
+            take: 为True时取走缓冲（正在读取时等待）；为False时只查看，不等待也不取走（供主线程的草稿渲染使用）
+        """
+        data = self.take(image_path) if take else self.peek(image_path)
+        if data is None:
+            return None
+        from PIL import Image
+        return Image.open(BytesIO(data))
+
+    def cancel(self):
+        """取消所有待读任务并释放缓冲"""
+        with self._condition:
+            self._backlog.clear()
+            for path in list(self._buffers):
+                self._discard(path)
+            self._condition.notify_all()
+
+    def close(self):
+        """停止读取线程"""
+        with self._condition:
+            self._closed = True
+            self._backlog.clear()
+            self._buffers.clear()
+            self._bytes_in_flight = 0
+            self._condition.notify_all()
+
+    def get_stats(self):
+        """获取预读统计"""
+        with self._condition:
+            return {
+                'buffered_files': len(self._buffers),
+                'bytes_in_flight': self._bytes_in_flight,
+                'backlog': len(self._backlog),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def _discard(self, image_path):
+        """释放一个缓冲（调用方持有锁）"""
+        data, _ = self._buffers.pop(image_path)
+        self._bytes_in_flight -= len(data)
+        self._condition.notify_all()
+
+    def _evict_stale(self):
+        """挤出超时未取走的缓冲（调用方持有锁）"""
+        deadline = time.monotonic() - self.stale_seconds
+        for path in [p for p, (_, read_at) in self._buffers.items() if read_at < deadline]:
+            self._discard(path)
+
+    def _reader_loop(self):
+        """读取线程：按计划顺序读取整文件，超出字节上限时等待"""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._backlog:
+                        size = self._estimate_size(self._backlog[0])
+                        if self._bytes_in_flight == 0 or self._bytes_in_flight + size <= self.max_bytes_in_flight:
+                            break
+                        self._evict_stale()
+                        self._hint(self._backlog[0])
+                    self._condition.wait(timeout=1.0)
+                if self._closed:
+                    return
+                image_path = self._backlog.popleft()
+                self._reading = image_path
+                self._bytes_in_flight += size
+
+            data = None
+            try:
+                data = self._read_file(image_path)
+            except Exception as e:
+                log_error(f"预读文件失败 {image_path}: {e}", 'read_ahead')
+
+            with self._condition:
+                self._bytes_in_flight -= size
+                self._reading = None
+                if data is not None and not self._closed:
+                    self._buffers[image_path] = (data, time.monotonic())
+                    self._bytes_in_flight += len(data)
+                self._condition.notify_all()
+
+    @staticmethod
+    def _estimate_size(image_path):
+        """估计文件大小，用于控制在途字节数"""
+        reader = get_archive_reader()
+        try:
+            if reader.is_archive_member(image_path):
+                return reader.stat_member(image_path)[0]
+            return os.path.getsize(image_path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _read_file(image_path):
+        """整块读取文件内容（支持压缩包内页面）"""
+        reader = get_archive_reader()
+        if reader.is_archive_member(image_path):
+            return reader.read_member(image_path)
+
+        with open(image_path, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            return f.read()
+
+    def _hint(self, image_path):
+        """提示系统预读下一个文件（每个文件只提示一次，调用方持有锁）"""
+        if image_path == self._hinted or not hasattr(os, 'posix_fadvise'):
+            return
+        self._hinted = image_path
+        if get_archive_reader().is_archive_member(image_path):
+            return
+        try:
+            fd = os.open(image_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+# 全局预读缓冲实例（阅读器翻页使用）
+_global_read_ahead = None
+
+
+def get_read_ahead():
+    """获取全局顺序预读缓冲"""
+    global _global_read_ahead
+    if _global_read_ahead is None:
+        _global_read_ahead = ReadAheadBuffer()
+        log_info(f"顺序预读已启用，在途上限 {_global_read_ahead.max_bytes_in_flight // (1024 * 1024)}MB", 'read_ahead')
+    return _global_read_ahead
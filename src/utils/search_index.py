@@ -0,0 +1,198 @@
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from .logger import get_logger, log_info, log_error
+
+
+class AlbumSearchIndex:
+    """相册搜索索引 - 基于n-gram倒排表的即输即搜
+
+    每个相册的检索文本由名称、方括号作者标签以及（合集的）子相册名称组成。
+    倒排表把文本切分为单字/二元/三元字符组，查询时选取命中最少的字符组作为候选集，
+    再用子串匹配精确校验。连续输入时，新查询若是上一次查询的延伸，则在上一次
+    结果中收窄。倒排表在后台线程构建，构建完成前使用拼接文本的线性查找。
+    """
+
+    # 后台构建时每处理多少个相册让出一次GIL，保证界面响应
+    BUILD_YIELD_EVERY = 2000
+
+    def __init__(self, albums, author_extractor=None, background=True):
+        """构建索引
+
+        Args:
+            albums: 相册数据列表（与网格显示使用的字典相同）
+            author_extractor: 从名称中提取作者的函数，返回None表示无作者
+            background: 是否在后台线程构建倒排表
+        """
+        self.logger = get_logger('search_index')
+        self.albums = list(albums or [])
+        self.author_extractor = author_extractor
+
+        # 检索文本，与albums按下标一一对应
+        self.haystacks = [self._album_text(album) for album in self.albums]
+
+        # 拼接文本及每个相册的起始偏移，用于倒排表就绪前的线性查找
+        self._starts = array('I')
+        offset = 0
+        for text in self.haystacks:
+            self._starts.append(offset)
+            offset += len(text) + 1
+        self._corpus = '\x00'.join(self.haystacks)
+
+        # n-gram -> 相册下标数组（升序），构建完成前为None
+        self.postings = None
+
+        # 增量搜索状态
+        self._last_query = ''
+        self._last_result = None
+
+        if background and len(self.albums) > self.BUILD_YIELD_EVERY:
+            threading.Thread(target=self._build_postings, daemon=True,
+                             name='AlbumSearchIndex').start()
+        else:
+            self._build_postings()
+
+    @property
+    def ready(self):
+        """倒排表是否已构建完成"""
+        return self.postings is not None
+
+    @staticmethod
+    def normalize(text):
+        """规范化文本：统一大小写并合并空白"""
+        return ' '.join((text or '').casefold().split())
+
+    def _album_text(self, album):
+        """生成单个相册的检索文本"""
+        parts = [album.get('name', '')]
+
+        author = self._extract_author(album.get('name', ''))
+        if author:
+            parts.append(author)
+
+        # 合集同时检索其包含的相册，便于从合集外层直接找到
+        for sub_album in album.get('albums', []) or []:
+            sub_name = sub_album.get('name', '')
+            parts.append(sub_name)
+            sub_author = self._extract_author(sub_name)
+            if sub_author:
+                parts.append(sub_author)
+
+        # 使用换行分隔字段，避免跨字段匹配
+        return '\n'.join(self.normalize(part) for part in parts if part)
+
+    def _extract_author(self, name):
+        """提取作者标签"""
+        if not self.author_extractor or not name:
+            return None
+        try:
+            return self.author_extractor(name)
+        except Exception:
+            return None
+
+    def _build_postings(self):
+        """构建单字/二元/三元字符组倒排表"""
+        try:
+            start_time = time.perf_counter()
+            postings = {}
+            get_posting = postings.get
+            join = ''.join
+
+            for album_id, text in enumerate(self.haystacks):
+                grams = set(text)
+                grams.update(map(join, zip(text, text[1:])))
+                grams.update(map(join, zip(text, text[1:], text[2:])))
+                for gram in grams:
+                    posting = get_posting(gram)
+                    if posting is None:
+                        postings[gram] = [album_id]
+                    else:
+                        posting.append(album_id)
+
+                if album_id % self.BUILD_YIELD_EVERY == 0:
+                    time.sleep(0)
+
+            # 转换为紧凑数组，降低常驻内存
+            self.postings = {gram: array('I', ids) for gram, ids in postings.items() if '\n' not in gram}
+
+            elapsed = time.perf_counter() - start_time
+            log_info(f"搜索索引构建完成: {len(self.albums)} 个相册, {len(self.postings)} 个字符组, "
+                     f"耗时 {elapsed:.2f}s", 'search_index')
+        except Exception as e:
+            log_error(f"构建搜索索引失败: {e}", 'search_index')
+
+    def _posting_candidates(self, postings, term):
+        """根据单个检索词从倒排表选取候选集（命中最少的字符组）"""
+        n = min(len(term), 3)
+        best = None
+        for i in range(len(term) - n + 1):
+            posting = postings.get(term[i:i + n])
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best
+
+    def _scan_candidates(self, term):
+        """在拼接文本中线性查找包含检索词的相册"""
+        corpus = self._corpus
+        starts = self._starts
+        last_id = len(starts) - 1
+        result = []
+
+        position = corpus.find(term)
+        while position != -1:
+            album_id = bisect_right(starts, position) - 1
+            result.append(album_id)
+            if album_id >= last_id:
+                break
+            # 跳到下一个相册，避免同一相册重复命中
+            position = corpus.find(term, starts[album_id + 1])
+        return result
+
+    def search_ids(self, query):
+        """搜索并返回命中相册的下标列表（保持原始顺序）"""
+        query = self.normalize(query)
+        if not query:
+            self._last_query = ''
+            self._last_result = None
+            return list(range(len(self.albums)))
+
+        terms = query.split(' ')
+        haystacks = self.haystacks
+        postings = self.postings
+
+        candidates = None
+        if self._last_result is not None and self._last_query and query.startswith(self._last_query):
+            # 增量收窄：新结果必然是上次结果的子集
+            candidates = self._last_result
+
+        if postings is not None:
+            for term in terms:
+                term_candidates = self._posting_candidates(postings, term)
+                if candidates is None or len(term_candidates) < len(candidates):
+                    candidates = term_candidates
+
+        if candidates is None:
+            # 倒排表未就绪：按最长检索词线性查找
+            candidates = self._scan_candidates(max(terms, key=len))
+
+        if len(terms) == 1:
+            term = terms[0]
+            if postings is not None and len(term) <= 3 and candidates is not self._last_result:
+                # 短检索词本身就是字符组，倒排表结果即为精确结果
+                result = list(candidates)
+            else:
+                result = [album_id for album_id in candidates if term in haystacks[album_id]]
+        else:
+            result = [album_id for album_id in candidates
+                      if all(term in haystacks[album_id] for term in terms)]
+
+        self._last_query = query
+        self._last_result = result
+        return result
+
+    def search(self, query):
+        """搜索并返回命中的相册数据列表"""
+        return [self.albums[album_id] for album_id in self.search_ids(query)]
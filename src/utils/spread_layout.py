@@ -0,0 +1,79 @@
+from .image_metadata import get_metadata_index
+from .logger import log_error
+
+# 宽高比超过该值的页面视为跨页大图，单独显示
+WIDE_PAGE_RATIO = 1.0
+
+
+def is_wide_page(size):
+    """根据尺寸判断是否为跨页大图"""
+    width, height = size
+    return height > 0 and width / height > WIDE_PAGE_RATIO
+
+
+def read_page_sizes(image_files, default_size=(800, 1200)):
+    """从元数据索引获取每页尺寸（未索引时只读文件头），无法读取时使用默认尺寸"""
+    metadata_index = get_metadata_index()
+    sizes = []
+    for image_path in image_files:
+        try:
+            sizes.append(metadata_index.get_size(image_path))
+        except Exception as e:
+            log_error(f"读取页面尺寸失败 {image_path}: {e}", 'spread_layout')
+            sizes.append(default_size)
+    return sizes
+
+
+def build_spreads(page_sizes, cover_alone=True):
+    """把页面分组为双页跨页
+
+    封面和跨页大图单独成组，其余竖版页面两两成组；
+    下一页是跨页大图或已到最后一页时当前页单独成组。
+
+    Args:
+        page_sizes: 每页的(宽, 高)
+        cover_alone: 第一页（封面）是否单独显示
+
+    Returns:
+        list: 每个跨页包含的页面索引元组
+    """
+    spreads = []
+    count = len(page_sizes)
+    index = 0
+    while index < count:
+        single = (
+            (cover_alone and index == 0) or
+            is_wide_page(page_sizes[index]) or
+            index + 1 >= count or
+            is_wide_page(page_sizes[index + 1])
+        )
+        if single:
+            spreads.append((index,))
+            index += 1
+        else:
+            spreads.append((index, index + 1))
+            index += 2
+    return spreads
+
+
+def page_to_spread_map(spreads, page_count):
+    """生成页面索引到跨页索引的映射"""
+    mapping = [0] * page_count
+    for spread_index, pages in enumerate(spreads):
+        for page in pages:
+            mapping[page] = spread_index
+    return mapping
+
+
+def fit_spread(page_sizes, canvas_size):
+    """计算跨页中各页的显示尺寸：统一高度并排，整体适应画布，不放大
+
+    Returns:
+        list: 每页的(显示宽, 显示高)
+    """
+    canvas_width, canvas_height = canvas_size
+    base_height = min(height for _, height in page_sizes)
+    base_widths = [width * base_height / height for width, height in page_sizes]
+    scale = min(1.0, canvas_height / base_height, canvas_width / sum(base_widths))
+    display_height = max(1, int(base_height * scale))
+    return [(max(1, int(width * scale)), display_height) for width in base_widths]
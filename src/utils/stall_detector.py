@@ -0,0 +1,183 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from .logger import get_logger, log_info, log_warning, log_exception
+from .tracing import get_tracer
+
+# 识别正在运行的回调时跳过的框架代码
+_FRAMEWORK_FILES = (os.sep + 'tkinter' + os.sep, 'stall_detector.py', 'tracing.py', 'threading.py')
+
+
+class StallDetector:
+    """界面卡顿检测 - 用 after 探针测量Tk主循环的延迟
+
+    主线程每隔 interval_ms 执行一次探针并记录心跳；后台看门狗线程发现心跳超过
+    threshold_ms 未更新时，用 sys._current_frames() 采样主线程的调用栈，
+    记下正在执行的回调（如卡片分批创建、load_current_image、scan_albums、save_config）。
+    主线程恢复后把这次卡顿的时长、回调、首次采样的调用栈和采样热点一起记录下来。
+    """
+
+    def __init__(self, root, interval_ms=100, threshold_ms=200, max_records=200, stack_depth=12):
+        """初始化检测器
+
+        Args:
+            root: Tk根窗口
+            interval_ms: 探针间隔（毫秒）
+            threshold_ms: 判定为卡顿的主循环延迟（毫秒）
+            max_records: 保留的卡顿记录数
+            stack_depth: 每次采样保留的栈帧数
+        """
+        self.logger = get_logger('ui.stall')
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.stack_depth = stack_depth
+        self.max_samples = 200  # 单次卡顿最多保留的采样数
+        self.update_callback = None  # 统计变化时在主线程调用 callback(summary_text)
+
+        self.records = deque(maxlen=max_records)
+        self.stall_count = 0
+        self.total_stall_ms = 0.0
+        self.max_stall_ms = 0.0
+        self.probe_count = 0
+
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._samples = []  # 本次卡顿中采样到的调用栈
+        self._running = False
+        self._after_id = None
+        self._watchdog = None
+
+    def start(self):
+        """开始检测"""
+        if self._running:
+            return
+        self._running = True
+        self._last_beat = time.perf_counter()
+        self._after_id = self.root.after(int(self.interval * 1000), self._probe)
+        self._watchdog = threading.Thread(target=self._watchdog_loop, daemon=True, name='StallWatchdog')
+        self._watchdog.start()
+        log_info(f"界面卡顿检测已启动: 阈值 {self.threshold * 1000:.0f}ms", 'ui.stall')
+
+    def stop(self):
+        """停止检测"""
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _probe(self):
+        """主线程探针：更新心跳，间隔超过阈值时记录一次卡顿"""
+        now = time.perf_counter()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            samples, self._samples = self._samples, []
+        self.probe_count += 1
+
+        # 探针本身相隔 interval，超出部分才是主循环的延迟
+        delay = gap - self.interval
+        if delay >= self.threshold:
+            self._record_stall(now - gap, delay, samples)
+
+        if self._running:
+            self._after_id = self.root.after(int(self.interval * 1000), self._probe)
+
+    def _watchdog_loop(self):
+        """后台线程：主线程心跳停止时采样其调用栈"""
+        while self._running:
+            time.sleep(self.interval / 2)
+            with self._lock:
+                stalled = time.perf_counter() - self._last_beat - self.interval >= self.threshold
+            if not stalled:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self._lock:
+                if len(self._samples) < self.max_samples:
+                    self._samples.append(stack)
+
+    def _record_stall(self, start, delay, samples):
+        """记录一次卡顿（主线程）"""
+        delay_ms = delay * 1000
+        callback = self._find_callback(samples[0]) if samples else '未知'
+        hotspots = Counter(self._format_frame(stack[-1]) for stack in samples if stack)
+        record = {
+            'time': time.strftime('%H:%M:%S'),
+            'duration_ms': round(delay_ms, 1),
+            'callback': callback,
+            'samples': len(samples),
+            'hotspots': hotspots.most_common(3),
+            'stack': [self._format_frame(frame) for frame in samples[0][-self.stack_depth:]] if samples else [],
+        }
+        self.records.append(record)
+        self.stall_count += 1
+        self.total_stall_ms += delay_ms
+        self.max_stall_ms = max(self.max_stall_ms, delay_ms)
+
+        get_tracer().add_complete('ui.stall', start, start + delay, {'callback': callback})
+        log_warning(f"界面卡顿 {delay_ms:.0f}ms: {callback}", 'ui.stall')
+        if self.update_callback:
+            try:
+                self.update_callback(self.summary_text())
+            except Exception as e:
+                log_exception(f"更新卡顿统计显示失败: {e}", 'ui.stall')
+
+    @staticmethod
+    def _format_frame(frame):
+        """格式化栈帧为 "文件名:行号 函数名" """
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+
+    @staticmethod
+    def _find_callback(stack):
+        """找出Tk正在执行的回调：mainloop之下第一个非框架代码的栈帧（跳过转发用的lambda）"""
+        candidates = [frame for frame in stack
+                      if frame.name != 'mainloop' and not frame.filename.endswith('main.py')
+                      and not any(part in frame.filename for part in _FRAMEWORK_FILES)]
+        for frame in candidates:
+            if frame.name != '<lambda>' or frame is candidates[-1]:
+                return StallDetector._format_frame(frame)
+        return StallDetector._format_frame(stack[-1]) if stack else '未知'
+
+    def get_stats(self):
+        """获取卡顿统计"""
+        durations = sorted(record['duration_ms'] for record in self.records)
+        return {
+            'stall_count': self.stall_count,
+            'total_stall_ms': round(self.total_stall_ms, 1),
+            'max_stall_ms': round(self.max_stall_ms, 1),
+            'p95_stall_ms': durations[int(len(durations) * 0.95)] if durations else 0,
+            'probes': self.probe_count,
+            'threshold_ms': self.threshold * 1000,
+            'top_callbacks': Counter(record['callback'] for record in self.records).most_common(5),
+        }
+
+    def summary_text(self):
+        """状态栏显示的简短统计"""
+        if not self.stall_count:
+            return ""
+        return f"卡顿 {self.stall_count} 次 · 最长 {self.max_stall_ms:.0f}ms"
+
+    def dump(self, file_path):
+        """把统计和卡顿记录写入JSON文件（退出时调用）"""
+        try:
+            if not self.stall_count:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump({'stats': self.get_stats(), 'stalls': list(self.records)}, f,
+                          ensure_ascii=False, indent=2)
+            log_info(f"卡顿记录已保存: {file_path} ({self.stall_count} 次)", 'ui.stall')
+        except Exception as e:
+            log_exception(f"保存卡顿记录失败: {e}", 'ui.stall')
@@ -0,0 +1,72 @@
+import sys
+import time
+from contextlib import contextmanager
+from .logger import log_info
+
+# 统计起点：main.py 启动后最先导入本模块，用于计算从启动到首帧的总耗时
+_PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """启动耗时统计 - 按阶段记录耗时和新导入的模块
+
+    每个阶段记录墙钟耗时，以及该阶段新导入的模块数和其中的顶层包，
+    便于发现冷启动变慢的原因。单个模块的导入耗时可用 python -X importtime main.py 查看。
+    """
+
+    def __init__(self):
+        self.phases = []  # [(阶段名, 耗时毫秒, 新模块数, 新的顶层包)]
+        self.first_paint_ms = None
+        self._reported = False
+
+    @contextmanager
+    def phase(self, name):
+        """统计一个启动阶段
+
+        Args:
+            name: 阶段名称
+        """
+        modules_before = set(sys.modules)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            new_modules = set(sys.modules) - modules_before
+            packages = sorted({module.split('.')[0] for module in new_modules
+                               if not module.startswith(('_', 'src', 'encodings'))})
+            self.phases.append((name, elapsed, len(new_modules), packages))
+
+    def mark_first_paint(self):
+        """记录首帧绘制完成（在主循环第一次空闲时调用）"""
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - _PROCESS_START) * 1000
+
+    def report(self):
+        """输出启动耗时报告（只输出一次）"""
+        if self._reported:
+            return
+        self._reported = True
+
+        lines = ["启动耗时报告:"]
+        for name, elapsed, module_count, packages in self.phases:
+            line = f"  {name:<12} {elapsed:7.1f}ms  新模块 {module_count:4d}"
+            if packages:
+                line += f"  ({', '.join(packages[:8])}{' ...' if len(packages) > 8 else ''})"
+            lines.append(line)
+        if self.first_paint_ms is not None:
+            lines.append(f"  从启动到首帧: {self.first_paint_ms:.0f}ms")
+        lines.append(f"  已加载模块: {len(sys.modules)}")
+        log_info('\n'.join(lines), 'startup')
+
+
+# 全局启动统计实例
+_global_profiler = None
+
+
+def get_startup_profiler():
+    """获取全局启动耗时统计"""
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = StartupProfiler()
+    return _global_profiler
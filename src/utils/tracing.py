@@ -0,0 +1,171 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from .logger import get_logger, log_info, log_exception
+
+
+class _NullSpan:
+    """关闭追踪时使用的空span，进入和退出都不做任何事"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """一次计时区间，退出时写入追踪器的环形缓冲区"""
+
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.add_complete(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """性能追踪器 - 把各阶段的耗时区间（span）记录到环形缓冲区
+
+    每条记录包含名称、开始时间、耗时和线程ID，可导出为 Chrome trace-event JSON，
+    在 chrome://tracing 或 Perfetto 中按线程查看。关闭时 span() 直接返回共享的空对象。
+    """
+
+    def __init__(self, capacity=200000, enabled=False):
+        """初始化追踪器
+
+        Args:
+            capacity: 环形缓冲区保留的最多事件数
+            enabled: 是否立即开始记录
+        """
+        self.logger = get_logger('tracing')
+        self.enabled = enabled
+        self._events = deque(maxlen=capacity)  # (名称, 开始, 结束, 线程ID, 参数)
+        self._thread_names = {}  # 线程ID -> 线程名
+        self._origin = time.perf_counter()
+
+    def span(self, name, **args):
+        """返回计时区间的上下文管理器
+
+        Args:
+            name: 区间名称（如 "scan.walk"、"cache.decode"）
+            **args: 附加在事件上的参数
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add_complete(self, name, start, end, args=None):
+        """记录一个已完成的区间（开始和结束为 time.perf_counter() 的值）"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        self._events.append((name, start, end, thread.ident, args))
+
+    def set_enabled(self, enabled):
+        """开启或关闭记录"""
+        self.enabled = bool(enabled)
+        log_info(f"性能追踪已{'开启' if self.enabled else '关闭'}", 'tracing')
+
+    def clear(self):
+        """清空已记录的事件"""
+        self._events.clear()
+
+    def event_count(self):
+        """当前缓冲区中的事件数"""
+        return len(self._events)
+
+    def export_chrome_trace(self, file_path):
+        """导出为 Chrome trace-event JSON
+
+        Args:
+            file_path: 输出文件路径
+
+        Returns:
+            int: 导出的事件数，失败时返回-1
+        """
+        try:
+            pid = os.getpid()
+            events = list(self._events)
+            trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                            for tid, name in list(self._thread_names.items())]
+            for name, start, end, tid, args in events:
+                event = {
+                    'name': name,
+                    'cat': name.split('.')[0],
+                    'ph': 'X',
+                    'ts': round((start - self._origin) * 1e6, 1),
+                    'dur': round((end - start) * 1e6, 1),
+                    'pid': pid,
+                    'tid': tid,
+                }
+                if args:
+                    event['args'] = {key: str(value) for key, value in args.items()}
+                trace_events.append(event)
+
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+            log_info(f"已导出性能追踪: {file_path} ({len(events)} 个事件)", 'tracing')
+            return len(events)
+        except Exception as e:
+            log_exception(f"导出性能追踪失败: {e}", 'tracing')
+            return -1
+
+
+    def export_to_directory(self, directory):
+        """以时间戳命名导出到目录（trace-年月日-时分秒.json）
+
+        Returns:
+            str: 导出的文件路径，失败时返回None
+        """
+        file_path = os.path.join(str(directory), time.strftime('trace-%Y%m%d-%H%M%S.json'))
+        return file_path if self.export_chrome_trace(file_path) >= 0 else None
+
+
+# 全局追踪器实例（环境变量 COMIC_READER_TRACE=1 时启动即开始记录）
+_global_tracer = Tracer(enabled=os.environ.get('COMIC_READER_TRACE') == '1')
+
+
+def get_tracer():
+    """获取全局追踪器"""
+    return _global_tracer
+
+
+def traced(name):
+    """装饰器：把函数调用记录为计时区间（关闭追踪时只多一次判断）"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _global_tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(_global_tracer, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_span(name, **args):
+    """在全局追踪器上创建计时区间，用法: with trace_span("cache.decode"): ..."""
+    if not _global_tracer.enabled:
+        return _NULL_SPAN
+    return _Span(_global_tracer, name, args)